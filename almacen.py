@@ -0,0 +1,179 @@
+"""Representación de los árboles de análisis.
+
+Los analizadores construyen el árbol a través de un constructor con la interfaz
+`agregar(tipo, valor, hijos) -> nodo`, `num_hijos(nodo)` y `vista(nodo)`:
+
+- `ConstructorNodos` crea un objeto `Nodo` por nodo (cómodo para árboles chicos).
+- `AlmacenArbol` guarda el árbol en arreglos tipados paralelos; cada nodo es un
+  entero estable y `vista()` devuelve un `VistaNodo` de solo lectura con los mismos
+  atributos que `Nodo` (tipo, valor, hijos, id), así que crear_grafo y dibujar_arbol
+  funcionan sin cambios. Un nodo ocupa unos 11 bytes más 4 por hijo; los
+  arreglos de etiqueta y de cantidad de hijos se ensanchan a 4 bytes la primera
+  vez que un valor no entra (más de 65535 etiquetas o más de 255 hijos).
+
+El almacén solo agrega: los nodos de ramas abandonadas no se liberan hasta que se
+descarta el almacén entero. Por eso solo conviene para analizadores que construyen
+nodos únicamente en el árbol final (memo, chart, STF); las búsquedas con
+backtracking usan ConstructorNodos.
+"""
+from array import array
+from itertools import count
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Contador global para que los ID de Nodo no se repitan aunque se libere memoria
+_ids = count()
+
+
+class Nodo:
+    __slots__ = ('tipo', 'valor', 'hijos', 'id')
+
+    def __init__(self, tipo: str, valor: str, hijos: List['Nodo'] = None):
+        self.tipo = tipo
+        self.valor = valor
+        self.hijos = hijos if hijos is not None else []
+        self.id = next(_ids)  # ID único para el nodo
+
+
+class ConstructorNodos:
+    """Construye el árbol con objetos Nodo"""
+
+    def __init__(self):
+        self.creados = 0
+
+    def __len__(self) -> int:
+        return self.creados
+
+    def agregar(self, tipo: str, valor: str, hijos: Sequence[Nodo] = ()) -> Nodo:
+        self.creados += 1
+        return Nodo(tipo, valor, list(hijos))
+
+    def num_hijos(self, nodo: Nodo) -> int:
+        return len(nodo.hijos)
+
+    def vista(self, nodo: Nodo) -> Nodo:
+        return nodo
+
+
+class AlmacenArbol:
+    """Árbol guardado en arreglos paralelos; los nodos son índices enteros"""
+
+    def __init__(self):
+        self.etiquetas: List[Tuple[str, str]] = []
+        self._indices: Dict[Tuple[str, str], int] = {}
+        self.etiqueta = array('H')       # índice en self.etiquetas
+        self.inicio_hijos = array('I')   # posición del primer hijo en self.hijos
+        self.num = array('B')            # cantidad de hijos
+        self.hijos = array('I')          # hijos de todos los nodos, contiguos por padre
+
+    def __len__(self) -> int:
+        return len(self.etiqueta)
+
+    def agregar(self, tipo: str, valor: str, hijos: Iterable[int] = ()) -> int:
+        clave = (tipo, valor)
+        indice = self._indices.get(clave)
+        if indice is None:
+            indice = self._indices[clave] = len(self.etiquetas)
+            self.etiquetas.append(clave)
+            if indice == 1 << 16 and self.etiqueta.typecode == 'H':
+                self.etiqueta = array('I', self.etiqueta)
+        nodo = len(self.etiqueta)
+        inicio = len(self.hijos)
+        self.etiqueta.append(indice)
+        self.inicio_hijos.append(inicio)
+        self.hijos.extend(hijos)
+        try:
+            self.num.append(len(self.hijos) - inicio)
+        except OverflowError:
+            # Primer nodo con más de 255 hijos
+            self.num = array('I', self.num)
+            self.num.append(len(self.hijos) - inicio)
+        return nodo
+
+    def num_hijos(self, nodo: int) -> int:
+        return self.num[nodo]
+
+    def hijos_de(self, nodo: int) -> array:
+        inicio = self.inicio_hijos[nodo]
+        return self.hijos[inicio:inicio + self.num[nodo]]
+
+    def tipo_de(self, nodo: int) -> str:
+        return self.etiquetas[self.etiqueta[nodo]][0]
+
+    def valor_de(self, nodo: int) -> str:
+        return self.etiquetas[self.etiqueta[nodo]][1]
+
+    def vista(self, nodo: int) -> 'VistaNodo':
+        return VistaNodo(self, nodo)
+
+    def memoria(self) -> int:
+        """Bytes ocupados por los arreglos del almacén"""
+        return sum(a.buffer_info()[1] * a.itemsize
+                   for a in (self.etiqueta, self.inicio_hijos, self.num, self.hijos))
+
+
+def compactar(raiz) -> 'VistaNodo':
+    """Copia un árbol de objetos Nodo a un AlmacenArbol nuevo (recorrido iterativo)"""
+    if isinstance(raiz, VistaNodo):
+        return raiz
+    almacen = AlmacenArbol()
+    # Postorden: cada nodo se agrega después de sus hijos
+    copiados: Dict[int, int] = {}
+    pila = [(raiz, False)]
+    while pila:
+        nodo, listo = pila.pop()
+        if listo:
+            copiados[id(nodo)] = almacen.agregar(nodo.tipo, nodo.valor, [copiados.pop(id(h)) for h in nodo.hijos])
+            continue
+        pila.append((nodo, True))
+        pila.extend((hijo, False) for hijo in reversed(nodo.hijos))
+    return almacen.vista(copiados[id(raiz)])
+
+
+def contar_nodos(raiz) -> int:
+    """Cantidad de nodos del árbol (recorrido iterativo; en un almacén, sin crear vistas)"""
+    if isinstance(raiz, VistaNodo):
+        almacen = raiz.almacen
+        hijos_de = almacen.hijos_de
+        pila = [raiz.id]
+        total = 0
+        while pila:
+            total += 1
+            pila.extend(hijos_de(pila.pop()))
+        return total
+    pila = [raiz]
+    total = 0
+    while pila:
+        total += 1
+        pila.extend(pila.pop().hijos)
+    return total
+
+
+class VistaNodo:
+    """Vista de solo lectura de un nodo de AlmacenArbol, compatible con Nodo"""
+    __slots__ = ('almacen', 'id')
+
+    def __init__(self, almacen: AlmacenArbol, nodo: int):
+        self.almacen = almacen
+        self.id = nodo
+
+    @property
+    def tipo(self) -> str:
+        return self.almacen.tipo_de(self.id)
+
+    @property
+    def valor(self) -> str:
+        return self.almacen.valor_de(self.id)
+
+    @property
+    def hijos(self) -> List['VistaNodo']:
+        almacen = self.almacen
+        return [VistaNodo(almacen, hijo) for hijo in almacen.hijos_de(self.id)]
+
+    def __eq__(self, otro) -> bool:
+        return isinstance(otro, VistaNodo) and otro.almacen is self.almacen and otro.id == self.id
+
+    def __hash__(self) -> int:
+        return hash((id(self.almacen), self.id))
+
+    def __repr__(self) -> str:
+        return f"VistaNodo({self.id}, {self.tipo!r}, {self.valor!r})"
@@ -0,0 +1,1727 @@
+"""Analizadores sintácticos sin interfaz gráfica.
+
+Este módulo contiene la lógica de reconocimiento de las tres gramáticas
+(arbol.py, abc.py y stf.py) y no importa tkinter, matplotlib ni networkx,
+así que puede usarse desde scripts y procesos por lotes. Además de los
+analizadores escritos para cada gramática, ParserGramatica analiza cualquier
+gramática declarada como texto a partir de sus tablas compiladas (gramatica.py).
+
+`es_valida_incremental` reanaliza una entrada que cambia de a poco (por ejemplo,
+mientras se escribe en la GUI) reutilizando lo que la edición no tocó: los
+segmentos ya resueltos de las tablas de memoización y de chart, los puntos de
+reanudación del LL(1) o los conjuntos de ítems de Earley del prefijo común.
+"""
+import io
+import json
+import re
+from array import array
+from collections import OrderedDict
+from bisect import bisect_right
+from itertools import compress
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from almacen import AlmacenArbol, ConstructorNodos, Nodo
+from control import MASCARA_REVISION, ControlAnalisis
+from gramatica import (FIN, SI_UN_HIJO, GramaticaCompilada, calcular_primeros, calcular_siguientes,
+                      cargar_gramatica, construir_tabla_ll1)
+from perfil import PERFIL_NULO, Perfil
+from traza import TRAZA_NULA, Traza
+
+# Máximo de segmentos (inicio, fin) guardados en la tabla de memoización
+TAM_MAX_MEMO = 100_000
+
+# Marca de segmento aún no resuelto en la tabla del chart
+_PENDIENTE = object()
+
+# Un estado incremental se descarta cuando su almacén supera este múltiplo del largo de la
+# entrada más un margen: los nodos de versiones anteriores no se liberan
+CRECIMIENTO_MAX_ALMACEN = 8
+MARGEN_ALMACEN = 4096
+# Tokens mínimos entre dos puntos de reanudación del análisis LL(1)
+INTERVALO_PUNTOS = 256
+
+
+class EstadoIncremental(NamedTuple):
+    """Lo que deja un análisis para reanalizar la versión siguiente de la entrada"""
+    entrada: str       # texto analizado (en STF, los tokens sin espacios)
+    clave: object      # analizador y modo (o tablas de la gramática) que lo produjeron
+    constructor: object  # almacén compartido por las versiones sucesivas (None si no se reutiliza)
+    datos: object      # tabla de segmentos, puntos de reanudación o conjuntos de ítems
+
+
+def tramo_comun(anterior: str, nueva: str) -> Tuple[int, int]:
+    """Largos del prefijo y del sufijo comunes, sin solaparse.
+
+    Se buscan con búsqueda binaria sobre comparaciones de rebanadas, que se hacen
+    en C, en lugar de recorrer carácter por carácter.
+    """
+    limite = min(len(anterior), len(nueva))
+    bajo, alto = 0, limite
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if anterior[:medio] == nueva[:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    prefijo = bajo
+    bajo, alto = 0, limite - prefijo
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if anterior[len(anterior) - medio:] == nueva[len(nueva) - medio:]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return prefijo, bajo
+
+
+def trasladar_segmentos(tabla: Dict[Tuple[int, int], object], anterior: str, nueva: str,
+                        cerrados: bool = False) -> "OrderedDict[Tuple[int, int], object]":
+    """Entradas de una tabla de segmentos que siguen valiendo después de la edición.
+
+    Sirve para tablas cuyo resultado depende solo del texto del segmento: se
+    conservan los segmentos del prefijo común y los del sufijo común, corridos
+    por la diferencia de largo. Con `cerrados`, las claves son [inicio, fin].
+    """
+    prefijo, sufijo = tramo_comun(anterior, nueva)
+    inicio_sufijo = len(anterior) - sufijo
+    delta = len(nueva) - len(anterior)
+    extra = 1 if cerrados else 0
+    trasladada: "OrderedDict[Tuple[int, int], object]" = OrderedDict()
+    for (inicio, fin), valor in tabla.items():
+        if fin + extra <= prefijo:
+            trasladada[(inicio, fin)] = valor
+        elif inicio >= inicio_sufijo:
+            trasladada[(inicio + delta, fin + delta)] = valor
+    return trasladada
+
+
+class ResultadoAnalisis(NamedTuple):
+    entrada: str
+    valida: bool
+    arbol: Optional[Nodo]
+
+
+# Tipo de los nodos que la recuperación de errores pone en lugar de lo que falta
+TIPO_ERROR = "ERROR"
+
+
+class ErrorSintactico(NamedTuple):
+    posicion: int                 # posición en la entrada (su largo si es el fin)
+    encontrado: str               # token encontrado (FIN al final de la entrada)
+    esperados: Tuple[str, ...]
+    mensaje: str
+
+
+class ResultadoRecuperacion(NamedTuple):
+    valida: bool
+    arbol: Optional[Nodo]         # árbol parcial, con nodos ERROR donde faltaba algo
+    errores: List[ErrorSintactico]
+
+
+def arbol_a_dict(nodo: Optional[Nodo]) -> Optional[dict]:
+    """Convierte el árbol en diccionarios anidados (recorrido iterativo)"""
+    if nodo is None:
+        return None
+    raiz = {"tipo": nodo.tipo, "valor": nodo.valor, "hijos": []}
+    pila = [(nodo, raiz)]
+    while pila:
+        actual, dic = pila.pop()
+        for hijo in actual.hijos:
+            dic_hijo = {"tipo": hijo.tipo, "valor": hijo.valor, "hijos": []}
+            dic["hijos"].append(dic_hijo)
+            pila.append((hijo, dic_hijo))
+    return raiz
+
+
+def arbol_a_json(nodo: Optional[Nodo]) -> str:
+    """Serializa el árbol al mismo JSON que arbol_a_dict + json.dumps compacto.
+
+    Se escribe con una pila explícita porque json.dumps no admite anidamientos profundos.
+    """
+    if nodo is None:
+        return "null"
+    partes = []
+    pila: list = [nodo]
+    while pila:
+        actual = pila.pop()
+        if isinstance(actual, str):
+            partes.append(actual)
+            continue
+        partes.append('{"tipo":%s,"valor":%s,"hijos":[' % (
+            json.dumps(actual.tipo, ensure_ascii=False), json.dumps(actual.valor, ensure_ascii=False)))
+        pila.append("]}")
+        hijos = actual.hijos
+        for i in range(len(hijos) - 1, -1, -1):
+            pila.append(hijos[i])
+            if i > 0:
+                pila.append(",")
+    return "".join(partes)
+
+
+def calcular_caidas(balance: List[int]) -> List[int]:
+    """caidas[k] = primera posición m > k con balance[m] < balance[k] (len(balance) si no hay).
+
+    Un segmento que empieza en k se mantiene sin bajar de su balance inicial hasta
+    la posición p si y solo si caidas[k] > p; se calcula en tiempo lineal con una pila.
+    """
+    n = len(balance)
+    caidas = [n] * n
+    pila: List[int] = []
+    for m, valor in enumerate(balance):
+        while pila and balance[pila[-1]] > valor:
+            caidas[pila.pop()] = m
+        pila.append(m)
+    return caidas
+
+
+def reconocer_rapido(palabra: str) -> bool:
+    """Reconoce la palabra en tiempo lineal con un contador de pila, sin construir el árbol"""
+    if not palabra or len(palabra) % 2 != 0:
+        return False
+    profundidad = 0
+    for c in palabra:
+        if c == '(':
+            profundidad += 1
+        elif c == ')':
+            profundidad -= 1
+            if profundidad < 0:
+                return False
+        else:
+            return False
+    return profundidad == 0
+
+
+class Analizador:
+    """Base común: destino de traza y análisis de muchas entradas"""
+    nombre = ""
+    ALFABETO = re.compile(r'')
+    MODOS: Tuple[str, ...] = ()  # modos aceptados por el parámetro `modo` (ninguno si está vacío)
+    modo: Optional[str] = None
+    # Texto de la gramática para el motor genérico (ver gramatica.py) y nodos de cada producción
+    GRAMATICA = ""
+    ETIQUETAS: Dict[str, Tuple[str, ...]] = {}
+
+    def __init__(self, traza: Optional[Traza] = None, compacto: bool = True,
+                 control: Optional[ControlAnalisis] = None, perfil: Optional[Perfil] = None):
+        self.traza = traza if traza is not None else TRAZA_NULA
+        self.compacto = compacto
+        # Cancelación y presupuesto; los ciclos de búsqueda lo revisan cada MASCARA_REVISION + 1 pasos
+        self.control = control
+        # Contadores de la búsqueda y tiempo por fase (ver perfil.py)
+        self.perfil = perfil if perfil is not None else PERFIL_NULO
+
+    def firma(self) -> str:
+        """Gramática y opciones que cambian el resultado; es la clave del analizador en el caché"""
+        return f"{self.nombre}/{self.modo}" if self.modo else self.nombre
+
+    def crear_constructor(self, abandona_ramas: bool = False):
+        """Almacén de arreglos (compacto) u objetos Nodo para el árbol de un análisis.
+
+        AlmacenArbol solo agrega nodos, así que las búsquedas con backtracking, que
+        construyen nodos en ramas que luego descartan (`abandona_ramas`), usan objetos
+        Nodo para que el recolector de basura libere esas ramas.
+        """
+        return AlmacenArbol() if self.compacto and not abandona_ramas else ConstructorNodos()
+
+    def es_valida(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        raise NotImplementedError
+
+    def posicion_error(self, palabra: str) -> Optional[int]:
+        """Primera posición en la que una palabra rechazada deja de tener arreglo (None si no se sabe)"""
+        return None
+
+    def analizar_con_recuperacion(self, palabra: str) -> Optional[ResultadoRecuperacion]:
+        """Análisis que informa todos los errores y arma un árbol parcial; None si el analizador no lo admite"""
+        return None
+
+    def es_valida_incremental(self, palabra: str, anterior: Optional[EstadoIncremental] = None
+                              ) -> Tuple[bool, Optional[Nodo], Optional[EstadoIncremental]]:
+        """Como es_valida, pero reutiliza de `anterior` (el estado del análisis de la versión previa
+        de la entrada) lo que la edición no tocó. Devuelve también el estado para la versión
+        siguiente; por defecto analiza todo de nuevo y no deja estado.
+        """
+        valida, arbol = self.es_valida(palabra)
+        return valida, arbol, None
+
+    def _retomar(self, anterior: Optional[EstadoIncremental], clave: object, entrada: str) -> bool:
+        """Si el estado anterior sirve para reanalizar `entrada` con este analizador y modo"""
+        return (anterior is not None and anterior.clave == clave and self.compacto
+                and len(anterior.constructor) <= CRECIMIENTO_MAX_ALMACEN * len(entrada) + MARGEN_ALMACEN)
+
+    def analizador_gramatica(self) -> 'ParserGramatica':
+        """Motor genérico con las tablas compiladas de GRAMATICA (modo "earley"); comparte traza, control y perfil"""
+        return ParserGramatica(cargar_gramatica(self.GRAMATICA, self.ETIQUETAS), self.traza, self.compacto,
+                               self.control, self.perfil)
+
+    def parse_many(self, entradas: Iterable[str]) -> Iterator[ResultadoAnalisis]:
+        """Analiza cada entrada en orden y produce un resultado por entrada (con su propio presupuesto)"""
+        for entrada in entradas:
+            if self.control is not None:
+                self.control.iniciar()
+            valida, arbol = self.es_valida(entrada)
+            yield ResultadoAnalisis(entrada, valida, arbol)
+
+
+class EstadoEarley(NamedTuple):
+    """Conjuntos de ítems de un reconocimiento, para retomarlo desde un prefijo común"""
+    vistos: List[set]
+    esperando: List[Dict[int, List[Tuple[int, int]]]]
+    inicios: Dict[Tuple[int, int], set]
+    semillas: List[Tuple[Tuple[int, int], ...]]  # ítems con que empezó cada conjunto procesado
+
+
+class ParserGramatica(Analizador):
+    """Motor genérico: reconocedor de Earley sobre las tablas de una GramaticaCompilada.
+
+    Acepta cualquier gramática libre de contexto (recursión izquierda, producciones
+    ε, ambigüedad). El análisis tiene dos fases:
+
+    1. Reconocimiento: un conjunto de ítems (estado, origen) por posición, con
+       predicción filtrada por FIRST del carácter siguiente y el arreglo de Aycock
+       y Horspool para los no terminales anulables. Se detiene en la primera
+       posición donde ningún ítem puede avanzar. El costo es O(n) para gramáticas
+       LR como la de stf.py, O(n²) para las no ambiguas y O(n³) en el peor caso,
+       contra el tiempo exponencial del backtracking.
+    2. Árbol: desde (inicial, 0, n) se elige para cada tramo la primera producción
+       de la gramática que lo deriva y, de derecha a izquierda, el primer punto de
+       corte en orden creciente cuyo prefijo figura como ítem en el conjunto
+       correspondiente. Es el mismo orden de búsqueda de los analizadores
+       escritos a mano, así que los árboles coinciden.
+    """
+    nombre = "gramatica"
+
+    def __init__(self, gramatica: GramaticaCompilada, traza: Optional[Traza] = None,
+                 compacto: bool = True, control: Optional[ControlAnalisis] = None,
+                 perfil: Optional[Perfil] = None):
+        super().__init__(traza, compacto, control, perfil)
+        self.gramatica = gramatica
+
+    def es_valida(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        constructor = self.crear_constructor()
+        control = self.control
+        if control is not None:
+            control.retomar()
+        reconocido = self.reconocer(palabra)
+        if reconocido is None:
+            return False, None
+        raiz = self.construir_arbol(palabra, *reconocido, constructor)
+        if control is not None:
+            control.actualizar(control.pasos, len(constructor))
+        return True, constructor.vista(raiz)
+
+    def es_valida_incremental(self, palabra: str, anterior: Optional[EstadoIncremental] = None
+                              ) -> Tuple[bool, Optional[Nodo], Optional[EstadoIncremental]]:
+        """Retoma el reconocimiento desde el prefijo común; el árbol se vuelve a armar entero"""
+        constructor = self.crear_constructor()
+        control = self.control
+        if control is not None:
+            control.retomar()
+        previo = anterior.datos if anterior is not None and anterior.clave is self.gramatica else None
+        prefijo = tramo_comun(anterior.entrada, palabra)[0] if previo is not None else 0
+        reconocido, estado = self.reconocer_incremental(palabra, previo, prefijo)
+        nuevo = EstadoIncremental(palabra, self.gramatica, None, estado)
+        if reconocido is None:
+            return False, None, nuevo
+        raiz = self.construir_arbol(palabra, *reconocido, constructor)
+        if control is not None:
+            control.actualizar(control.pasos, len(constructor))
+        return True, constructor.vista(raiz), nuevo
+
+    def reconocer(self, palabra: str) -> Optional[Tuple[List[set], Dict[Tuple[int, int], set]]]:
+        """Conjuntos de ítems de cada posición y orígenes de cada (no terminal, fin) completado.
+
+        Devuelve None si la palabra no pertenece al lenguaje.
+        """
+        return self.reconocer_incremental(palabra)[0]
+
+    def reconocer_incremental(self, palabra: str, anterior: Optional[EstadoEarley] = None, prefijo: int = 0
+                              ) -> Tuple[Optional[Tuple[List[set], Dict[Tuple[int, int], set]]], EstadoEarley]:
+        """Como reconocer, retomando desde los conjuntos de `anterior` cuyos ítems solo dependen
+        de los primeros `prefijo` caracteres; devuelve también el estado para la próxima vez.
+
+        El conjunto i se siembra con la lectura de palabra[i - 1] y predice según
+        palabra[i], así que los conjuntos 0..prefijo - 1 quedan enteros y el conjunto
+        `prefijo` se vuelve a armar desde sus semillas.
+        """
+        g = self.gramatica
+        nt_siguiente, t_siguiente, completa = g.nt_siguiente, g.t_siguiente, g.completa
+        predice, predice_vacio, anulables = g.predice, g.predice_vacio, g.anulables
+        traza = self.traza
+        trazar = traza.activa
+        control = self.control
+        vigilar = control is not None
+        pasos = control.pasos if vigilar else 0
+        perfil = self.perfil
+        medir = perfil.activo
+
+        n = len(palabra)
+        retomar = 0 if anterior is None else min(prefijo, len(anterior.semillas) - 1, n)
+        if retomar > 0:
+            items = list(anterior.semillas[retomar])
+            vistos: List[set] = anterior.vistos[:retomar] + [set(items)] + [set() for _ in range(n - retomar)]
+            esperando: List[Dict[int, List[Tuple[int, int]]]] = anterior.esperando[:retomar]
+            # inicios[(a, fin)] = orígenes de los tramos [origen, fin) que derivan el no terminal a
+            inicios: Dict[Tuple[int, int], set] = {clave: origenes for clave, origenes in anterior.inicios.items()
+                                                   if clave[1] < retomar}
+            semillas = anterior.semillas[:retomar]
+            if trazar:
+                traza.registrar(1, "↺ Conjuntos 0-%d reutilizados del análisis anterior", retomar - 1)
+        else:
+            retomar = 0
+            vistos = [set() for _ in range(n + 1)]
+            esperando = []
+            inicios = {}
+            semillas = []
+            items = [(g.inicio[p], 0) for p in g.por_lhs[g.inicial]]
+            vistos[0].update(items)
+        conjuntos = EstadoEarley(vistos, esperando, inicios, semillas)
+        for i in range(retomar, n + 1):
+            semillas.append(tuple(items))
+            visto = vistos[i]
+            espera: Dict[int, List[Tuple[int, int]]] = {}
+            esperando.append(espera)
+            caracter = palabra[i] if i < n else ''
+            visto_siguiente = vistos[i + 1] if i < n else None
+            siguientes: List[Tuple[int, int]] = []
+            predichos = set()
+            k = 0
+            while k < len(items):
+                if vigilar:
+                    pasos += 1
+                    if not pasos & MASCARA_REVISION:
+                        control.revisar(pasos)
+                estado, origen = items[k]
+                k += 1
+                a = nt_siguiente[estado]
+                if a >= 0:
+                    # Predicción: se espera el no terminal a en la posición i
+                    espera.setdefault(a, []).append((estado, origen))
+                    if a not in predichos:
+                        predichos.add(a)
+                        for inicio in predice[a].get(caracter, predice_vacio[a]):
+                            item = (inicio, i)
+                            if item not in visto:
+                                visto.add(item)
+                                items.append(item)
+                    if anulables[a]:
+                        item = (estado + 1, origen)
+                        if item not in visto:
+                            visto.add(item)
+                            items.append(item)
+                    continue
+                terminal = t_siguiente[estado]
+                if terminal:
+                    # Lectura: el terminal coincide con el carácter actual
+                    if terminal == caracter:
+                        item = (estado + 1, origen)
+                        if item not in visto_siguiente:
+                            visto_siguiente.add(item)
+                            siguientes.append(item)
+                    continue
+                # Compleción: [origen, i) deriva el no terminal b
+                b = completa[estado]
+                clave = (b, i)
+                origenes = inicios.get(clave)
+                if origenes is None:
+                    inicios[clave] = origenes = set()
+                origenes.add(origen)
+                if origen != i:
+                    for estado_padre, origen_padre in esperando[origen].get(b, ()):
+                        item = (estado_padre + 1, origen_padre)
+                        if item not in visto:
+                            visto.add(item)
+                            items.append(item)
+
+            if medir:
+                perfil.contadores["llamadas"] += k
+            if trazar:
+                traza.registrar(1, "Conjunto %d: %d ítems", i, len(items))
+            if i < n and not siguientes:
+                if trazar:
+                    esperados = sorted({t_siguiente[e] for e, _ in items if t_siguiente[e]})
+                    traza.registrar(0, "❌ Error en posición %d: carácter no esperado '%s' (se esperaba: %s)",
+                                    i, caracter, " ".join(esperados) or "fin de entrada")
+                if vigilar:
+                    control.actualizar(pasos)
+                return None, conjuntos
+            items = siguientes
+
+        if vigilar:
+            control.actualizar(pasos)
+        if 0 not in inicios.get((g.inicial, n), ()):
+            if trazar:
+                traza.registrar(0, "❌ Fin de entrada inesperado en posición %d", n)
+            return None, conjuntos
+        if trazar:
+            traza.registrar(0, "✓ Palabra reconocida")
+        return (vistos, inicios), conjuntos
+
+    def construir_arbol(self, palabra: str, vistos: List[set], inicios: Dict[Tuple[int, int], set],
+                        constructor) -> int:
+        """Arma un árbol de derivación a partir de los conjuntos de ítems (sin recursión)"""
+        g = self.gramatica
+        traza = self.traza
+        trazar = traza.activa
+        medir = self.perfil.activo
+        cuenta = self.perfil.contadores if medir else None
+        control = self.control
+        vigilar = control is not None
+        pasos = control.pasos if vigilar else 0
+        ordenados: Dict[Tuple[int, int], List[int]] = {}
+        # Elecciones ya resueltas para tramos que cubren el mismo segmento que su padre
+        decisiones: Dict[Tuple[int, int, int], Tuple[int, List[Tuple[int, int, int, int]]]] = {}
+
+        def candidatos(s: int, fin: int, desde: int) -> List[int]:
+            lista = ordenados.get((s, fin))
+            if lista is None:
+                ordenados[(s, fin)] = lista = sorted(inicios.get((s, fin), ()))
+            return lista[bisect_right(lista, desde - 1):]
+
+        def dividir(p: int, i: int, j: int, cadena: frozenset) -> Optional[List[Tuple[int, int, int, int]]]:
+            """Tramos (símbolo, inicio, fin, posición) de los no terminales de p sobre [i, j).
+
+            Un hijo que cubre todo [i, j) solo se acepta si su no terminal no está ya en
+            la cadena de tramos iguales de los ancestros (así S → SS con un lado vacío
+            no se repite sin fin) y si él mismo tiene una derivación válida.
+            """
+            nonlocal pasos
+            derecha = g.derechas[p]
+            base = g.inicio[p]
+            hijos: List[Tuple[int, int, int, int]] = []
+            # Pila de (posición del símbolo, fin del símbolo, iterador de los cortes restantes)
+            pila: List[Tuple[int, int, Iterator[int]]] = []
+            t, fin = len(derecha) - 1, j
+            while True:
+                if vigilar:
+                    pasos += 1
+                    if not pasos & MASCARA_REVISION:
+                        control.revisar(pasos)
+                if t < 0:
+                    if fin == i:
+                        hijos.reverse()
+                        return hijos
+                    # Solo pasa con una producción vacía sobre un tramo no vacío
+                    opciones: Iterator[int] = iter(())
+                else:
+                    s = derecha[t]
+                    if isinstance(s, str):
+                        cortes = [fin - 1] if fin > i and palabra[fin - 1] == s else []
+                    else:
+                        cortes = candidatos(s, fin, i)
+                    estado = base + t
+                    opciones = (m for m in cortes if (estado, i) in vistos[m])
+                while True:
+                    m = next(opciones, None)
+                    if m is not None:
+                        s = derecha[t]
+                        if isinstance(s, int):
+                            if m == i and fin == j:
+                                if s in cadena:
+                                    continue
+                                eleccion = decisiones.get((s, i, j))
+                                if medir:
+                                    cuenta["memo_aciertos" if eleccion is not None else "memo_fallos"] += 1
+                                eleccion = eleccion or elegir(s, i, j, cadena | {s})
+                                if eleccion is None:
+                                    continue
+                                decisiones[(s, i, j)] = eleccion
+                            hijos.append((s, m, fin, t))
+                        pila.append((t, fin, opciones))
+                        if medir:
+                            cuenta["divisiones"] += 1
+                            if len(pila) > cuenta["profundidad_max"]:
+                                cuenta["profundidad_max"] = len(pila)
+                        t, fin = t - 1, m
+                        break
+                    # Sin más cortes: se vuelve al símbolo anterior (a la derecha)
+                    if not pila:
+                        return None
+                    if medir:
+                        cuenta["retrocesos"] += 1
+                    t, fin, opciones = pila.pop()
+                    if isinstance(derecha[t], int):
+                        hijos.pop()
+
+        def elegir(a: int, i: int, j: int, cadena: frozenset) -> Optional[Tuple[int, List[Tuple[int, int, int, int]]]]:
+            for p in g.por_lhs[a]:
+                hijos = dividir(p, i, j, cadena)
+                if hijos is not None:
+                    return p, hijos
+            return None
+
+        lhs = g.lhs
+        # Preorden de (producción, primer hijo de una cadena recursiva a izquierda, cantidad de hijos)
+        plan: List[Tuple[int, bool, int]] = []
+        pila = [(g.inicial, 0, len(palabra), False)]
+        while pila:
+            a, i, j, en_cadena = pila.pop()
+            eleccion = decisiones.pop((a, i, j), None) or elegir(a, i, j, frozenset((a,)))
+            p, hijos = eleccion
+            if trazar:
+                traza.registrar(1, "Aplicando %s en [%d, %d)", g.texto_produccion(p), i, j)
+            plan.append((p, en_cadena, len(hijos)))
+            for s, m, fin, t in reversed(hijos):
+                pila.append((s, m, fin, t == 0 and s == lhs[p]))
+
+        if vigilar:
+            control.actualizar(pasos)
+        return self.armar_nodos(plan, constructor)
+
+    def armar_nodos(self, plan: List[Tuple[int, bool, int]], constructor) -> int:
+        """Arma los nodos de una derivación dada en preorden como (producción, en_cadena, hijos).
+
+        `en_cadena` marca al primer símbolo de una producción recursiva a izquierda de
+        su mismo no terminal. El preorden invertido arma cada nodo después de sus
+        hijos, que quedan en orden en la pila.
+        """
+        etiquetas = self.gramatica.etiquetas
+        agregar = constructor.agregar
+        num_hijos = constructor.num_hijos
+        previos = len(constructor)
+        nodos: list = []
+        for p, en_cadena, cantidad in reversed(plan):
+            hijos_nodo = [nodos.pop() for _ in range(cantidad)]
+            tipo, valor, envoltura = etiquetas[p]
+            if envoltura == SI_UN_HIJO and cantidad == 1:
+                # Producción unitaria: como el cierre de T → F ('*' F)*, solo envuelve a un hijo
+                # con un único hijo y nunca dentro de su propia cadena recursiva
+                hijo = hijos_nodo[0]
+                if en_cadena or num_hijos(hijo) != 1:
+                    nodos.append(hijo)
+                    continue
+            nodos.append(agregar(tipo, valor, hijos_nodo))
+        if self.perfil.activo:
+            self.perfil.contadores["nodos"] += len(constructor) - previos
+        return nodos.pop()
+
+
+class ParserParentesis(Analizador):
+    """Gramática S → (S) | SS | () de arbol.py"""
+    nombre = "arbol"
+    ALFABETO = re.compile(r'^[()]*$')
+    MODOS = ("memo", "backtracking", "rapido", "earley")
+    GRAMATICA = "S → (S) | SS | ()"
+    ETIQUETAS = {"S → (S)": ("PAREN", "(S)"), "S → SS": ("CONCAT", "SS"), "S → ()": ("EMPTY", "()")}
+
+    def __init__(self, traza: Optional[Traza] = None, modo: str = "memo", compacto: bool = True,
+                 control: Optional[ControlAnalisis] = None, perfil: Optional[Perfil] = None):
+        super().__init__(traza, compacto, control, perfil)
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo desconocido: {modo}")
+        self.modo = modo
+
+    def es_valida(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        """Analiza si la palabra es válida según la gramática"""
+        if not self.ALFABETO.match(palabra):
+            if self.traza.activa:
+                self.traza.registrar(0, "❌ La palabra solo debe contener paréntesis")
+            return False, None
+
+        if self.modo == "rapido":
+            return reconocer_rapido(palabra), None
+        if self.modo == "earley":
+            return self.analizador_gramatica().es_valida(palabra)
+
+        if not palabra:
+            if self.traza.activa:
+                self.traza.registrar(0, "❌ Palabra vacía")
+            return False, None
+
+        if len(palabra) % 2 != 0:
+            if self.traza.activa:
+                self.traza.registrar(0, "❌ Longitud impar (%s)", len(palabra))
+            return False, None
+
+        if self.modo == "memo":
+            return self.es_valida_memo(palabra)
+        return self.es_valida_backtracking(palabra)
+
+    def es_valida_incremental(self, palabra: str, anterior: Optional[EstadoIncremental] = None
+                              ) -> Tuple[bool, Optional[Nodo], Optional[EstadoIncremental]]:
+        """En modo memo, la tabla de segmentos y el almacén pasan de una versión a la siguiente"""
+        if self.modo == "earley" and self.ALFABETO.match(palabra):
+            return self.analizador_gramatica().es_valida_incremental(palabra, anterior)
+        if self.modo != "memo" or not self.ALFABETO.match(palabra) or not palabra or len(palabra) % 2 != 0:
+            # Rechazo inmediato: el estado anterior sigue sirviendo para la próxima versión
+            valida, arbol = self.es_valida(palabra)
+            return valida, arbol, anterior
+        clave = (self.nombre, self.modo)
+        if self._retomar(anterior, clave, palabra):
+            constructor = anterior.constructor
+            memo = trasladar_segmentos(anterior.datos, anterior.entrada, palabra, cerrados=True)
+            if self.traza.activa:
+                self.traza.registrar(0, "↺ %d segmentos reutilizados del análisis anterior", len(memo))
+        else:
+            constructor, memo = AlmacenArbol(), OrderedDict()
+        valida, arbol = self._buscar(palabra, True, memo, constructor)
+        return valida, arbol, EstadoIncremental(palabra, clave, constructor, memo)
+
+    def posicion_error(self, palabra: str) -> Optional[int]:
+        """Primer carácter inválido o ')' sin pareja; si no hay, el final (o None si la palabra es válida)"""
+        profundidad = 0
+        for i, c in enumerate(palabra):
+            if c == '(':
+                profundidad += 1
+            elif c == ')' and profundidad:
+                profundidad -= 1
+            else:
+                return i
+        return len(palabra) if profundidad or not palabra else None
+
+    def es_valida_backtracking(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        """Búsqueda con backtracking sin memoización (exponencial en el peor caso)"""
+        return self._buscar(palabra, memoizar=False)
+
+    def es_valida_memo(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        """Búsqueda memoizada por segmentos (inicio, fin); construye el mismo árbol que el backtracking"""
+        return self._buscar(palabra, memoizar=True)
+
+    def _buscar(self, palabra: str, memoizar: bool, memo: Optional["OrderedDict[Tuple[int, int], Optional[int]]"] = None,
+                constructor=None) -> Tuple[bool, Optional[Nodo]]:
+        """Búsqueda de (S) y luego SS sobre segmentos cerrados [inicio, fin] con una pila explícita.
+
+        Cada marco de la pila es [inicio, fin, nivel, estado, indice, arbol_izq]; `retorno`
+        lleva el resultado del último segmento resuelto (nodo o None) al marco que lo pidió,
+        así que la profundidad de anidamiento no está limitada por la recursión de Python.
+        Con `memoizar`, los segmentos resueltos se guardan en una tabla LRU acotada, las
+        divisiones SS solo se prueban donde la profundidad vuelve a la inicial y se descarta
+        en O(1) todo segmento cuya profundidad baja de la inicial. En esta gramática todo
+        segmento balanceado que pasa ese filtro es válido, así que la búsqueda no explora
+        segmentos que fallan y el tiempo es casi lineal, sin depender del tamaño de la tabla.
+        `memo` y `constructor` permiten seguir con la tabla y el almacén de un análisis anterior.
+        """
+        if constructor is None:
+            constructor = self.crear_constructor(abandona_ramas=not memoizar)
+        nuevo = constructor.agregar
+        traza = self.traza
+        trazar = traza.activa
+
+        # profundidad[k] = balance de paréntesis antes de la posición k
+        profundidad = [0]
+        for c in palabra:
+            profundidad.append(profundidad[-1] + (1 if c == '(' else -1))
+
+        # Posiciones donde se alcanza cada profundidad: candidatos para dividir en SS
+        retornos: Dict[int, List[int]] = {}
+        caidas: List[int] = []
+        if memoizar:
+            for k, p in enumerate(profundidad):
+                retornos.setdefault(p, []).append(k)
+            caidas = calcular_caidas(profundidad)
+
+        if memo is None:
+            memo = OrderedDict()
+        pila: List[list] = []
+        medir = self.perfil.activo
+        cuenta = self.perfil.contadores if medir else None
+        previos = len(constructor)
+
+        def empezar(inicio: int, fin: int, nivel: int):
+            """Resultado inmediato del segmento, o _PENDIENTE si se apiló para analizarlo"""
+            if inicio >= fin or (memoizar and (fin - inicio) % 2 == 0):
+                if trazar:
+                    traza.registrar(nivel, "❌ Segmento vacío o de longitud impar")
+                return None
+            if memoizar:
+                if profundidad[fin + 1] != profundidad[inicio] or caidas[inicio] <= fin + 1:
+                    if trazar:
+                        traza.registrar(nivel, "❌ Segmento desbalanceado")
+                    return None
+                resultado = memo.get((inicio, fin), _PENDIENTE)
+                if medir:
+                    cuenta["memo_aciertos" if resultado is not _PENDIENTE else "memo_fallos"] += 1
+                if resultado is not _PENDIENTE:
+                    memo.move_to_end((inicio, fin))
+                    if trazar:
+                        traza.registrar(nivel, "↺ Segmento %s-%s ya analizado", inicio, fin)
+                    return resultado
+            pila.append([inicio, fin, nivel, 0, 0, None])
+            if medir:
+                cuenta["llamadas"] += 1
+                if len(pila) > cuenta["profundidad_max"]:
+                    cuenta["profundidad_max"] = len(pila)
+            return _PENDIENTE
+
+        control = self.control
+        vigilar = control is not None
+        pasos = control.retomar() if vigilar else 0
+
+        retorno = empezar(0, len(palabra) - 1, 0)
+        while pila:
+            if vigilar:
+                pasos += 1
+                if not pasos & MASCARA_REVISION:
+                    control.revisar(pasos, len(constructor))
+            marco = pila[-1]
+            inicio, fin, nivel, estado = marco[0], marco[1], marco[2], marco[3]
+            resultado = _PENDIENTE
+
+            if estado == 0:
+                if trazar:
+                    traza.registrar(nivel, "Analizando segmento: %s", palabra[inicio:fin+1])
+                # Caso base: paréntesis vacíos
+                if inicio + 1 == fin and palabra[inicio] == '(' and palabra[fin] == ')':
+                    if trazar:
+                        traza.registrar(nivel, "✓ Encontrado () válido")
+                    resultado = nuevo("EMPTY", "()")
+                elif palabra[inicio] != '(' or palabra[fin] != ')':
+                    if trazar:
+                        traza.registrar(nivel, "❌ Paréntesis no válidos o segmento muy corto")
+                    resultado = None
+                else:
+                    # Caso (S)
+                    if trazar:
+                        traza.registrar(nivel, "Probando caso (S)")
+                    marco[3] = 1
+                    retorno = empezar(inicio + 1, fin - 1, nivel + 1)
+                    continue
+
+            elif estado == 1:
+                if retorno is not None:
+                    if trazar:
+                        traza.registrar(nivel, "✓ Caso (S) válido")
+                    resultado = nuevo("PAREN", "(S)", [retorno])
+                else:
+                    # Caso SS
+                    if trazar:
+                        traza.registrar(nivel, "Probando caso SS")
+                    if medir:
+                        cuenta["retrocesos"] += 1
+                    if memoizar:
+                        marco[4] = bisect_right(retornos[profundidad[inicio]], inicio + 1)
+                    marco[3] = 2
+                    continue
+
+            elif estado == 2:
+                # Siguiente división a probar
+                if memoizar:
+                    candidatos = retornos[profundidad[inicio]]
+                    medio = candidatos[marco[4]] - 1 if marco[4] < len(candidatos) else fin
+                else:
+                    medio = inicio + 1 + 2 * marco[4]
+                if medio >= fin:
+                    if trazar:
+                        traza.registrar(nivel, "❌ No se encontró una división válida")
+                    resultado = None
+                else:
+                    if trazar:
+                        traza.registrar(nivel, "Intentando división en posición %s", medio)
+                    if medir:
+                        cuenta["divisiones"] += 1
+                    marco[3] = 3
+                    retorno = empezar(inicio, medio, nivel + 1)
+                    continue
+
+            elif estado == 3:
+                # Resultado del lado izquierdo
+                if retorno is None:
+                    if medir:
+                        cuenta["retrocesos"] += 1
+                    marco[3] = 2
+                    marco[4] += 1
+                    continue
+                medio = (retornos[profundidad[inicio]][marco[4]] - 1) if memoizar else inicio + 1 + 2 * marco[4]
+                marco[5] = retorno
+                marco[3] = 4
+                retorno = empezar(medio + 1, fin, nivel + 1)
+                continue
+
+            else:
+                # Resultado del lado derecho
+                if retorno is None:
+                    if medir:
+                        cuenta["retrocesos"] += 1
+                    marco[3] = 2
+                    marco[4] += 1
+                    continue
+                if trazar:
+                    traza.registrar(nivel, "✓ Caso SS válido")
+                resultado = nuevo("CONCAT", "SS", [marco[5], retorno])
+
+            # Segmento resuelto: se guarda y se devuelve al marco anterior
+            pila.pop()
+            if memoizar:
+                memo[(inicio, fin)] = resultado
+                if len(memo) > TAM_MAX_MEMO:
+                    memo.popitem(last=False)
+            retorno = resultado
+
+        if vigilar:
+            control.actualizar(pasos, len(constructor))
+        if medir:
+            cuenta["nodos"] += len(constructor) - previos
+        return retorno is not None, constructor.vista(retorno) if retorno is not None else None
+
+
+class ParserABC(Analizador):
+    """Gramática S → SS | aSb | aSc | E de abc.py"""
+    nombre = "abc"
+    ALFABETO = re.compile(r'^[abc]*$')
+    MODOS = ("chart", "backtracking", "earley")
+    GRAMATICA = "S → SS | aSb | aSc | E"
+    ETIQUETAS = {"S → SS": ("CONCAT", "SS"), "S → aSb": ("PROD", "aSb"), "S → aSc": ("PROD", "aSc"),
+                 "S → E": ("EMPTY", "E")}
+
+    def __init__(self, traza: Optional[Traza] = None, modo: str = "chart", compacto: bool = True,
+                 control: Optional[ControlAnalisis] = None, perfil: Optional[Perfil] = None):
+        super().__init__(traza, compacto, control, perfil)
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo desconocido: {modo}")
+        self.modo = modo
+
+    def es_valida(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        if not self.ALFABETO.match(palabra):
+            if self.traza.activa:
+                self.traza.registrar(0, "❌ La palabra solo debe contener los caracteres a, b y c")
+            return False, None
+
+        if self.modo == "earley":
+            return self.analizador_gramatica().es_valida(palabra)
+
+        if not palabra:
+            if self.traza.activa:
+                self.traza.registrar(0, "✓ Palabra vacía (E)")
+            constructor = self.crear_constructor()
+            return True, constructor.vista(constructor.agregar("EMPTY", "E"))
+
+        if self.modo == "chart":
+            return self.es_valida_chart(palabra)
+        return self.es_valida_backtracking(palabra)
+
+    def es_valida_incremental(self, palabra: str, anterior: Optional[EstadoIncremental] = None
+                              ) -> Tuple[bool, Optional[Nodo], Optional[EstadoIncremental]]:
+        """En modo chart, la tabla de segmentos y el almacén pasan de una versión a la siguiente"""
+        if self.modo == "earley" and self.ALFABETO.match(palabra):
+            return self.analizador_gramatica().es_valida_incremental(palabra, anterior)
+        if self.modo != "chart" or not self.ALFABETO.match(palabra) or not palabra:
+            valida, arbol = self.es_valida(palabra)
+            return valida, arbol, anterior
+        clave = (self.nombre, self.modo)
+        if self._retomar(anterior, clave, palabra):
+            constructor = anterior.constructor
+            tabla = trasladar_segmentos(anterior.datos, anterior.entrada, palabra)
+            if self.traza.activa:
+                self.traza.registrar(0, "↺ %d segmentos reutilizados del análisis anterior", len(tabla))
+        else:
+            constructor, tabla = AlmacenArbol(), {}
+        valida, arbol = self.es_valida_chart(palabra, tabla, constructor)
+        return valida, arbol, EstadoIncremental(palabra, clave, constructor, tabla)
+
+    def es_valida_backtracking(self, palabra: str) -> Tuple[bool, Optional[Nodo]]:
+        """Búsqueda con backtracking sin memoización (exponencial en el peor caso).
+
+        Recorre los segmentos [inicio, fin) con una pila explícita de marcos
+        [inicio, fin, nivel, estado, medio, arbol_izq], en el mismo orden que la
+        versión recursiva: primero SS con cada división, luego aSb/aSc.
+        """
+        constructor = self.crear_constructor(abandona_ramas=True)
+        nuevo = constructor.agregar
+        traza = self.traza
+        trazar = traza.activa
+
+        control = self.control
+        vigilar = control is not None
+        pasos = control.retomar() if vigilar else 0
+
+        medir = self.perfil.activo
+        cuenta = self.perfil.contadores if medir else None
+
+        pila: List[list] = [[0, len(palabra), 0, 0, 0, None]]
+        retorno = None
+        while pila:
+            if vigilar:
+                pasos += 1
+                if not pasos & MASCARA_REVISION:
+                    control.revisar(pasos, len(constructor))
+            marco = pila[-1]
+            inicio, fin, nivel, estado = marco[0], marco[1], marco[2], marco[3]
+            resultado = _PENDIENTE
+
+            if estado == 0:
+                if medir:
+                    cuenta["llamadas"] += 1
+                    if len(pila) > cuenta["profundidad_max"]:
+                        cuenta["profundidad_max"] = len(pila)
+                if trazar:
+                    traza.registrar(nivel, "Analizando: '%s'", palabra[inicio:fin])
+                # Caso E (cadena vacía)
+                if inicio == fin:
+                    if trazar:
+                        traza.registrar(nivel, "✓ Caso E válido")
+                    resultado = nuevo("EMPTY", "E")
+                else:
+                    # Caso SS
+                    if trazar:
+                        traza.registrar(nivel, "Probando caso SS")
+                    marco[4] = inicio + 1
+                    marco[3] = 2
+                    continue
+
+            elif estado == 2:
+                medio = marco[4]
+                if medio < fin:
+                    if medir:
+                        cuenta["divisiones"] += 1
+                    marco[3] = 3
+                    pila.append([inicio, medio, nivel + 1, 0, 0, None])
+                    continue
+                # Casos aSb y aSc
+                final = palabra[fin - 1]
+                if fin - inicio >= 2 and palabra[inicio] == 'a' and final in ('b', 'c'):
+                    if trazar:
+                        traza.registrar(nivel, "Probando caso aS%s", final)
+                    marco[3] = 5
+                    pila.append([inicio + 1, fin - 1, nivel + 1, 0, 0, None])
+                    continue
+                if trazar:
+                    traza.registrar(nivel, "❌ No se encontró una producción válida")
+                resultado = None
+
+            elif estado == 3:
+                # Resultado del lado izquierdo
+                if retorno is None:
+                    if medir:
+                        cuenta["retrocesos"] += 1
+                    marco[4] += 1
+                    marco[3] = 2
+                    continue
+                marco[5] = retorno
+                marco[3] = 4
+                pila.append([marco[4], fin, nivel + 1, 0, 0, None])
+                continue
+
+            elif estado == 4:
+                # Resultado del lado derecho
+                if retorno is None:
+                    if medir:
+                        cuenta["retrocesos"] += 1
+                    marco[4] += 1
+                    marco[3] = 2
+                    continue
+                if trazar:
+                    traza.registrar(nivel, "✓ Caso SS válido")
+                resultado = nuevo("CONCAT", "SS", [marco[5], retorno])
+
+            else:
+                # Resultado de aSb / aSc
+                final = palabra[fin - 1]
+                if retorno is not None:
+                    if trazar:
+                        traza.registrar(nivel, "✓ Caso aS%s válido", final)
+                    resultado = nuevo("PROD", f"aS{final}", [retorno])
+                else:
+                    if trazar:
+                        traza.registrar(nivel, "❌ No se encontró una producción válida")
+                    resultado = None
+
+            pila.pop()
+            retorno = resultado
+
+        if vigilar:
+            control.actualizar(pasos, len(constructor))
+        if medir:
+            cuenta["nodos"] += len(constructor)
+        return retorno is not None, constructor.vista(retorno) if retorno is not None else None
+
+    def es_valida_chart(self, palabra: str, tabla: Optional[Dict[Tuple[int, int], Optional[Nodo]]] = None,
+                        constructor=None) -> Tuple[bool, Optional[Nodo]]:
+        """Parser de tabla sobre segmentos [inicio, fin) de la palabra original, sin copiar subcadenas.
+
+        Cada segmento se resuelve una sola vez y se prueba en el mismo orden que el
+        backtracking (primero SS con la división más corta, luego aSb/aSc), así que el
+        árbol resultante es el mismo. Como 'a' abre y 'b'/'c' cierran, un lado izquierdo
+        de SS solo puede terminar donde el balance vuelve al inicial, y un segmento cuyo
+        balance baja del inicial no puede derivar S, así que se descarta en O(1). Todo
+        segmento que pasa ambos filtros es válido: solo se visitan segmentos del árbol
+        final y el tiempo y el tamaño de la tabla quedan casi lineales. `tabla` y
+        `constructor` permiten seguir con los de un análisis anterior.
+        """
+        if constructor is None:
+            constructor = self.crear_constructor()
+        nuevo = constructor.agregar
+        traza = self.traza
+        trazar = traza.activa
+        n = len(palabra)
+
+        # balance[k] = cantidad de 'a' menos cantidad de 'b'/'c' antes de la posición k
+        balance = [0]
+        for c in palabra:
+            balance.append(balance[-1] + (1 if c == 'a' else -1))
+
+        retornos: Dict[int, List[int]] = {}
+        for k, b in enumerate(balance):
+            retornos.setdefault(b, []).append(k)
+        caidas = calcular_caidas(balance)
+
+        if tabla is None:
+            tabla = {}
+        progreso: Dict[Tuple[int, int], int] = {}
+        pila: List[Tuple[int, int, int]] = [(0, n, 0)]
+        medir = self.perfil.activo
+        cuenta = self.perfil.contadores if medir else None
+        previos = len(constructor)
+        control = self.control
+        vigilar = control is not None
+        pasos = control.retomar() if vigilar else 0
+
+        while pila:
+            if vigilar:
+                pasos += 1
+                if not pasos & MASCARA_REVISION:
+                    control.revisar(pasos, len(constructor))
+            inicio, fin, nivel = pila[-1]
+            clave = (inicio, fin)
+            if clave in tabla:
+                if medir:
+                    cuenta["memo_aciertos"] += 1
+                pila.pop()
+                continue
+
+            if inicio == fin:
+                if trazar:
+                    traza.registrar(nivel, "✓ Caso E válido")
+                tabla[clave] = nuevo("EMPTY", "E")
+                pila.pop()
+                continue
+
+            if clave not in progreso:
+                if medir:
+                    cuenta["llamadas"] += 1
+                    if len(pila) > cuenta["profundidad_max"]:
+                        cuenta["profundidad_max"] = len(pila)
+                if trazar:
+                    traza.registrar(nivel, "Analizando: '%s'", palabra[inicio:fin])
+                if balance[fin] != balance[inicio] or caidas[inicio] <= fin:
+                    if trazar:
+                        traza.registrar(nivel, "❌ Segmento desbalanceado")
+                    tabla[clave] = None
+                    pila.pop()
+                    continue
+                if trazar:
+                    traza.registrar(nivel, "Probando caso SS")
+
+            # Caso SS: divisiones en orden creciente, reanudando donde se quedó
+            candidatos = retornos[balance[inicio]]
+            indice = progreso.get(clave)
+            if indice is None:
+                indice = bisect_right(candidatos, inicio)
+            pendiente = None
+            while indice < len(candidatos) and candidatos[indice] < fin:
+                medio = candidatos[indice]
+                arbol_izq = tabla.get((inicio, medio), _PENDIENTE)
+                if arbol_izq is _PENDIENTE:
+                    pendiente = (inicio, medio)
+                    break
+                if medir:
+                    cuenta["memo_aciertos"] += 1
+                if arbol_izq is not None:
+                    arbol_der = tabla.get((medio, fin), _PENDIENTE)
+                    if arbol_der is _PENDIENTE:
+                        pendiente = (medio, fin)
+                        break
+                    if medir:
+                        cuenta["memo_aciertos"] += 1
+                    if arbol_der is not None:
+                        if trazar:
+                            traza.registrar(nivel, "✓ Caso SS válido")
+                        if medir:
+                            cuenta["divisiones"] += 1
+                        tabla[clave] = nuevo("CONCAT", "SS", [arbol_izq, arbol_der])
+                        break
+                if medir:
+                    # División resuelta desde la tabla que no sirvió
+                    cuenta["divisiones"] += 1
+                    cuenta["retrocesos"] += 1
+                indice += 1
+
+            if pendiente is not None:
+                if medir:
+                    cuenta["memo_fallos"] += 1
+                progreso[clave] = indice
+                pila.append((pendiente[0], pendiente[1], nivel + 1))
+                continue
+            progreso[clave] = indice
+            if clave in tabla:
+                del progreso[clave]
+                pila.pop()
+                continue
+
+            # Casos aSb y aSc
+            final = palabra[fin - 1]
+            if fin - inicio >= 2 and palabra[inicio] == 'a' and final in ('b', 'c'):
+                arbol = tabla.get((inicio + 1, fin - 1), _PENDIENTE)
+                if arbol is _PENDIENTE:
+                    if trazar:
+                        traza.registrar(nivel, "Probando caso aS%s", final)
+                    if medir:
+                        cuenta["memo_fallos"] += 1
+                    pila.append((inicio + 1, fin - 1, nivel + 1))
+                    continue
+                if medir:
+                    cuenta["memo_aciertos"] += 1
+                if arbol is not None:
+                    if trazar:
+                        traza.registrar(nivel, "✓ Caso aS%s válido", final)
+                    tabla[clave] = nuevo("PROD", f"aS{final}", [arbol])
+                    del progreso[clave]
+                    pila.pop()
+                    continue
+
+            if trazar:
+                traza.registrar(nivel, "❌ No se encontró una producción válida")
+            tabla[clave] = None
+            del progreso[clave]
+            pila.pop()
+
+        if vigilar:
+            control.actualizar(pasos, len(constructor))
+        if medir:
+            cuenta["nodos"] += len(constructor) - previos
+        raiz = tabla[(0, n)]
+        return raiz is not None, constructor.vista(raiz) if raiz is not None else None
+
+
+# Gramática de stf.py sin recursión izquierda: S → T S', S' → + T S' | ε, etc.
+# Los símbolos que empiezan con '#' son acciones que arman el árbol; no consumen tokens.
+GRAMATICA_STF: Dict[str, List[Tuple[str, ...]]] = {
+    'S': [('T', "S'", '#S')],
+    "S'": [('+', 'T', '#S+T', "S'"), ()],
+    'T': [('F', "T'", '#T')],
+    "T'": [('*', 'F', '#T*F', "T'"), ()],
+    'F': [('(', 'S', ')', '#(S)'), ('a', '#a')],
+}
+
+# Terminales de la gramática de stf.py
+TOKENS_STF = frozenset('a+*()')
+
+# No terminales de GRAMATICA_STF que dejan un nodo en la pila de nodos (S' y T' no dejan ninguno)
+_STF_CON_NODO = frozenset('STF')
+# Operador que se da por insertado cuando falta entre dos operandos
+_STF_OPERADOR_FALTANTE = {"T'": '*', "S'": '+'}
+
+# Léxico básico: el primer carácter que no es token ni espacio
+_STF_INVALIDO = re.compile(r'[^a+*()\s]')
+# Desde este largo, las entradas ASCII se separan con NumPy (que se importa recién entonces)
+MIN_LEXICO_NUMPY = 1 << 14
+# Léxico extendido: una alternativa por clase de token; la última atrapa el primer carácter inválido
+_STF_LEXICO_EXTENDIDO = re.compile(r'(\s+)|([+*()])|([A-Za-z_][A-Za-z0-9_]*|[0-9]+(?:\.[0-9]+)?)|(.)', re.S)
+
+
+class TokensSTF(NamedTuple):
+    """Tokens de una expresión en arreglos compactos"""
+    tipos: str                        # un carácter por token: a + * ( ), con 'a' para todo operando
+    inicios: array                    # desplazamiento de cada token en la entrada ('I')
+    lexemas: Optional[List[Optional[str]]] = None  # con el léxico extendido: texto de cada operando
+    error: Optional[int] = None       # desplazamiento del primer carácter inválido (None si no hay)
+
+
+def _tokens_ascii(entrada: str) -> TokensSTF:
+    """Tokens de una entrada ASCII ya validada: los bytes mayores que el espacio son los tokens"""
+    import numpy as np
+
+    datos = np.frombuffer(entrada.encode('ascii'), dtype=np.uint8)
+    posiciones = np.flatnonzero(datos > 32)
+    inicios = array('I')
+    inicios.frombytes(posiciones.astype(np.uint32).tobytes())
+    tipos = entrada if len(posiciones) == len(entrada) else datos[posiciones].tobytes().decode('ascii')
+    return TokensSTF(tipos, inicios)
+
+
+def lexico_stf(entrada: str, extendido: bool = False) -> TokensSTF:
+    """Separa una expresión en tokens con su desplazamiento y se detiene en el primer carácter inválido.
+
+    El léxico básico (solo 'a' como operando) no recorre la entrada en Python:
+    una búsqueda con expresión regular da el primer carácter inválido, y los
+    tipos y desplazamientos salen de str.split y compress sobre un map o, en
+    entradas ASCII largas, de una máscara de NumPy. El extendido acepta además
+    identificadores ([A-Za-z_][A-Za-z0-9_]*) y números (123 o 1.5) como
+    operandos, con una sola expresión regular que reconoce cada clase de token.
+    """
+    if not extendido:
+        malo = _STF_INVALIDO.search(entrada)
+        if malo is not None:
+            return TokensSTF("", array('I'), None, malo.start())
+        if len(entrada) >= MIN_LEXICO_NUMPY and entrada.isascii():
+            try:
+                return _tokens_ascii(entrada)
+            except ImportError:
+                # Sin NumPy, el mismo resultado sale de compress
+                pass
+        tipos = "".join(entrada.split())
+        if len(tipos) == len(entrada):
+            return TokensSTF(tipos, array('I', range(len(entrada))))
+        return TokensSTF(tipos, array('I', compress(range(len(entrada)), map(TOKENS_STF.__contains__, entrada))))
+
+    tipos = []
+    inicios = array('I')
+    lexemas: List[Optional[str]] = []
+    for token in _STF_LEXICO_EXTENDIDO.finditer(entrada):
+        clase = token.lastindex
+        if clase == 1:
+            continue
+        if clase == 4:
+            return TokensSTF("", array('I'), None, token.start())
+        texto = token.group(clase)
+        tipos.append(texto if clase == 2 else 'a')
+        inicios.append(token.start())
+        lexemas.append(texto if clase == 3 else None)
+    return TokensSTF("".join(tipos), inicios, lexemas)
+
+
+# Caracteres leídos por cada lectura del flujo en el modo streaming
+TAM_BUFFER = 1 << 16
+
+
+class ResultadoFlujo(NamedTuple):
+    valida: bool
+    leidos: int                          # caracteres consumidos del flujo
+    posicion_error: Optional[int] = None
+    mensaje: Optional[str] = None
+
+
+def leer_bloques(flujo, tam_buffer: int = TAM_BUFFER) -> Iterator[Tuple[int, str]]:
+    """Produce (desplazamiento, bloque) leyendo el flujo de a tam_buffer caracteres.
+
+    `flujo` es cualquier objeto con read(n): archivo de texto o binario,
+    socket.makefile(), sys.stdin. Los bytes se decodifican como latin-1 para que
+    las posiciones coincidan con los desplazamientos en el archivo.
+    """
+    desplazamiento = 0
+    while True:
+        bloque = flujo.read(tam_buffer)
+        if not bloque:
+            return
+        if isinstance(bloque, (bytes, bytearray)):
+            bloque = bloque.decode('latin-1')
+        yield desplazamiento, bloque
+        desplazamiento += len(bloque)
+
+
+def tokenizar_flujo(flujo, tam_buffer: int = TAM_BUFFER) -> Iterator[Tuple[int, str]]:
+    """Produce (posición, token) de un flujo, saltando espacios, y al final (total, FIN).
+
+    Los caracteres fuera del alfabeto se entregan tal cual para que quien consuma
+    los tokens informe su posición. Nunca hay más de un bloque en memoria.
+    """
+    total = 0
+    for desplazamiento, bloque in leer_bloques(flujo, tam_buffer):
+        for i, caracter in enumerate(bloque):
+            if not caracter.isspace():
+                yield desplazamiento + i, caracter
+        total = desplazamiento + len(bloque)
+    yield total, FIN
+
+
+class ParserSTF(Analizador):
+    """Gramática S → S + T | T, T → T * F | F, F → (S) | a de stf.py"""
+    nombre = "stf"
+    ALFABETO = re.compile(r'^[a+*()\s]*$')
+    MODOS = ("ll1", "earley")
+    # Modos que admiten el léxico extendido
+    MODOS_EXTENDIDO = ("ll1",)
+    TABLA = construir_tabla_ll1(GRAMATICA_STF, 'S')
+    SIGUIENTES = calcular_siguientes(GRAMATICA_STF, 'S', *calcular_primeros(GRAMATICA_STF))
+    GRAMATICA = "S → S + T | T\nT → T * F | F\nF → (S) | a"
+    # S → T y T → F solo envuelven a su hijo cuando este tiene un único hijo, como los cierres '#S' y '#T'
+    ETIQUETAS = {"S → S+T": ("S", "S+T"), "S → T": ("S", "T", SI_UN_HIJO),
+                 "T → T*F": ("T", "T*F"), "T → F": ("T", "F", SI_UN_HIJO),
+                 "F → (S)": ("F", "(S)"), "F → a": ("F", "a")}
+
+    def __init__(self, traza: Optional[Traza] = None, modo: str = "ll1", compacto: bool = True,
+                 control: Optional[ControlAnalisis] = None, perfil: Optional[Perfil] = None,
+                 extendido: bool = False):
+        super().__init__(traza, compacto, control, perfil)
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo desconocido: {modo}")
+        # Con `extendido`, los identificadores y números también son operandos (ver lexico_stf)
+        if extendido and modo not in self.MODOS_EXTENDIDO:
+            raise ValueError("El léxico extendido solo está disponible en modo ll1")
+        self.modo = modo
+        self.extendido = extendido
+
+    def firma(self) -> str:
+        return super().firma() + "+extendido" if self.extendido else super().firma()
+
+    def es_valida(self, entrada: str) -> Tuple[bool, Optional[Nodo]]:
+        tokens = self.tokenizar(entrada)
+        if tokens.error is not None:
+            return False, None
+        if self.modo == "earley":
+            return self.analizador_gramatica().es_valida(tokens.tipos)
+        constructor = self.crear_constructor()
+
+        if self.traza.activa:
+            self.traza.registrar(0, "\nIniciando análisis sintáctico...")
+        resultado = self.analizar_tokens(tokens.tipos, constructor, lexemas=tokens.lexemas)
+        if resultado is None:
+            return False, None
+        return True, constructor.vista(resultado)
+
+    def es_valida_incremental(self, entrada: str, anterior: Optional[EstadoIncremental] = None
+                              ) -> Tuple[bool, Optional[Nodo], Optional[EstadoIncremental]]:
+        """En modo LL(1), el análisis sigue desde el último punto de reanudación dentro del prefijo común.
+
+        Un punto guarda la posición y las pilas de símbolos y de nodos justo después
+        de leer un token; lo que sigue solo depende de los tokens siguientes, y los
+        nodos de las pilas están en el almacén compartido por las versiones.
+        """
+        if self.extendido:
+            # Los tipos de token no alcanzan para comparar versiones: un operando puede cambiar de nombre
+            return super().es_valida_incremental(entrada, anterior)
+        tokens = self.tokenizar(entrada)
+        if tokens.error is not None:
+            return False, None, anterior
+        texto = tokens.tipos
+        if self.modo == "earley":
+            return self.analizador_gramatica().es_valida_incremental(texto, anterior)
+        clave = (self.nombre, self.modo)
+        desde = None
+        if self._retomar(anterior, clave, texto):
+            constructor = anterior.constructor
+            prefijo = tramo_comun(anterior.entrada, texto)[0]
+            puntos = list(anterior.datos)
+            while puntos and puntos[-1][0] > prefijo:
+                puntos.pop()
+            if puntos:
+                desde = puntos[-1]
+                if self.traza.activa:
+                    self.traza.registrar(0, "↺ Análisis retomado desde el token %d", desde[0])
+        else:
+            constructor, puntos = AlmacenArbol(), []
+        resultado = self.analizar_tokens(texto, constructor, puntos, desde)
+        estado = EstadoIncremental(texto, clave, constructor, puntos)
+        if resultado is None:
+            return False, None, estado
+        return True, constructor.vista(resultado), estado
+
+    def posicion_error(self, entrada: str) -> Optional[int]:
+        """Posición del primer error según el reconocedor de flujo (None si la expresión es válida)"""
+        if not self.extendido:
+            return self.validar_flujo(io.StringIO(entrada)).posicion_error
+        # Con operandos de varios caracteres, el reconocedor lee los tipos de token
+        tokens = self.tokenizar(entrada)
+        if tokens.error is not None:
+            return tokens.error
+        posicion = self.validar_flujo(io.StringIO(tokens.tipos)).posicion_error
+        if posicion is None:
+            return None
+        return tokens.inicios[posicion] if posicion < len(tokens.inicios) else len(entrada)
+
+    def analizar_tokens(self, tokens: Sequence[str], constructor, puntos: Optional[list] = None,
+                        desde: Optional[tuple] = None, lexemas: Optional[List[Optional[str]]] = None
+                        ) -> Optional[Nodo]:
+        """Análisis predictivo LL(1) guiado por TABLA, en tiempo lineal y sin retroceso.
+
+        Todo el estado (posición, pila de símbolos y pila de nodos) es local, así que
+        una misma instancia puede analizar varias entradas a la vez. Las acciones '#'
+        arman los mismos nodos que el descenso recursivo original: las cadenas de
+        '+' y '*' se asocian a la izquierda y S/T envuelven a su hijo solo cuando este
+        tiene un único hijo. Devuelve None al primer token que la tabla no admite.
+
+        Con `puntos`, agrega cada tanto un punto de reanudación (posición, pila,
+        nodos); `desde` es un punto de un análisis anterior con los mismos tokens
+        hasta su posición, desde el que se sigue en lugar de empezar de cero.
+        Con `lexemas` (léxico extendido), cada hoja F lleva el texto de su operando.
+        """
+        tabla = self.TABLA
+        agregar = constructor.agregar
+        num_hijos = constructor.num_hijos
+        traza = self.traza
+        trazar = traza.activa
+
+        control = self.control
+        vigilar = control is not None
+        pasos = control.retomar() if vigilar else 0
+
+        n = len(tokens)
+        if desde is None:
+            pos = 0
+            pila: List[str] = [FIN, 'S']
+            nodos: list = []
+        else:
+            pos, pila, nodos = desde[0], list(desde[1]), list(desde[2])
+        anotar = puntos is not None
+        proximo = pos + INTERVALO_PUNTOS
+        medir = self.perfil.activo
+        cuenta = self.perfil.contadores if medir else None
+        previos = len(constructor)
+        while True:
+            if vigilar:
+                pasos += 1
+                if not pasos & MASCARA_REVISION:
+                    control.revisar(pasos, len(constructor))
+            simbolo = pila.pop()
+            token = tokens[pos] if pos < n else FIN
+
+            if simbolo[0] == '#':
+                if simbolo == '#a':
+                    # La acción sigue a la lectura del operando: su token es el anterior
+                    nodos.append(agregar('F', 'a' if lexemas is None else lexemas[pos - 1]))
+                elif simbolo == '#(S)':
+                    nodos.append(agregar('F', '(S)', [nodos.pop()]))
+                elif simbolo == '#T*F' or simbolo == '#S+T':
+                    derecho = nodos.pop()
+                    nodos.append(agregar(simbolo[1], simbolo[1:], [nodos.pop(), derecho]))
+                else:
+                    # '#T' y '#S': cierre de T → F ('*' F)* o S → T ('+' T)*
+                    nodo = nodos.pop()
+                    tipo = simbolo[1]
+                    nodos.append(agregar(tipo, 'F' if tipo == 'T' else 'T', [nodo]) if num_hijos(nodo) == 1 else nodo)
+                continue
+
+            fila = tabla.get(simbolo)
+            if fila is None:
+                # Terminal (o fin de entrada): debe coincidir con el token actual
+                if simbolo != token:
+                    if trazar:
+                        traza.registrar(1, "Error en posición %d: se esperaba '%s' y se encontró '%s'",
+                                        pos, simbolo, token)
+                    if medir:
+                        cuenta["nodos"] += len(constructor) - previos
+                    return None
+                if simbolo == FIN:
+                    if vigilar:
+                        control.actualizar(pasos, len(constructor))
+                    if medir:
+                        cuenta["nodos"] += len(constructor) - previos
+                    return nodos.pop()
+                if trazar:
+                    traza.registrar(2, "Encontrado '%s'", token)
+                pos += 1
+                if anotar and pos >= proximo:
+                    # La copia de las pilas se amortiza: el próximo punto queda al menos tan lejos como su tamaño
+                    puntos.append((pos, tuple(pila), tuple(nodos)))
+                    proximo = pos + max(INTERVALO_PUNTOS, len(pila) + len(nodos))
+                continue
+
+            produccion = fila.get(token)
+            if produccion is None:
+                if trazar:
+                    traza.registrar(1, "Error en posición %d: token no esperado '%s' en %s (se esperaba: %s)",
+                                    pos, token, simbolo, " ".join(sorted(fila)))
+                if medir:
+                    cuenta["nodos"] += len(constructor) - previos
+                return None
+            if trazar:
+                traza.registrar(1, "Expandiendo %s → %s", simbolo,
+                                " ".join(s for s in produccion if s[0] != '#') or "ε")
+            pila.extend(reversed(produccion))
+            if medir:
+                cuenta["llamadas"] += 1
+                if len(pila) > cuenta["profundidad_max"]:
+                    cuenta["profundidad_max"] = len(pila)
+
+    def validar_flujo(self, flujo, tam_buffer: int = TAM_BUFFER) -> ResultadoFlujo:
+        """Reconoce una expresión leída de un flujo sin cargarla entera en memoria.
+
+        Con esta gramática la pila de TABLA siempre es ([T'] [S'] ')')* más el fondo,
+        así que basta con saber si se espera un operando y cuántos paréntesis hay
+        abiertos: el reconocedor es un autómata con un contador de profundidad que
+        avanza por los bloques de lectura sin armar tokens ni árbol. Se detiene en el
+        primer error, sin leer el resto del flujo.
+        """
+        profundidad = 0
+        operando = True   # se espera '(' o 'a'; si no, '+', '*', ')' o el fin
+        total = 0
+        control = self.control
+        # Cada carácter leído cuenta como un paso
+        previos = control.retomar() if control is not None else 0
+        for desplazamiento, bloque in leer_bloques(flujo, tam_buffer):
+            if control is not None:
+                control.revisar(previos + desplazamiento)
+            for i, caracter in enumerate(bloque):
+                if operando:
+                    if caracter == 'a':
+                        operando = False
+                    elif caracter == '(':
+                        profundidad += 1
+                    elif not caracter.isspace():
+                        return self._error_flujo(desplazamiento + i, caracter, operando, profundidad)
+                elif caracter == '+' or caracter == '*':
+                    operando = True
+                elif caracter == ')' and profundidad:
+                    profundidad -= 1
+                elif not caracter.isspace():
+                    return self._error_flujo(desplazamiento + i, caracter, operando, profundidad)
+            total = desplazamiento + len(bloque)
+
+        if operando or profundidad:
+            return self._error_flujo(total, FIN, operando, profundidad)
+        if self.traza.activa:
+            self.traza.registrar(0, "Flujo aceptado: %d caracteres", total)
+        return ResultadoFlujo(True, total)
+
+    def analizar_con_recuperacion(self, entrada: str) -> Optional[ResultadoRecuperacion]:
+        """Análisis LL(1) que sigue después de cada error y los informa todos en una pasada.
+
+        Recuperación en modo pánico con los conjuntos FOLLOW como sincronización,
+        más correcciones locales: si falta un operando, el no terminal se da por
+        visto con un nodo ERROR; si faltan un operador o un ')', se dan por
+        insertados; un token que no encaja en ninguna parte (o un ')' sin su '(')
+        se descarta, y los descartes seguidos cuentan como un solo error. Cada paso
+        consume un token, saca un símbolo de la pila o descarta un token, así que
+        el análisis es lineal. Sin errores, el árbol es el mismo que el de es_valida.
+        """
+        if self.extendido:
+            # La recuperación lee carácter por carácter: solo admite el léxico básico
+            return None
+        tabla = self.TABLA
+        siguientes = self.SIGUIENTES
+        constructor = self.crear_constructor()
+        agregar = constructor.agregar
+        num_hijos = constructor.num_hijos
+        traza = self.traza
+        trazar = traza.activa
+
+        control = self.control
+        vigilar = control is not None
+        pasos = control.retomar() if vigilar else 0
+
+        posiciones = [i for i, c in enumerate(entrada) if not c.isspace()]
+        n = len(posiciones)
+        errores: List[ErrorSintactico] = []
+        pos = 0
+        pila: List[str] = [FIN, 'S']
+        nodos: list = []
+        abiertos = 0        # ')' todavía en la pila
+        descartando = False  # el último error fue un descarte y no se consumió nada después
+
+        def esperados_en_pila() -> set:
+            for simbolo in reversed(pila):
+                if simbolo[0] != '#':
+                    return set(tabla[simbolo]) if simbolo in tabla else {simbolo}
+            return {FIN}
+
+        def informar(esperados, mensaje: str):
+            posicion = posiciones[pos] if pos < n else len(entrada)
+            error = ErrorSintactico(posicion, token, tuple(sorted(esperados)), mensaje)
+            errores.append(error)
+            if trazar:
+                traza.registrar(1, "Error en posición %d: %s (se esperaba: %s)",
+                                posicion, mensaje, " ".join(error.esperados))
+
+        while True:
+            if vigilar:
+                pasos += 1
+                if not pasos & MASCARA_REVISION:
+                    control.revisar(pasos, len(constructor))
+            token = entrada[posiciones[pos]] if pos < n else FIN
+            if token != FIN and (token not in TOKENS_STF or (token == ')' and not abiertos)):
+                # Carácter inválido o ')' sin pareja: se descarta antes de mirar la pila
+                if not descartando:
+                    informar(esperados_en_pila(), f"token no esperado '{token}'" if token in TOKENS_STF
+                             else f"carácter inválido {token!r}")
+                    descartando = True
+                pos += 1
+                continue
+
+            simbolo = pila.pop()
+            if simbolo[0] == '#':
+                if simbolo == '#a':
+                    nodos.append(agregar('F', 'a'))
+                elif simbolo == '#(S)':
+                    nodos.append(agregar('F', '(S)', [nodos.pop()]))
+                elif simbolo == '#T*F' or simbolo == '#S+T':
+                    derecho = nodos.pop()
+                    nodos.append(agregar(simbolo[1], simbolo[1:], [nodos.pop(), derecho]))
+                else:
+                    nodo = nodos.pop()
+                    tipo = simbolo[1]
+                    nodos.append(agregar(tipo, 'F' if tipo == 'T' else 'T', [nodo]) if num_hijos(nodo) == 1 else nodo)
+                continue
+
+            fila = tabla.get(simbolo)
+            if fila is None:
+                if simbolo == token:
+                    if simbolo == FIN:
+                        break
+                    if simbolo == ')':
+                        abiertos -= 1
+                    pos += 1
+                    descartando = False
+                    continue
+                if simbolo == FIN:
+                    # Sobra entrada después de una expresión completa
+                    if not descartando:
+                        informar({FIN}, f"token no esperado '{token}'")
+                        descartando = True
+                    pila.append(FIN)
+                    pos += 1
+                    continue
+                # Falta un terminal (en esta gramática, solo puede ser ')'): se da por insertado
+                informar({simbolo}, f"falta '{simbolo}'")
+                if simbolo == ')':
+                    abiertos -= 1
+                continue
+
+            produccion = fila.get(token)
+            if produccion is not None:
+                if trazar:
+                    traza.registrar(2, "Expandiendo %s → %s", simbolo,
+                                    " ".join(s for s in produccion if s[0] != '#') or "ε")
+                abiertos += produccion.count(')')
+                pila.extend(reversed(produccion))
+                continue
+
+            operador = _STF_OPERADOR_FALTANTE.get(simbolo)
+            if operador is not None and token in tabla['F']:
+                # Dos operandos seguidos: se da por insertado el operador entre ellos
+                informar(set(fila), "falta un operador")
+                pila.extend(reversed(fila[operador][1:]))
+            elif token in siguientes[simbolo]:
+                # Falta lo que deriva el no terminal: queda un nodo ERROR en su lugar
+                informar(set(fila), "falta un operando" if token != FIN else "fin de entrada inesperado")
+                if simbolo in _STF_CON_NODO:
+                    nodos.append(agregar(TIPO_ERROR, '?'))
+            else:
+                # El token no sirve aquí ni después: se descarta y se reintenta el mismo símbolo
+                if not descartando:
+                    informar(set(fila), f"token no esperado '{token}'")
+                    descartando = True
+                pila.append(simbolo)
+                pos += 1
+
+        if vigilar:
+            control.actualizar(pasos, len(constructor))
+        return ResultadoRecuperacion(not errores, constructor.vista(nodos.pop()), errores)
+
+    def _error_flujo(self, pos: int, token: str, operando: bool, profundidad: int) -> ResultadoFlujo:
+        if operando:
+            esperados = "( a"
+        else:
+            esperados = "+ * )" if profundidad else "+ * fin de entrada"
+        if token == FIN:
+            mensaje = "fin de entrada inesperado"
+        elif token in TOKENS_STF:
+            mensaje = f"token no esperado '{token}'"
+        else:
+            mensaje = f"carácter inválido {token!r}"
+        mensaje += f" (se esperaba: {esperados})"
+        if self.traza.activa:
+            self.traza.registrar(0, "Error en posición %d: %s", pos, mensaje)
+        return ResultadoFlujo(False, pos, pos, mensaje)
+
+    def tokenizar(self, entrada: str) -> TokensSTF:
+        """Tokens de la entrada en una pasada (ver lexico_stf); `error` marca el primer carácter inválido"""
+        traza = self.traza
+        if traza.activa:
+            traza.registrar(0, "Tokenizando entrada: %s", entrada)
+        with self.perfil.fase("tokenizar"):
+            tokens = lexico_stf(entrada, self.extendido)
+        if traza.activa:
+            if tokens.error is not None:
+                traza.registrar(0, "Error: carácter inválido %r en posición %d", entrada[tokens.error], tokens.error)
+                return tokens
+            for i, tipo in enumerate(tokens.tipos):
+                texto = tokens.lexemas[i] if tokens.lexemas is not None and tokens.lexemas[i] else tipo
+                traza.registrar(1, "Token encontrado: %s (posición %d)", texto, tokens.inicios[i])
+            traza.registrar(1, "Tokens resultantes: %s", " ".join(tokens.tipos))
+        return tokens
+
+
+# Analizadores disponibles por nombre de gramática
+ANALIZADORES: Dict[str, type] = {
+    ParserParentesis.nombre: ParserParentesis,
+    ParserABC.nombre: ParserABC,
+    ParserSTF.nombre: ParserSTF,
+}
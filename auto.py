@@ -1,15 +1,24 @@
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
-import sys
+import importlib.util
 import os
+import sys
+from types import ModuleType
+from typing import Dict, List
+
+# Carpeta de las herramientas (arbol.py, abc.py, stf.py)
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
 
 class MenuAutomatas:
     def __init__(self):
         # Configuración de la ventana principal
         self.ventana = tk.Tk()
         self.ventana.title("Opciones de Derivadas de Gramáticas")
-        self.ventana.geometry("400x300")
+        self.ventana.geometry("400x340")
+        
+        # Módulos ya cargados y ventanas abiertas por archivo
+        self.modulos: Dict[str, ModuleType] = {}
+        self.ventanas: Dict[str, List[tk.Toplevel]] = {}
         
         # Configurar estilo
         self.configurar_estilo()
@@ -54,6 +63,9 @@ class MenuAutomatas:
         for texto, archivo in botones:
             self.crear_boton(main_frame, texto, archivo)
 
+        self.lbl_ventanas = tk.Label(main_frame, text="", bg=self.style['bg_color'])
+        self.lbl_ventanas.pack(pady=5)
+
     def crear_boton(self, parent, texto, archivo):
         boton = tk.Button(
             parent,
@@ -74,22 +86,53 @@ class MenuAutomatas:
         boton.bind('<Enter>', lambda e: boton.configure(bg=self.style['button_active_bg']))
         boton.bind('<Leave>', lambda e: boton.configure(bg=self.style['button_bg']))
 
+    def cargar_modulo(self, archivo: str) -> ModuleType:
+        """Importa la herramienta una sola vez y la reutiliza en los siguientes clics.
+
+        Se carga por ruta con un nombre propio porque `import abc` devolvería el
+        módulo abc de la biblioteca estándar, que ya está cargado.
+        """
+        modulo = self.modulos.get(archivo)
+        if modulo is None:
+            ruta = os.path.join(DIRECTORIO, archivo)
+            if DIRECTORIO not in sys.path:
+                sys.path.insert(0, DIRECTORIO)
+            nombre = "herramienta_" + os.path.splitext(archivo)[0]
+            spec = importlib.util.spec_from_file_location(nombre, ruta)
+            modulo = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(modulo)
+            self.modulos[archivo] = modulo
+        return modulo
+
     def ejecutar_automata(self, archivo):
         try:
             # Verificar si el archivo existe
-            if not os.path.exists(archivo):
+            if not os.path.exists(os.path.join(DIRECTORIO, archivo)):
                 messagebox.showerror("Error", f"No se encontró el archivo {archivo}")
                 return
 
-            # Ejecutar el archivo Python en un nuevo proceso
-            if sys.platform.startswith('win'):
-                subprocess.Popen(['python', archivo], creationflags=subprocess.CREATE_NEW_CONSOLE)
-            else:
-                subprocess.Popen(['python3', archivo])
+            # Abrir la herramienta como ventana hija en este mismo proceso
+            modulo = self.cargar_modulo(archivo)
+            ventana = tk.Toplevel(self.ventana)
+            modulo.ParserGUI(ventana)
+            self.ventanas.setdefault(archivo, []).append(ventana)
+            ventana.bind("<Destroy>", lambda e: self.ventana_cerrada(archivo, e.widget))
+            self.actualizar_ventanas()
 
         except Exception as e:
             messagebox.showerror("Error", f"Error al ejecutar el autómata: {str(e)}")
 
+    def ventana_cerrada(self, archivo: str, widget):
+        # <Destroy> también llega por cada widget hijo; solo interesa la ventana
+        abiertas = self.ventanas.get(archivo, [])
+        if widget in abiertas:
+            abiertas.remove(widget)
+            self.actualizar_ventanas()
+
+    def actualizar_ventanas(self):
+        total = sum(len(abiertas) for abiertas in self.ventanas.values())
+        self.lbl_ventanas.configure(text=f"Ventanas abiertas: {total}" if total else "")
+
     def ejecutar(self):
         self.ventana.mainloop()
 
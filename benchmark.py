@@ -0,0 +1,233 @@
+"""Banco de pruebas de rendimiento de los tres analizadores.
+
+Genera entradas reproducibles (con semilla) para cada lenguaje y mide por
+separado el reconocimiento (solo el veredicto) y la construcción del árbol,
+en varios tamaños. Informa caracteres por segundo y memoria pico, y puede
+guardar los resultados en JSON para comparar corridas:
+
+    python3 benchmark.py
+    python3 benchmark.py --gramaticas arbol stf --tamanos 1000 100000 --json hoy.json
+    python3 benchmark.py --gramaticas abc --modo backtracking --tamanos 10 20 40
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from analizadores import ANALIZADORES, ParserSTF, reconocer_rapido
+
+TAMANOS = (1_000, 10_000, 100_000)
+
+
+# --- Generadores de entradas -------------------------------------------------
+
+def generar_balanceada(rng: random.Random, n: int, abre: str = '(', cierres: str = ')') -> str:
+    """Palabra de Dyck aleatoria de longitud n (par); cada cierre se elige de `cierres`"""
+    n -= n % 2
+    partes = []
+    abiertos = 0
+    restantes_abrir = n // 2
+    for _ in range(n):
+        # Se abre con probabilidad proporcional a lo que falta abrir, sin dejar cierres pendientes imposibles
+        if restantes_abrir and (abiertos == 0 or rng.random() < restantes_abrir / (restantes_abrir + abiertos)):
+            partes.append(abre)
+            abiertos += 1
+            restantes_abrir -= 1
+        else:
+            partes.append(rng.choice(cierres))
+            abiertos -= 1
+    return "".join(partes)
+
+
+def desbalancear(rng: random.Random, palabra: str, abre: str = '(', cierres: str = ')') -> str:
+    """Cambia un cierre al azar de una palabra balanceada por una apertura.
+
+    Quedan dos aperturas de más, así que la palabra nunca es válida, y la
+    longitud sigue siendo par (no la descarta el chequeo de paridad).
+    """
+    posiciones = [i for i, c in enumerate(palabra) if c in cierres]
+    if not posiciones:
+        return palabra + abre * 2
+    i = rng.choice(posiciones)
+    return palabra[:i] + abre + palabra[i + 1:]
+
+
+def romper_expresion(rng: random.Random, expresion: str) -> str:
+    """Repite un operador al azar ('a+a' -> 'a++a'); dos operadores seguidos nunca son válidos"""
+    posiciones = [i for i, c in enumerate(expresion) if c in '+*']
+    if not posiciones:
+        return expresion + '+'
+    i = rng.choice(posiciones)
+    return expresion[:i + 1] + expresion[i:]
+
+
+def generar_expresion(rng: random.Random, n: int, profundidad_max: int = 50) -> str:
+    """Expresión aritmética válida de stf.py de unos n caracteres, con anidamiento acotado"""
+    partes = []
+    abiertos = 0
+    largo = 0
+    while True:
+        # Operando: abrir paréntesis o 'a'
+        while abiertos < profundidad_max and largo < n and rng.random() < 0.3:
+            partes.append('(')
+            abiertos += 1
+            largo += 1
+        partes.append('a')
+        largo += 1
+        while abiertos and (largo >= n or rng.random() < 0.3):
+            partes.append(')')
+            abiertos -= 1
+            largo += 1
+        if largo >= n and not abiertos:
+            return "".join(partes)
+        partes.append(rng.choice('+*'))
+        largo += 1
+
+
+def generar_entradas(gramatica: str, rng: random.Random, n: int) -> Dict[str, str]:
+    """Casos con nombre para un tamaño: válidos, inválidos y de anidamiento extremo"""
+    if gramatica == "arbol":
+        balanceada = generar_balanceada(rng, n)
+        casos = {
+            "balanceada": balanceada,
+            "desbalanceada": desbalancear(rng, balanceada),
+            "anidada": "(" * (n // 2) + ")" * (n // 2),
+            "concatenada": "()" * (n // 2),
+        }
+        invalido = "desbalanceada"
+    elif gramatica == "abc":
+        balanceada = generar_balanceada(rng, n, 'a', 'bc')
+        casos = {
+            "anidada_mixta": balanceada,
+            "desbalanceada": desbalancear(rng, balanceada, 'a', 'bc'),
+            "anidada": "a" * (n // 2) + "".join(rng.choice("bc") for _ in range(n // 2)),
+            "concatenada": "".join(rng.choice(("ab", "ac")) for _ in range(n // 2)),
+        }
+        invalido = "desbalanceada"
+    else:
+        expresion = generar_expresion(rng, n)
+        casos = {
+            "expresion": expresion,
+            "profunda": generar_expresion(rng, n, profundidad_max=n),
+            "plana": generar_expresion(rng, n, profundidad_max=0),
+            "invalida": romper_expresion(rng, expresion),
+        }
+        invalido = "invalida"
+    # Con el reconocedor lineal: el caso inválido tiene que medir el camino del rechazo
+    assert not reconocedor(gramatica)(casos[invalido]), f"el caso {invalido} de {gramatica} (n={n}) es válido"
+    return casos
+
+
+# --- Fases medidas -------------------------------------------------------------
+
+def _reconocer_abc(palabra: str) -> bool:
+    # El lenguaje de abc.py es Dyck con 'a' como apertura y 'b'/'c' como cierre
+    return not palabra or reconocer_rapido(palabra.translate(str.maketrans("abc", "())")))
+
+
+def reconocedor(gramatica: str) -> Callable[[str], bool]:
+    """Veredicto en tiempo lineal, sin árbol"""
+    if gramatica == "arbol":
+        return reconocer_rapido
+    if gramatica == "abc":
+        return _reconocer_abc
+    stf = ParserSTF()
+
+    def reconocer(entrada: str) -> bool:
+        return stf.validar_flujo(io.StringIO(entrada)).valida
+    return reconocer
+
+
+def fases(gramatica: str, modo: Optional[str]) -> Dict[str, Callable[[str], bool]]:
+    """Funciones a medir por fase; cada una devuelve el veredicto"""
+    clase = ANALIZADORES[gramatica]
+    parser = clase(modo=modo) if modo else clase()
+
+    def construir(entrada: str) -> bool:
+        return parser.es_valida(entrada)[0]
+
+    return {"reconocer": reconocedor(gramatica), "arbol": construir}
+
+
+def medir(funcion: Callable[[str], bool], entrada: str, repeticiones: int) -> Tuple[bool, float, int]:
+    """Mejor tiempo de `repeticiones` corridas y memoria pico de una corrida aparte"""
+    mejor = float("inf")
+    veredicto = False
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        veredicto = funcion(entrada)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    # tracemalloc hace todo más lento, así que la memoria se mide en otra corrida
+    tracemalloc.start()
+    try:
+        funcion(entrada)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return veredicto, mejor, pico
+
+
+def ejecutar(gramaticas: List[str], tamanos: List[int], repeticiones: int = 3, semilla: int = 0,
+             modo: Optional[str] = None, salida=sys.stderr) -> List[dict]:
+    resultados = []
+    for gramatica in gramaticas:
+        funciones = fases(gramatica, modo)
+        for n in tamanos:
+            rng = random.Random(f"{semilla}-{gramatica}-{n}")
+            for caso, entrada in generar_entradas(gramatica, rng, n).items():
+                for fase, funcion in funciones.items():
+                    veredicto, segundos, pico = medir(funcion, entrada, repeticiones)
+                    fila = {
+                        "gramatica": gramatica,
+                        "modo": modo,
+                        "caso": caso,
+                        "fase": fase,
+                        "caracteres": len(entrada),
+                        "valida": veredicto,
+                        "segundos": segundos,
+                        "caracteres_por_segundo": len(entrada) / segundos if segundos else None,
+                        "memoria_pico": pico,
+                    }
+                    resultados.append(fila)
+                    if salida is not None:
+                        print(f"{gramatica:5} {caso:14} {fase:9} n={len(entrada):>9} "
+                              f"{'✓' if veredicto else '❌'} {segundos * 1000:10.2f} ms "
+                              f"{fila['caracteres_por_segundo'] or 0:14,.0f} car/s "
+                              f"{pico / 1024:10.1f} KiB", file=salida)
+    return resultados
+
+
+def main(argv=None) -> int:
+    argumentos = argparse.ArgumentParser(description="Mide el rendimiento de los analizadores")
+    argumentos.add_argument("--gramaticas", nargs="+", choices=sorted(ANALIZADORES), default=sorted(ANALIZADORES))
+    argumentos.add_argument("--tamanos", nargs="+", type=int, default=list(TAMANOS), help="Longitudes de entrada")
+    argumentos.add_argument("--repeticiones", type=int, default=3, help="Corridas por medición (se toma la mejor)")
+    argumentos.add_argument("--semilla", type=int, default=0)
+    argumentos.add_argument("--modo", help="Modo del analizador que construye el árbol")
+    argumentos.add_argument("--json", metavar="ARCHIVO", help="Guardar los resultados en JSON ('-' para la salida estándar)")
+    args = argumentos.parse_args(argv)
+    if args.modo is not None:
+        for gramatica in args.gramaticas:
+            if args.modo not in ANALIZADORES[gramatica].MODOS:
+                argumentos.error(f"modo inválido para {gramatica}: {args.modo}")
+
+    resultados = ejecutar(args.gramaticas, args.tamanos, args.repeticiones, args.semilla, args.modo)
+    if args.json:
+        informe = {"semilla": args.semilla, "repeticiones": args.repeticiones,
+                   "python": sys.version.split()[0], "resultados": resultados}
+        if args.json == "-":
+            json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+            sys.stdout.write("\n")
+        else:
+            with open(args.json, "w", encoding="utf-8") as archivo:
+                json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Bosque de derivaciones compartido (SPPF) para gramáticas ambiguas.
+
+Los analizadores devuelven solo el primer árbol que encuentran; en gramáticas
+como S → (S) | SS | () la cantidad de derivaciones crece como los números de
+Catalan, así que enumerarlas una por una es exponencial. El bosque se arma a
+partir de los conjuntos de ítems del reconocedor de Earley (ParserGramatica):
+
+- Un nodo de símbolo (A, i, j) tiene una alternativa por cada producción de A
+  que deriva el tramo [i, j).
+- Un nodo de ítem (estado, i, j) representa un prefijo de producción que deriva
+  [i, j); sus alternativas son los puntos de corte m con el prefijo más corto
+  sobre [i, m) y el último símbolo sobre [m, j).
+
+Los nodos se comparten entre todas las derivaciones, así que el tamaño y el
+tiempo son polinomiales (O(n³) en el peor caso). Se cuentan solo derivaciones
+sin ciclos: un nodo no puede ser su propio descendiente, lo que en S → SS con S
+anulable equivale a pedir que las dos partes no sean vacías, como hacen los
+analizadores de abc.py. Las cantidades son enteros de Python sin límite de
+tamaño; cada derivación tiene un número entre 0 y la cantidad total, y
+`arbol(k)` arma la k-ésima sin recorrer las anteriores, lo que da la iteración
+perezosa y el muestreo uniforme.
+
+Uso:
+    python3 bosque.py arbol "()()()()" --arboles 3
+    python3 bosque.py abc --muestras 5 --semilla 1 < palabras.txt
+    python3 bosque.py --texto "E → E + E | n" "n+n+n+n"
+"""
+import argparse
+import random
+import sys
+from bisect import bisect_right
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from analizadores import ANALIZADORES, ParserGramatica, arbol_a_json
+from gramatica import cargar_gramatica
+
+# Nodo del bosque: ('S', no terminal, i, j, cadena) o ('I', estado, i, j, cadena).
+# `cadena` son los no terminales de los ancestros que cubren el mismo tramo [i, j),
+# que no pueden volver a aparecer en él sin formar un ciclo.
+NodoBosque = Tuple[str, int, int, int, FrozenSet[int]]
+
+_VACIO: FrozenSet[int] = frozenset()
+
+
+class Bosque:
+    def __init__(self, parser: ParserGramatica, palabra: str, vistos: List[set],
+                 inicios: Dict[Tuple[int, int], set]):
+        self.parser = parser
+        self.gramatica = parser.gramatica
+        self.palabra = palabra
+        self.vistos = vistos
+        self.inicios = inicios
+        self._ordenados: Dict[Tuple[int, int], List[int]] = {}
+        self.raiz: NodoBosque = ('S', self.gramatica.inicial, 0, len(palabra), _VACIO)
+        # Derivaciones que representa cada nodo; las alternativas no se guardan, se
+        # vuelven a calcular solo para los nodos que recorre arbol(k)
+        self.cuentas: Dict[NodoBosque, int] = {}
+        self.num_alternativas = 0
+        self._alternativas: Dict[NodoBosque, Tuple[List[Tuple[NodoBosque, ...]], List[int]]] = {}
+        self._contar()
+
+    def __len__(self) -> int:
+        return len(self.cuentas)
+
+    def cantidad(self) -> int:
+        """Cantidad de derivaciones (sin ciclos) de la palabra"""
+        return self.cuentas[self.raiz]
+
+    def estadisticas(self) -> Dict[str, int]:
+        simbolos = sum(1 for nodo in self.cuentas if nodo[0] == 'S')
+        return {"nodos_simbolo": simbolos, "nodos_item": len(self.cuentas) - simbolos,
+                "alternativas": self.num_alternativas}
+
+    def _candidatos(self, simbolo: int, fin: int, desde: int) -> List[int]:
+        lista = self._ordenados.get((simbolo, fin))
+        if lista is None:
+            self._ordenados[(simbolo, fin)] = lista = sorted(self.inicios.get((simbolo, fin), ()))
+        return lista[bisect_right(lista, desde - 1):]
+
+    def _expandir(self, nodo: NodoBosque) -> List[Tuple[NodoBosque, ...]]:
+        """Alternativas empaquetadas de un nodo, en el orden de búsqueda de los analizadores"""
+        g = self.gramatica
+        clase, x, i, j, cadena = nodo
+        if clase == 'S':
+            cadena_hijos = cadena | {x}
+            return [(('I', g.inicio[p] + len(g.derechas[p]), i, j, cadena_hijos),) for p in g.por_lhs[x]]
+
+        t = g.punto[x]
+        if t == 0:
+            # Prefijo vacío: una sola derivación (el producto vacío) si el tramo es vacío
+            return [()] if i == j else []
+        simbolo = g.derechas[g.produccion[x]][t - 1]
+        previo = x - 1
+        vistos = self.vistos
+        resultado = []
+        if isinstance(simbolo, str):
+            m = j - 1
+            if m >= i and self.palabra[m] == simbolo and (previo, i) in vistos[m]:
+                resultado.append((('I', previo, i, m, _VACIO),))
+            return resultado
+        item = (previo, i)
+        vacio = _VACIO
+        agregar = resultado.append
+        for m in self._candidatos(simbolo, j, i):
+            if item not in vistos[m]:
+                continue
+            if m == i:
+                # El último símbolo cubre todo [i, j): no puede repetir un ancestro del mismo tramo
+                if simbolo in cadena:
+                    continue
+                agregar((('I', previo, i, m, cadena if m == j else vacio), ('S', simbolo, m, j, cadena)))
+            elif m == j:
+                agregar((('I', previo, i, m, cadena), ('S', simbolo, m, j, vacio)))
+            else:
+                agregar((('I', previo, i, m, vacio), ('S', simbolo, m, j, vacio)))
+        return resultado
+
+    def _contar(self):
+        """Cuenta las derivaciones de todos los nodos de símbolo, de abajo hacia arriba.
+
+        Se recorren por fin creciente y, con el mismo fin, por origen decreciente:
+        así los hijos de otro tramo ya están contados y _contar_nodo solo baja
+        por la cadena de prefijos de una producción y por los hijos del mismo
+        tramo, sin recursión profunda.
+        """
+        por_fin: Dict[int, List[Tuple[int, int]]] = {}
+        for (simbolo, fin), origenes in self.inicios.items():
+            por_fin.setdefault(fin, []).extend((origen, simbolo) for origen in origenes)
+        control = self.parser.control
+        pasos = control.retomar() if control is not None else 0
+        for fin in sorted(por_fin):
+            for origen, simbolo in sorted(por_fin[fin], reverse=True):
+                self._contar_nodo(('S', simbolo, origen, fin, _VACIO))
+                if control is not None:
+                    pasos += 1
+                    if not pasos & 1023:
+                        control.revisar(pasos)
+        self._contar_nodo(self.raiz)
+
+    def _contar_nodo(self, nodo: NodoBosque) -> int:
+        cuenta = self.cuentas.get(nodo)
+        if cuenta is not None:
+            return cuenta
+        alternativas = self._expandir(nodo)
+        self.num_alternativas += len(alternativas)
+        total = 0
+        for alt in alternativas:
+            producto = 1
+            for hijo in alt:
+                producto *= self._contar_nodo(hijo)
+                if not producto:
+                    break
+            total += producto
+        self.cuentas[nodo] = total
+        return total
+
+    def _elegir(self, nodo: NodoBosque, k: int) -> Tuple[Tuple[NodoBosque, ...], int]:
+        """Alternativa que contiene a la derivación k del nodo y el índice dentro de ella"""
+        guardado = self._alternativas.get(nodo)
+        if guardado is None:
+            alternativas = self._expandir(nodo)
+            acumulados = []
+            total = 0
+            for alt in alternativas:
+                producto = 1
+                for hijo in alt:
+                    producto *= self._contar_nodo(hijo)
+                total += producto
+                acumulados.append(total)
+            self._alternativas[nodo] = guardado = (alternativas, acumulados)
+        alternativas, acumulados = guardado
+        indice = bisect_right(acumulados, k)
+        return alternativas[indice], k - (acumulados[indice - 1] if indice else 0)
+
+    def arbol(self, k: int = 0, constructor=None):
+        """Arma la derivación número k (0 <= k < cantidad()) sin enumerar las anteriores.
+
+        Dentro de cada producción, el índice se descompone en base mixta con el
+        último símbolo variando más rápido; la derivación 0 es la misma que
+        devuelve ParserGramatica.
+        """
+        total = self.cantidad()
+        if not 0 <= k < total:
+            raise IndexError(f"Derivación {k} fuera de rango (hay {total})")
+        g = self.gramatica
+        constructor = constructor if constructor is not None else self.parser.crear_constructor()
+        plan: List[Tuple[int, bool, int]] = []
+        pila: List[Tuple[NodoBosque, int, bool]] = [(self.raiz, k, False)]
+        while pila:
+            nodo, k, en_cadena = pila.pop()
+            (item,), k = self._elegir(nodo, k)
+            p = g.produccion[item[1]]
+            # Los hijos salen de derecha a izquierda al recorrer la cadena de prefijos
+            hijos: List[Tuple[NodoBosque, int, bool]] = []
+            while g.punto[item[1]] > 0:
+                alt, k = self._elegir(item, k)
+                if len(alt) == 2:
+                    prefijo, simbolo = alt
+                    k, k_simbolo = divmod(k, self.cuentas[simbolo])
+                    primero = g.punto[item[1]] == 1
+                    hijos.append((simbolo, k_simbolo, primero and simbolo[1] == g.lhs[p]))
+                    item = prefijo
+                else:
+                    item = alt[0]
+            plan.append((p, en_cadena, len(hijos)))
+            # Invertidos de nuevo al apilar: el de más a la izquierda se visita primero
+            pila.extend(hijos)
+        return constructor.vista(self.parser.armar_nodos(plan, constructor))
+
+    def arboles(self, desde: int = 0) -> Iterator:
+        """Recorre las derivaciones en orden, armando cada una recién cuando se pide"""
+        k = desde
+        while k < self.cantidad():
+            yield self.arbol(k)
+            k += 1
+
+    def muestrear(self, rng: Optional[random.Random] = None):
+        """Una derivación elegida con probabilidad uniforme entre todas"""
+        rng = rng or random.Random()
+        return self.arbol(rng.randrange(self.cantidad()))
+
+
+def construir_bosque(parser: ParserGramatica, palabra: str) -> Optional[Bosque]:
+    """Bosque de derivaciones de la palabra, o None si no pertenece al lenguaje"""
+    if parser.control is not None:
+        parser.control.retomar()
+    reconocido = parser.reconocer(palabra)
+    if reconocido is None:
+        return None
+    return Bosque(parser, palabra, *reconocido)
+
+
+def crear_argumentos() -> argparse.ArgumentParser:
+    argumentos = argparse.ArgumentParser(description="Cuenta, lista y muestrea las derivaciones de cada palabra")
+    argumentos.add_argument("gramatica", nargs="?",
+                            help=f"Gramática de una de las herramientas ({', '.join(sorted(ANALIZADORES))}); se omite con --texto")
+    argumentos.add_argument("palabras", nargs="*", help="Palabras a analizar (por defecto, una por línea de la entrada estándar)")
+    argumentos.add_argument("--texto", help="Texto de otra gramática, por ejemplo \"E → E + E | n\"")
+    argumentos.add_argument("--arboles", type=int, default=0, metavar="N", help="Imprimir las primeras N derivaciones en JSON")
+    argumentos.add_argument("--muestras", type=int, default=0, metavar="K", help="Imprimir K derivaciones al azar (uniformes)")
+    argumentos.add_argument("--semilla", type=int, help="Semilla del muestreo")
+    argumentos.add_argument("--estadisticas", action="store_true", help="Imprimir el tamaño del bosque")
+    return argumentos
+
+
+def main(argv=None) -> int:
+    argumentos = crear_argumentos()
+    args = argumentos.parse_args(argv)
+    if args.texto is not None:
+        if args.gramatica is not None:
+            # Con --texto, el primer argumento posicional es una palabra
+            args.palabras.insert(0, args.gramatica)
+        gramatica = cargar_gramatica(args.texto)
+    elif args.gramatica in ANALIZADORES:
+        clase = ANALIZADORES[args.gramatica]
+        gramatica = cargar_gramatica(clase.GRAMATICA, clase.ETIQUETAS)
+    elif args.gramatica is not None:
+        argumentos.error(f"gramática desconocida: {args.gramatica} (opciones: {', '.join(sorted(ANALIZADORES))})")
+    else:
+        argumentos.error("indique una gramática o --texto")
+
+    parser = ParserGramatica(gramatica)
+    rng = random.Random(args.semilla)
+    palabras = args.palabras or (linea.rstrip("\r\n") for linea in sys.stdin)
+    for palabra in palabras:
+        # El lector de gramáticas ignora los espacios, así que ningún terminal es un espacio
+        palabra = "".join(palabra.split())
+        bosque = construir_bosque(parser, palabra)
+        if bosque is None:
+            print(f"RECHAZA\t{palabra}")
+            continue
+        print(f"ACEPTA\t{palabra}\t{bosque.cantidad()} derivaciones")
+        if args.estadisticas:
+            print("\t" + " ".join(f"{clave}={valor}" for clave, valor in bosque.estadisticas().items()))
+        for k, arbol in zip(range(args.arboles), bosque.arboles()):
+            print(f"\t#{k}\t{arbol_a_json(arbol)}")
+        for _ in range(args.muestras):
+            print(f"\t~\t{arbol_a_json(bosque.muestrear(rng))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
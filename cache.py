@@ -0,0 +1,176 @@
+"""Caché LRU de resultados de análisis por (analizador, entrada).
+
+Las GUIs y los procesos por lotes reciben las mismas cadenas una y otra vez.
+`CacheResultados` guarda, por un resumen BLAKE2 de la firma del analizador
+(gramática, modo y opciones; ver Analizador.firma) y la entrada,
+el veredicto, el árbol (copiado a un AlmacenArbol compacto) y datos derivados
+opcionales, como la preparación del dibujo o el JSON del árbol. Desaloja las
+entradas menos usadas cuando se supera la cantidad máxima o la memoria
+estimada, cuenta aciertos y fallos y puede guardarse con pickle para la
+siguiente sesión.
+"""
+import atexit
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from almacen import AlmacenArbol, compactar
+
+# Límites por defecto
+MAX_ENTRADAS = 10_000
+MAX_BYTES = 64 * 1024 * 1024
+
+# Bytes estimados por nodo de un árbol ya dibujado (objetos de Python en la preparación del dibujo)
+BYTES_POR_NODO_DIBUJO = 200
+
+# La versión 1 usaba solo el nombre de la gramática como firma
+VERSION_ARCHIVO = 2
+
+
+def clave_cache(firma: str, entrada: str) -> bytes:
+    return hashlib.blake2b(f"{firma}\0{entrada}".encode("utf-8"), digest_size=16).digest()
+
+
+class EntradaCache:
+    __slots__ = ('valida', 'arbol', 'extras', 'tamano')
+
+    def __init__(self, valida: bool, arbol, extras: Optional[Dict[str, Any]] = None):
+        self.valida = valida
+        self.arbol = arbol
+        self.extras: Dict[str, Any] = extras or {}
+        self.tamano = 0
+
+    def estimar_tamano(self) -> int:
+        tamano = 64
+        if self.arbol is not None:
+            almacen: AlmacenArbol = self.arbol.almacen
+            tamano += almacen.memoria() + 64 * len(almacen.etiquetas)
+            if 'disposicion' in self.extras:
+                tamano += BYTES_POR_NODO_DIBUJO * len(almacen)
+        for valor in self.extras.values():
+            if isinstance(valor, (str, bytes)):
+                tamano += len(valor)
+            elif isinstance(valor, list):
+                tamano += 200 * len(valor)
+            elif hasattr(valor, 'almacen'):
+                # Otro árbol compactado, como el parcial de una palabra rechazada
+                tamano += valor.almacen.memoria() + 64 * len(valor.almacen.etiquetas)
+                if self.arbol is None and 'disposicion' in self.extras:
+                    tamano += BYTES_POR_NODO_DIBUJO * len(valor.almacen)
+        return tamano
+
+
+class CacheResultados:
+    def __init__(self, max_entradas: int = MAX_ENTRADAS, max_bytes: int = MAX_BYTES,
+                 ruta: Optional[str] = None):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ruta = ruta
+        self.entradas: "OrderedDict[bytes, EntradaCache]" = OrderedDict()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        if ruta is not None and os.path.exists(ruta):
+            self.cargar(ruta)
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def obtener(self, firma: str, entrada: str) -> Optional[EntradaCache]:
+        clave = clave_cache(firma, entrada)
+        resultado = self.entradas.get(clave)
+        if resultado is None:
+            self.fallos += 1
+            return None
+        self.entradas.move_to_end(clave)
+        self.aciertos += 1
+        return resultado
+
+    def guardar(self, firma: str, entrada: str, valida: bool, arbol,
+                **extras) -> EntradaCache:
+        """Guarda el resultado; el árbol se copia a un almacén compacto si hace falta"""
+        if self.max_entradas <= 0:
+            return EntradaCache(valida, compactar(arbol) if arbol is not None else None, extras)
+        clave = clave_cache(firma, entrada)
+        anterior = self.entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= anterior.tamano
+        resultado = EntradaCache(valida, compactar(arbol) if arbol is not None else None, extras)
+        self._agregar(clave, resultado)
+        return resultado
+
+    def anotar(self, firma: str, entrada: str, nombre: str, valor: Any):
+        """Agrega un dato derivado (por ejemplo, la disposición del dibujo) a una entrada existente"""
+        clave = clave_cache(firma, entrada)
+        resultado = self.entradas.get(clave)
+        if resultado is None:
+            return
+        self.bytes -= resultado.tamano
+        del self.entradas[clave]
+        resultado.extras[nombre] = valor
+        self._agregar(clave, resultado)
+
+    def _agregar(self, clave: bytes, resultado: EntradaCache):
+        resultado.tamano = resultado.estimar_tamano()
+        self.entradas[clave] = resultado
+        self.bytes += resultado.tamano
+        # La entrada recién agregada nunca se desaloja, aunque sola supere max_bytes
+        while len(self.entradas) > 1 and (len(self.entradas) > self.max_entradas or self.bytes > self.max_bytes):
+            _, desalojada = self.entradas.popitem(last=False)
+            self.bytes -= desalojada.tamano
+            self.desalojos += 1
+
+    def limpiar(self):
+        self.entradas.clear()
+        self.bytes = 0
+
+    def estadisticas(self) -> Dict[str, int]:
+        return {"entradas": len(self.entradas), "bytes": self.bytes, "aciertos": self.aciertos,
+                "fallos": self.fallos, "desalojos": self.desalojos}
+
+    def guardar_en_disco(self, ruta: Optional[str] = None):
+        """Escribe el caché con pickle (reemplazo atómico del archivo)"""
+        ruta = ruta or self.ruta
+        if ruta is None:
+            return
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                pickle.dump((VERSION_ARCHIVO, list(self.entradas.items())), archivo,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+
+    def cargar(self, ruta: str):
+        """Carga un caché guardado; un archivo de otra versión se ignora"""
+        with open(ruta, "rb") as archivo:
+            version, entradas = pickle.load(archivo)
+        if version != VERSION_ARCHIVO:
+            return
+        for clave, resultado in entradas:
+            anterior = self.entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes -= anterior.tamano
+            self._agregar(clave, resultado)
+
+
+# Caché compartido por todas las ventanas abiertas en el mismo proceso
+_compartido: Optional[CacheResultados] = None
+
+
+def cache_compartido() -> CacheResultados:
+    """Caché de las GUIs; si ANALIZADORES_CACHE apunta a un archivo, se carga y se guarda al salir"""
+    global _compartido
+    if _compartido is None:
+        ruta = os.environ.get("ANALIZADORES_CACHE") or None
+        _compartido = CacheResultados(ruta=ruta)
+        if ruta is not None:
+            atexit.register(_compartido.guardar_en_disco)
+    return _compartido
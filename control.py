@@ -0,0 +1,172 @@
+"""Cancelación, progreso y presupuesto de un análisis en curso.
+
+Un `ControlAnalisis` se comparte entre quien lanza el análisis (la GUI, desde
+el hilo de Tk, o el proceso por lotes) y el analizador que corre en otro hilo.
+El analizador cuenta sus pasos y, cada MASCARA_REVISION + 1 pasos, llama a
+`revisar()`, que publica el progreso y lanza AnalisisInterrumpido si se pidió
+cancelar, o PresupuestoAgotado si se pasó de alguno de sus límites: pasos,
+tiempo, nodos creados o crecimiento de la memoria del proceso. Sin control, el
+costo en el ciclo del analizador es una comparación de un booleano local.
+
+El presupuesto es por entrada: quien lanza el análisis llama a `iniciar()` al
+empezar cada entrada (el constructor ya lo hace para la primera), y cada fase
+del analizador (reconocer, ubicar el error, recuperar errores...) llama a
+`retomar()`, que sigue la cuenta de pasos, nodos y tiempo de las fases
+anteriores en lugar de empezar de cero.
+
+Un `Presupuesto` agrupa los límites para crear un control por análisis (por
+ejemplo, en cada proceso de paralelo.py).
+"""
+import os
+import sys
+import threading
+import time
+from typing import NamedTuple, Optional
+
+# Los analizadores revisan el control cada 1024 pasos
+MASCARA_REVISION = 1023
+# La memoria se mide cada 16 revisiones: leerla cuesta bastante más que un paso
+MASCARA_MEMORIA = 15
+
+try:
+    _TAM_PAGINA = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _TAM_PAGINA = 4096
+
+
+def memoria_proceso() -> Optional[int]:
+    """Memoria residente del proceso en bytes, o el pico si el sistema solo informa ese (None si no hay)"""
+    try:
+        with open("/proc/self/statm", "rb") as archivo:
+            return int(archivo.read().split()[1]) * _TAM_PAGINA
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en bytes en macOS y en kilobytes en los demás
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+class AnalisisInterrumpido(Exception):
+    """El análisis se detuvo antes de terminar (cancelado o sin presupuesto)"""
+
+    def __init__(self, motivo: str, pasos: int, nodos: int, segundos: float = 0.0, memoria: int = 0):
+        super().__init__(self.describir(motivo, pasos, nodos, segundos, memoria))
+        self.motivo = motivo
+        self.pasos = pasos
+        self.nodos = nodos
+        self.segundos = segundos
+        self.memoria = memoria
+
+    @staticmethod
+    def describir(motivo: str, pasos: int, nodos: int, segundos: float, memoria: int) -> str:
+        return f"Análisis interrumpido ({motivo}) tras {pasos} pasos y {nodos} nodos"
+
+
+class PresupuestoAgotado(AnalisisInterrumpido):
+    """Se pasó un límite del presupuesto: el veredicto no es aceptar ni rechazar, sino "agotado" """
+
+    @staticmethod
+    def describir(motivo: str, pasos: int, nodos: int, segundos: float, memoria: int) -> str:
+        return (f"Presupuesto agotado ({motivo}) tras {pasos} pasos, {nodos} nodos, "
+                f"{segundos:.3f} s y {memoria / 2**20:.1f} MB de memoria nueva")
+
+
+class ControlAnalisis:
+    """`max_memoria` limita el crecimiento (en bytes) de la memoria del proceso desde `iniciar()`"""
+
+    def __init__(self, max_pasos: Optional[int] = None, tiempo_max: Optional[float] = None,
+                 max_nodos: Optional[int] = None, max_memoria: Optional[int] = None):
+        self.max_pasos = max_pasos
+        self.tiempo_max = tiempo_max
+        self.max_nodos = max_nodos
+        self.max_memoria = max_memoria
+        self._cancelado = threading.Event()
+        self.pasos = 0
+        self.nodos = 0
+        self.memoria = 0
+        self.inicio = 0.0
+        self.limite: Optional[float] = None
+        self._memoria_base: Optional[int] = None
+        self._revisiones = 0
+        # Nodos de las fases anteriores de la misma entrada
+        self._nodos_previos = 0
+        self.iniciar()
+
+    def iniciar(self):
+        """Reinicia el progreso y el reloj (se llama al empezar cada entrada)"""
+        self.pasos = 0
+        self.nodos = 0
+        self._nodos_previos = 0
+        self.memoria = 0
+        self.inicio = time.monotonic()
+        self.limite = self.inicio + self.tiempo_max if self.tiempo_max is not None else None
+        self._memoria_base = memoria_proceso() if self.max_memoria is not None else None
+        self._revisiones = 0
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado.is_set()
+
+    @property
+    def segundos(self) -> float:
+        """Tiempo desde el último `iniciar()`"""
+        return time.monotonic() - self.inicio
+
+    def retomar(self) -> int:
+        """Empieza una fase del análisis de la entrada en curso; devuelve los pasos ya usados.
+
+        La fase cuenta sus pasos desde ahí y publica los nodos de su propio
+        constructor, que se suman a los de las fases anteriores.
+        """
+        self._nodos_previos = self.nodos
+        return self.pasos
+
+    def actualizar(self, pasos: int, nodos: int = 0):
+        """Publica el progreso sin verificar el presupuesto"""
+        self.pasos = pasos
+        self.nodos = self._nodos_previos + nodos
+
+    def revisar(self, pasos: int, nodos: int = 0):
+        """Publica el progreso y detiene el análisis si corresponde"""
+        self.pasos = pasos
+        self.nodos = nodos = self._nodos_previos + nodos
+        if self._cancelado.is_set():
+            raise AnalisisInterrumpido("cancelado", pasos, nodos, self.segundos, self.memoria)
+        if self.max_pasos is not None and pasos > self.max_pasos:
+            self._agotado("límite de pasos")
+        if self.limite is not None and time.monotonic() > self.limite:
+            self._agotado("límite de tiempo")
+        if self.max_nodos is not None and nodos > self.max_nodos:
+            self._agotado("límite de nodos")
+        if self._memoria_base is not None:
+            self._revisiones += 1
+            if not self._revisiones & MASCARA_MEMORIA:
+                actual = memoria_proceso()
+                if actual is not None:
+                    self.memoria = max(self.memoria, actual - self._memoria_base)
+                    if self.memoria > self.max_memoria:
+                        self._agotado("límite de memoria")
+
+    def _agotado(self, motivo: str):
+        raise PresupuestoAgotado(motivo, self.pasos, self.nodos, self.segundos, self.memoria)
+
+
+class Presupuesto(NamedTuple):
+    """Límites de cada análisis (None = sin límite); ver ControlAnalisis"""
+    max_pasos: Optional[int] = None
+    tiempo_max: Optional[float] = None
+    max_nodos: Optional[int] = None
+    max_memoria: Optional[int] = None
+
+    def limitado(self) -> bool:
+        return any(limite is not None for limite in self)
+
+    def crear_control(self) -> ControlAnalisis:
+        return ControlAnalisis(*self)
@@ -0,0 +1,260 @@
+"""Corpus mapeados en memoria y resultados binarios de ancho fijo para validar.py.
+
+En las corridas grandes, leer el archivo línea por línea como `str` y escribir
+una línea de texto por resultado cuesta más que analizar registros cortos. Aquí:
+
+- `abrir_corpus` mapea el archivo con mmap y `lineas` ubica las líneas con
+  NumPy (o, si no está instalado, con bytes.split), por bloques, y decodifica
+  cada bloque de una vez desde una memoryview del mapa, que es la única copia
+  (el analizador necesita un str). `textos`
+  decodifica registros sueltos, por ejemplo los que deja pasar la criba.
+- `EscritorResultados` escribe un registro de ancho fijo por entrada
+  (desplazamiento, longitud, posición del error, nodos del árbol y veredicto)
+  detrás de una cabecera con la gramática, y opcionalmente un archivo auxiliar
+  con una línea "desplazamiento<TAB>árbol JSON" por entrada aceptada.
+- Con `reanudar`, el escritor recorta un registro a medio escribir y las líneas
+  del auxiliar posteriores al último registro completo; `siguiente_registro` da
+  el desplazamiento desde el que sigue la corrida. `leer_resultados` devuelve el
+  archivo como un arreglo estructurado de NumPy (es lo único que lo exige).
+"""
+import mmap
+import os
+import struct
+import sys
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bytes de entrada por bloque al buscar los saltos de línea
+TAM_BLOQUE = 1 << 20
+
+SALTO = ord('\n')
+RETORNO = ord('\r')
+
+# Cabecera: firma, versión, tamaño de registro y nombre de la gramática
+MAGIA = b"VRES"
+VERSION_RESULTADOS = 1
+CABECERA = struct.Struct("<4sHH24s")
+# Registro: desplazamiento, longitud, posición del error (-1 si no hay), nodos, veredicto y relleno
+REGISTRO = struct.Struct("<QIiIB3x")
+DTYPE_REGISTRO = np.dtype([("desplazamiento", "<u8"), ("longitud", "<u4"), ("error", "<i4"),
+                           ("nodos", "<u4"), ("veredicto", "u1"), ("relleno", "V3")]) if np is not None else None
+
+# Valores del campo veredicto (AGOTADO: el análisis se pasó de su presupuesto)
+RECHAZA, ACEPTA, ERROR, AGOTADO = 0, 1, 2, 3
+
+
+@contextmanager
+def abrir_corpus(ruta: str):
+    """Toda la entrada como buffer: el archivo mapeado en memoria o la entrada estándar leída entera"""
+    if ruta == "-":
+        yield sys.stdin.buffer.read()
+        return
+    with open(ruta, "rb") as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            # mmap no admite archivos vacíos
+            yield b""
+            return
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            yield mapa
+
+
+def lineas(datos, desde: int = 0, tam_bloque: int = TAM_BLOQUE,
+           decodificar: bool = True) -> Iterator[Tuple[List[int], List[int], Optional[List[str]]]]:
+    """Por cada bloque de líneas desde `desde`: desplazamientos, longitudes y textos.
+
+    Los saltos se ubican con NumPy; el texto de todo el bloque se decodifica de una
+    vez desde una memoryview y se corta con str.split, sin objetos intermedios por
+    línea. Las longitudes y los textos no incluyen el salto ni un '\\r' final.
+    """
+    if np is None:
+        yield from _lineas_sin_numpy(datos, desde, tam_bloque, decodificar)
+        return
+    arreglo = np.frombuffer(datos, dtype=np.uint8)
+    vista = memoryview(datos)
+    n = len(arreglo)
+    inicio = desde
+    try:
+        while inicio < n:
+            fin = min(inicio + tam_bloque, n)
+            saltos = np.flatnonzero(arreglo[inicio:fin] == SALTO) + inicio
+            if not len(saltos):
+                if fin < n:
+                    # Una línea más larga que el bloque: se busca su fin sin pasar por NumPy
+                    siguiente = datos.find(b"\n", fin)
+                    saltos = np.array([siguiente if siguiente >= 0 else n])
+                else:
+                    saltos = np.array([n])
+            elif fin == n and saltos[-1] != n - 1:
+                # La última línea no termina en salto
+                saltos = np.append(saltos, n)
+            inicios = np.concatenate(([inicio], saltos[:-1] + 1))
+            finales = saltos.copy()
+            con_retorno = (finales > inicios) & (arreglo[np.maximum(finales - 1, 0)] == RETORNO)
+            finales[con_retorno] -= 1
+
+            textos_bloque = None
+            if decodificar:
+                textos_bloque = str(vista[inicio:int(saltos[-1])], "utf-8", "replace").split("\n")
+                if con_retorno.any():
+                    textos_bloque = [t[:-1] if t.endswith("\r") else t for t in textos_bloque]
+            yield inicios.tolist(), (finales - inicios).tolist(), textos_bloque
+            inicio = int(saltos[-1]) + 1
+    finally:
+        del arreglo
+        vista.release()
+
+
+def _lineas_sin_numpy(datos, desde: int, tam_bloque: int,
+                      decodificar: bool) -> Iterator[Tuple[List[int], List[int], Optional[List[str]]]]:
+    """Como `lineas`, con el bloque cortado en el último salto y partido con bytes.split"""
+    vista = memoryview(datos)
+    n = len(datos)
+    inicio = desde
+    try:
+        while inicio < n:
+            fin = min(inicio + tam_bloque, n)
+            corte = datos.rfind(b"\n", inicio, fin)
+            if corte < 0:
+                corte = datos.find(b"\n", fin) if fin < n else -1
+                if corte < 0:
+                    corte = n
+            elif fin == n and corte != n - 1:
+                # La última línea no termina en salto
+                corte = n
+            inicios, longitudes = [], []
+            posicion = inicio
+            con_retorno = False
+            for linea in bytes(vista[inicio:corte]).split(b"\n"):
+                largo = len(linea)
+                inicios.append(posicion)
+                if linea.endswith(b"\r"):
+                    con_retorno = True
+                    largo -= 1
+                longitudes.append(largo)
+                posicion += len(linea) + 1
+
+            textos_bloque = None
+            if decodificar:
+                textos_bloque = str(vista[inicio:corte], "utf-8", "replace").split("\n")
+                if con_retorno:
+                    textos_bloque = [t[:-1] if t.endswith("\r") else t for t in textos_bloque]
+            yield inicios, longitudes, textos_bloque
+            inicio = corte + 1
+    finally:
+        vista.release()
+
+
+def textos(datos, posiciones: Iterable[Tuple[int, int]]) -> Iterator[str]:
+    """Decodifica cada registro desde una memoryview del buffer (sin una copia intermedia en bytes)"""
+    vista = memoryview(datos)
+    try:
+        for desplazamiento, longitud in posiciones:
+            yield str(vista[desplazamiento:desplazamiento + longitud], "utf-8", "replace")
+    finally:
+        vista.release()
+
+
+def siguiente_registro(datos, desplazamiento: int, longitud: int) -> int:
+    """Desplazamiento del registro que sigue al dado (el largo del buffer si era el último)"""
+    salto = datos.find(b"\n", desplazamiento + longitud)
+    return len(datos) if salto < 0 else salto + 1
+
+
+class EscritorResultados:
+    """Escribe los resultados como registros de ancho fijo y, si se pide, los árboles en un auxiliar"""
+
+    def __init__(self, ruta: str, gramatica: str, ruta_arboles: Optional[str] = None, reanudar: bool = False):
+        self.ruta = ruta
+        self.gramatica = gramatica
+        # (desplazamiento, longitud) del último registro completo al reanudar
+        self.ultimo: Optional[Tuple[int, int]] = None
+        self.escritos = 0
+        # Registros desde el último punto de control; se escriben recién después de vaciar el auxiliar
+        self.pendientes = bytearray()
+        if reanudar and os.path.exists(ruta) and os.path.getsize(ruta) >= CABECERA.size:
+            self.archivo: BinaryIO = open(ruta, "r+b")
+            self._retomar()
+        else:
+            self.archivo = open(ruta, "wb")
+            nombre = gramatica.encode("ascii")
+            self.archivo.write(CABECERA.pack(MAGIA, VERSION_RESULTADOS, REGISTRO.size, nombre))
+        self.arboles: Optional[BinaryIO] = None
+        if ruta_arboles is not None:
+            if reanudar and os.path.exists(ruta_arboles):
+                self.arboles = open(ruta_arboles, "r+b")
+                self._recortar_arboles()
+            else:
+                self.arboles = open(ruta_arboles, "wb")
+
+    def _retomar(self):
+        """Valida la cabecera, descarta un registro incompleto y recuerda el último completo"""
+        magia, version, tamano, nombre = CABECERA.unpack(self.archivo.read(CABECERA.size))
+        if magia != MAGIA or version != VERSION_RESULTADOS or tamano != REGISTRO.size:
+            raise ValueError(f"{self.ruta} no es un archivo de resultados compatible")
+        guardada = nombre.rstrip(b"\0").decode("ascii")
+        if guardada != self.gramatica:
+            raise ValueError(f"{self.ruta} tiene resultados de otra gramática: {guardada}")
+        self.escritos = (os.path.getsize(self.ruta) - CABECERA.size) // REGISTRO.size
+        fin = CABECERA.size + self.escritos * REGISTRO.size
+        self.archivo.truncate(fin)
+        if self.escritos:
+            self.archivo.seek(fin - REGISTRO.size)
+            desplazamiento, longitud, *_ = REGISTRO.unpack(self.archivo.read(REGISTRO.size))
+            self.ultimo = (desplazamiento, longitud)
+        self.archivo.seek(fin)
+
+    def _recortar_arboles(self):
+        """Quita las líneas del auxiliar que no tienen su registro completo (o que quedaron a medias)"""
+        limite = self.ultimo[0] if self.ultimo is not None else -1
+        posicion = 0
+        for linea in self.arboles:
+            if not linea.endswith(b"\n") or int(linea.split(b"\t", 1)[0]) > limite:
+                break
+            posicion += len(linea)
+        self.arboles.seek(posicion)
+        self.arboles.truncate(posicion)
+
+    def escribir(self, desplazamiento: int, longitud: int, valida: bool, nodos: int = 0,
+                 posicion_error: Optional[int] = None, error: bool = False, arbol_json: Optional[str] = None,
+                 agotado: bool = False):
+        if self.arboles is not None and arbol_json is not None and valida:
+            self.arboles.write(b"%d\t%s\n" % (desplazamiento, arbol_json.encode("utf-8")))
+        veredicto = ERROR if error else AGOTADO if agotado else ACEPTA if valida else RECHAZA
+        self.pendientes += REGISTRO.pack(desplazamiento, longitud, -1 if posicion_error is None else posicion_error,
+                                         nodos, veredicto)
+        self.escritos += 1
+
+    def punto_de_control(self):
+        """Vacía el auxiliar y luego escribe los registros pendientes.
+
+        Así el archivo de resultados nunca va por delante de los árboles: al
+        reanudar, lo que sobra del auxiliar se recorta y no falta ningún árbol.
+        """
+        if self.arboles is not None:
+            self.arboles.flush()
+        self.archivo.write(self.pendientes)
+        self.archivo.flush()
+        self.pendientes.clear()
+
+    def cerrar(self):
+        self.punto_de_control()
+        if self.arboles is not None:
+            self.arboles.close()
+        self.archivo.close()
+
+
+def leer_resultados(ruta: str) -> Tuple[str, "np.ndarray"]:
+    """Devuelve la gramática y los registros completos del archivo como arreglo estructurado"""
+    if np is None:
+        raise ImportError("leer_resultados necesita NumPy")
+    with open(ruta, "rb") as archivo:
+        magia, version, tamano, nombre = CABECERA.unpack(archivo.read(CABECERA.size))
+        if magia != MAGIA or version != VERSION_RESULTADOS or tamano != REGISTRO.size:
+            raise ValueError(f"{ruta} no es un archivo de resultados compatible")
+        cantidad = (os.path.getsize(ruta) - CABECERA.size) // REGISTRO.size
+        return nombre.rstrip(b"\0").decode("ascii"), np.fromfile(archivo, dtype=DTYPE_REGISTRO, count=cantidad)
@@ -0,0 +1,237 @@
+"""Criba masiva del lenguaje de paréntesis balanceados de arbol.py con NumPy.
+
+Para este lenguaje, pertenecer se reduce a una suma de prefijos: con '(' = +1 y
+')' = -1, la profundidad nunca baja de cero y termina en cero (además de la regla
+de siempre: la palabra vacía y las de longitud impar se rechazan). `cribar_bytes`
+aplica esa cuenta a muchos registros a la vez sobre un buffer separado por saltos
+de línea (bytes, bytearray o un archivo mapeado con mmap) y devuelve, por
+registro, el veredicto, la profundidad máxima y la posición del primer error.
+Así se descartan los rechazos antes de que el constructor de árboles vea nada.
+
+El buffer se procesa por bloques de tamaño fijo, y un registro que cruza el borde
+de un bloque sigue en el siguiente con su profundidad, su máximo y su primer error
+hasta el momento; así la memoria auxiliar queda acotada (unos 5 bytes por byte
+del bloque) aunque el archivo tenga gigabytes o sea una sola línea enorme.
+
+    python3 criba.py corpus.txt
+    python3 criba.py corpus.txt --detalle
+"""
+import argparse
+import mmap
+import sys
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Bytes de entrada por bloque: con bloques que caben en la caché, la suma acumulada va más rápido
+TAM_BLOQUE = 256 * 1024
+
+SALTO = ord('\n')
+RETORNO = ord('\r')
+CIERRA = ord(')')
+
+
+class ResultadoCriba(NamedTuple):
+    """Un arreglo por campo, con un elemento por registro"""
+    inicio: np.ndarray       # posición del registro en el buffer (int64)
+    longitud: np.ndarray     # bytes del registro, sin el salto de línea ni un '\r' final (int64)
+    valida: np.ndarray       # veredicto (bool)
+    profundidad: np.ndarray  # profundidad máxima del registro, sin contar bytes fuera del alfabeto (int64)
+    error: np.ndarray        # posición del primer error dentro del registro; -1 si se acepta (int64)
+
+    def cantidad(self) -> int:
+        return len(self.inicio)
+
+    def aceptados(self) -> np.ndarray:
+        """Índices de los registros aceptados"""
+        return np.flatnonzero(self.valida)
+
+
+def _vacio() -> ResultadoCriba:
+    return ResultadoCriba(np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, bool),
+                          np.empty(0, np.int64), np.empty(0, np.int64))
+
+
+def _segmentos(inicios: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Posiciones de todos los bytes de los registros dados, concatenadas"""
+    desplazamientos = np.cumsum(longitudes) - longitudes
+    return np.arange(int(longitudes.sum())) + np.repeat(inicios - desplazamientos, longitudes)
+
+
+def _primeros(posiciones: np.ndarray, inicios: np.ndarray, finales: np.ndarray) -> np.ndarray:
+    """Primera de las posiciones (ordenadas) que cae en cada registro, relativa a su inicio; -1 si no hay"""
+    resultado = np.full(len(inicios), -1, dtype=np.int64)
+    if len(posiciones):
+        k = np.searchsorted(posiciones, inicios)
+        primera = posiciones[np.minimum(k, len(posiciones) - 1)]
+        dentro = (k < len(posiciones)) & (primera < finales)
+        resultado[dentro] = primera[dentro] - inicios[dentro]
+    return resultado
+
+
+class Arrastre(NamedTuple):
+    """Registro que sigue abierto al final de un bloque y continúa en el siguiente"""
+    inicio: int        # posición del registro en el buffer
+    longitud: int      # bytes ya vistos
+    profundidad: int   # profundidad al final de lo visto
+    maximo: int
+    error: int         # -1 si todavía no hay error
+
+
+def _cribar_bloque(bloque: np.ndarray, desplazamiento: int, arrastre: Optional[Arrastre],
+                   ultimo: bool) -> Tuple[Tuple[np.ndarray, ...], Optional[Arrastre]]:
+    """Criba los registros de un bloque.
+
+    El primer registro puede continuar `arrastre`, y si el bloque no termina en un
+    salto de línea (ni es el `ultimo`), su último registro queda abierto y se
+    devuelve como el nuevo arrastre en lugar de entre los completos.
+    """
+    m = len(bloque)
+    saltos = np.flatnonzero(bloque == SALTO)
+    inicios = np.concatenate(([0], saltos + 1))
+    finales = np.append(saltos, m)
+    if inicios[-1] == m:
+        # El bloque termina en un salto de línea: no hay registro después
+        inicios, finales = inicios[:-1], finales[:-1]
+        abierto = False
+    else:
+        abierto = not ultimo
+    # Un '\r' justo antes del salto de línea (o del final de los datos) no forma parte del registro
+    cerrados = len(inicios) - abierto
+    con_retorno = np.flatnonzero(finales[:cerrados] > inicios[:cerrados])
+    con_retorno = con_retorno[bloque[finales[con_retorno] - 1] == RETORNO]
+    finales[con_retorno] -= 1
+    retornos = finales[con_retorno]
+    longitudes = (finales - inicios).astype(np.int64)
+
+    invalido = (bloque | 1) != CIERRA
+    invalido[saltos] = False
+    invalido[retornos] = False
+    malos = np.flatnonzero(invalido)
+
+    # 81 - 2b vale +1 para '(' y -1 para ')' (en uint8, que se lee como int8); el
+    # salto de línea, el '\r' final y los bytes fuera del alfabeto no cuentan
+    profundidad = np.empty(m + 1, dtype=np.int32)
+    profundidad[0] = arrastre.profundidad if arrastre is not None else 0
+    profundidad[1:] = (81 - 2 * bloque).view(np.int8)
+    profundidad[saltos + 1] = 0
+    profundidad[retornos + 1] = 0
+    profundidad[malos + 1] = 0
+    # profundidad[k] es la suma hasta el byte k; la de cada registro es relativa a su base
+    np.cumsum(profundidad, out=profundidad)
+    base = profundidad[inicios]
+    if arrastre is not None:
+        base[0] = 0
+    sumas = profundidad[finales] - base
+    maximos = (np.maximum.reduceat(profundidad, inicios) - base).astype(np.int64)
+    minimos = np.minimum.reduceat(profundidad, inicios) - base
+
+    errores = _primeros(malos, inicios, finales)
+
+    # Primera profundidad negativa, buscada solo en los registros que bajan de cero
+    negativos = np.flatnonzero(minimos < 0)
+    if len(negativos):
+        posiciones = _segmentos(inicios[negativos], longitudes[negativos])
+        bajo_cero = profundidad[posiciones + 1] < np.repeat(base[negativos], longitudes[negativos])
+        negativo = _primeros(posiciones[bajo_cero], inicios[negativos], finales[negativos])
+        actual = errores[negativos]
+        errores[negativos] = np.where((actual < 0) | ((negativo >= 0) & (negativo < actual)), negativo, actual)
+
+    inicios = inicios.astype(np.int64) + desplazamiento
+    if arrastre is not None:
+        # El primer registro empezó en un bloque anterior
+        inicios[0] = arrastre.inicio
+        maximos[0] = max(maximos[0], arrastre.maximo)
+        if arrastre.error >= 0:
+            errores[0] = arrastre.error
+        elif errores[0] >= 0:
+            errores[0] += arrastre.longitud
+        longitudes[0] += arrastre.longitud
+
+    nuevo = None
+    if abierto:
+        nuevo = Arrastre(int(inicios[-1]), int(longitudes[-1]), int(sumas[-1]), int(maximos[-1]), int(errores[-1]))
+        inicios, longitudes, sumas, maximos, errores = (inicios[:-1], longitudes[:-1], sumas[:-1],
+                                                        maximos[:-1], errores[:-1])
+    # Sin error local pero vacío, impar o con paréntesis sin cerrar: el error está al final
+    incompleto = (errores < 0) & ((sumas != 0) | (longitudes == 0) | (longitudes % 2 != 0))
+    errores[incompleto] = longitudes[incompleto]
+    return (inicios, longitudes, errores < 0, maximos, errores), nuevo
+
+
+def cribar_bytes(datos, tam_bloque: int = TAM_BLOQUE) -> ResultadoCriba:
+    """Criba un buffer con un registro por línea (bytes, bytearray, memoryview, mmap o arreglo uint8)"""
+    arreglo = datos if isinstance(datos, np.ndarray) else np.frombuffer(datos, dtype=np.uint8)
+    n = len(arreglo)
+    partes: List[Tuple[np.ndarray, ...]] = []
+    arrastre = None
+    inicio = 0
+    while inicio < n:
+        fin = min(inicio + tam_bloque, n)
+        if fin < n and arreglo[fin - 1] == RETORNO and arreglo[fin] == SALTO:
+            # Un "\r\n" no se corta entre dos bloques
+            fin = fin - 1 if fin - 1 > inicio else fin + 1
+        completos, arrastre = _cribar_bloque(arreglo[inicio:fin], inicio, arrastre, fin == n)
+        partes.append(completos)
+        inicio = fin
+    if not partes:
+        return _vacio()
+    return ResultadoCriba(*(np.concatenate(campo) for campo in zip(*partes)))
+
+
+def cribar_palabras(palabras: Iterable[str]) -> ResultadoCriba:
+    """Criba muchas palabras a la vez (ninguna debe contener saltos de línea).
+
+    Cualquier carácter distinto de '(' y ')' es un error, y los anteriores son de
+    un byte, así que las posiciones de error valen también en caracteres.
+    """
+    palabras = list(palabras)
+    if not palabras:
+        return _vacio()
+    return cribar_bytes(("\n".join(palabras) + "\n").encode("utf-8", "replace"))
+
+
+def cribar_archivo(ruta: str, tam_bloque: int = TAM_BLOQUE) -> ResultadoCriba:
+    """Criba un archivo con un registro por línea mapeándolo en memoria"""
+    with open(ruta, "rb") as archivo:
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no admite archivos vacíos
+            return _vacio()
+        with mapa:
+            datos = np.frombuffer(mapa, dtype=np.uint8)
+            try:
+                return cribar_bytes(datos, tam_bloque)
+            finally:
+                # El mapa no se puede cerrar mientras haya un arreglo que lo exporte
+                del datos
+
+
+def main(argv=None) -> int:
+    argumentos = argparse.ArgumentParser(description="Criba masiva de paréntesis balanceados (una cadena por línea)")
+    argumentos.add_argument("archivo", help="Archivo de entrada")
+    argumentos.add_argument("--detalle", action="store_true",
+                            help="Escribir una línea por registro: veredicto, profundidad máxima y posición del error")
+    args = argumentos.parse_args(argv)
+
+    inicio = time.perf_counter()
+    resultado = cribar_archivo(args.archivo)
+    segundos = time.perf_counter() - inicio
+    if args.detalle:
+        for valida, profundidad, error in zip(resultado.valida.tolist(), resultado.profundidad.tolist(),
+                                              resultado.error.tolist()):
+            if valida:
+                print(f"ACEPTA\tprofundidad {profundidad}")
+            else:
+                print(f"RECHAZA\tprofundidad {profundidad}\tposición {error}")
+    total = int(resultado.longitud.sum()) + resultado.cantidad()
+    aceptados = int(resultado.valida.sum())
+    print(f"registros={resultado.cantidad()} aceptados={aceptados} rechazados={resultado.cantidad() - aceptados} "
+          f"tiempo={segundos:.3f}s velocidad={total / max(segundos, 1e-9) / 1e6:.0f} MB/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
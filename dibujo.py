@@ -0,0 +1,277 @@
+"""Dibujo de árboles de análisis grandes en un eje de matplotlib.
+
+nx.draw crea varios artistas por nodo (un círculo, un texto y una línea por
+arista), así que un árbol de 10k nodos congela el mainloop de Tk. Aquí el
+dibujo usa nivel de detalle:
+
+- Todas las aristas van en una sola LineCollection y los nodos en un solo
+  scatter, sin importar cuántos sean.
+- Al abrir un árbol solo se expanden los primeros MAX_VISIBLES nodos en orden
+  por niveles; cada subárbol que queda fuera se dibuja como un triángulo con la
+  cantidad de nodos que resume.
+- Un clic sobre un triángulo expande ese subárbol (otros PASO_EXPANSION nodos)
+  y un clic sobre un nodo expandido lo vuelve a colapsar. La rueda del mouse
+  hace zoom, y las etiquetas solo se dibujan cuando hay pocos nodos a la vista.
+- Los artistas se crean una vez por árbol y cada cambio solo actualiza sus
+  datos. `actualizar` cambia a otra versión del árbol (por ejemplo, la del
+  análisis en vivo) sin mover la vista y conservando lo expandido en los
+  subárboles que siguen siendo los mismos nodos.
+- Con un `perfil` activo, cada dibujo mide las fases grafo (recorrido del
+  árbol), disposicion y dibujo; el lienzo se dibuja en el momento en lugar de
+  esperar al ciclo de Tk, para que su tiempo quede en la fase.
+"""
+from collections import deque
+from typing import Callable, List, Optional, Set, Tuple
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from analizadores import TIPO_ERROR
+from disposicion import aplanar, disponer_arbol
+from perfil import PERFIL_NULO, Perfil
+
+# Nodos expandidos al abrir un árbol
+MAX_VISIBLES = 300
+# Nodos que agrega cada clic sobre un subárbol colapsado
+PASO_EXPANSION = 100
+# Máximo de etiquetas de texto dibujadas a la vez
+MAX_ETIQUETAS = 150
+# Con hasta esta cantidad de nodos se usa el tamaño de nodo completo
+NODOS_TAMANO_COMPLETO = 30
+# Factor de zoom de cada paso de la rueda del mouse
+FACTOR_ZOOM = 1.25
+
+
+def _etiqueta_valor(nodo) -> str:
+    return nodo.valor
+
+
+def crear_dibujo(master, figsize=(8, 6), **opciones) -> 'DibujoArbol':
+    """Crea la figura, su lienzo de Tk dentro de `master` y el DibujoArbol asociado.
+
+    Se usa Figure en lugar de pyplot para que la figura no quede registrada en
+    el estado global de pyplot: varias ventanas en el mismo proceso no se
+    pisan y la figura se libera al cerrar su ventana. El lienzo queda sin
+    ubicar; quien llama lo ubica con `dibujo.canvas.get_tk_widget()`.
+    """
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=figsize)
+    ax = figura.add_subplot()
+    ax.set_axis_off()
+    canvas = FigureCanvasTkAgg(figura, master=master)
+    return DibujoArbol(ax, canvas, **opciones)
+
+
+class DibujoArbol:
+    """Dibuja un árbol con subárboles colapsables sobre `ax` y responde a clics y zoom"""
+
+    def __init__(self, ax, canvas, etiqueta: Callable[[object], str] = _etiqueta_valor,
+                 tam_nodo: float = 2000, tam_fuente: float = 12):
+        self.ax = ax
+        self.canvas = canvas
+        self.etiqueta = etiqueta
+        self.tam_nodo = tam_nodo
+        self.tam_fuente = tam_fuente
+
+        self.nodos: list = []
+        self.hijos: List[List[int]] = []
+        self.tamanos: List[int] = []
+        # (nodos, hijos, tamanos) del árbol actual; se puede guardar y pasar a dibujar() otra vez
+        self.preparado: Optional[Tuple[list, List[List[int]], List[int]]] = None
+        self.expandidos: Set[int] = set()
+        # Por nodo, si su subárbol tiene algún nodo ERROR (solo en árboles parciales)
+        self.errores: Optional[np.ndarray] = None
+        self._indices = np.empty(0, dtype=np.int64)
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self._puntos = None
+        self._aristas = None
+        self._triangulos = None
+        self._textos = []
+        # Fases del próximo dibujo; quien dibuja lo cambia por el perfil de su análisis
+        self.perfil: Perfil = PERFIL_NULO
+
+        canvas.mpl_connect('pick_event', self._al_elegir)
+        canvas.mpl_connect('scroll_event', self._al_girar)
+
+    def limpiar(self):
+        self.nodos = []
+        self.hijos = []
+        self.tamanos = []
+        self.errores = None
+        self.expandidos = set()
+        self.preparado = None
+        self._puntos = None
+        self._aristas = None
+        self._triangulos = None
+        self._textos = []
+        self.ax.clear()
+        self.ax.set_axis_off()
+        self.canvas.draw_idle()
+
+    def dibujar(self, raiz, preparado: Optional[Tuple[list, List[List[int]], List[int]]] = None,
+                con_errores: bool = False):
+        """Dibuja un árbol nuevo con sus primeros niveles expandidos.
+
+        `preparado` es el `self.preparado` de un dibujo anterior del mismo árbol
+        (por ejemplo, guardado en el caché) y evita recorrerlo de nuevo. Con
+        `con_errores`, los nodos ERROR de un árbol parcial y los subárboles
+        colapsados que los contienen se pintan de rojo.
+        """
+        with self.perfil.fase("grafo"):
+            self._cargar(raiz, preparado, con_errores)
+        self.expandidos = set()
+        self.expandir(0, MAX_VISIBLES)
+        self._redibujar(ajustar=True)
+
+    def actualizar(self, raiz, con_errores: bool = False):
+        """Cambia a otra versión del árbol sin mover la vista.
+
+        Quedan expandidos los nodos que ya lo estaban y siguen en el árbol (los
+        subárboles que un análisis incremental reutilizó son los mismos nodos);
+        lo nuevo se expande con el presupuesto de un clic.
+        """
+        if self.preparado is None:
+            self.dibujar(raiz, con_errores=con_errores)
+            return
+        with self.perfil.fase("grafo"):
+            anteriores = {self.nodos[v] for v in self.expandidos}
+            self._cargar(raiz, None, con_errores)
+            self.expandidos = {v for v, nodo in enumerate(self.nodos) if self.hijos[v] and nodo in anteriores}
+        self.expandir(0, PASO_EXPANSION if self.expandidos else MAX_VISIBLES)
+        self._redibujar()
+
+    def _cargar(self, raiz, preparado, con_errores: bool):
+        """Recorre el árbol (salvo que venga preparado) y marca los subárboles con errores"""
+        if preparado is None:
+            nodos, padres, hijos = aplanar(raiz)
+            # Tamaño de cada subárbol: el preorden invertido visita los hijos antes que el padre
+            tamanos = [1] * len(nodos)
+            for v in range(len(nodos) - 1, 0, -1):
+                tamanos[padres[v]] += tamanos[v]
+            preparado = (nodos, hijos, tamanos)
+        self.preparado = preparado
+        self.nodos, self.hijos, self.tamanos = preparado
+        self.errores = None
+        if con_errores:
+            # Subárboles con algún nodo ERROR; el preorden invertido visita los hijos antes que el padre
+            errores = [nodo.tipo == TIPO_ERROR for nodo in self.nodos]
+            for v in range(len(errores) - 1, -1, -1):
+                if not errores[v]:
+                    errores[v] = any(errores[h] for h in self.hijos[v])
+            self.errores = np.array(errores)
+
+    def expandir(self, inicio: int, presupuesto: int):
+        """Expande en orden por niveles desde `inicio` mientras queden nodos en el presupuesto"""
+        cola = deque([inicio])
+        while cola and presupuesto > 0:
+            v = cola.popleft()
+            hijos = self.hijos[v]
+            if not hijos:
+                continue
+            if v not in self.expandidos:
+                if len(hijos) > presupuesto and v != inicio:
+                    continue
+                self.expandidos.add(v)
+                presupuesto -= len(hijos)
+            cola.extend(hijos)
+
+    def colapsar(self, inicio: int):
+        """Colapsa `inicio` y todo lo que estaba expandido debajo"""
+        pila = [inicio]
+        while pila:
+            v = pila.pop()
+            if v in self.expandidos:
+                self.expandidos.discard(v)
+                pila.extend(self.hijos[v])
+
+    def _hijos_visibles(self, v: int) -> List[int]:
+        return self.hijos[v] if v in self.expandidos else []
+
+    def _redibujar(self, ajustar: bool = False):
+        ax = self.ax
+        perfil = self.perfil
+        limites = None if ajustar else (ax.get_xlim(), ax.get_ylim())
+        with perfil.fase("disposicion"):
+            disposicion = disponer_arbol(0, hijos_de=self._hijos_visibles)
+            indices = np.array(disposicion.nodos, dtype=np.int64)
+            colapsado = np.array([bool(self.hijos[v]) and v not in self.expandidos for v in disposicion.nodos])
+        self._indices, self._x, self._y = indices, disposicion.x, disposicion.y
+
+        with perfil.fase("dibujo"):
+            if self._puntos is None:
+                # Primer dibujo desde limpiar(): un artista para las aristas, uno para los
+                # nodos y uno para los triángulos de los colapsados; después solo cambian sus datos
+                ax.clear()
+                ax.set_axis_off()
+                self._aristas = ax.add_collection(LineCollection([], colors='gray', zorder=1))
+                self._puntos = ax.scatter([], [], zorder=2, picker=True)
+                self._triangulos = ax.scatter([], [], marker='^', zorder=3)
+            n = len(indices)
+            tam = self.tam_nodo if n <= NODOS_TAMANO_COMPLETO else max(20.0, self.tam_nodo * NODOS_TAMANO_COMPLETO / n)
+            self._aristas.set_segments(disposicion.aristas() if n > 1 else [])
+            self._aristas.set_linewidth(2 if n <= NODOS_TAMANO_COMPLETO else 1)
+            colores = np.where(colapsado, 'orange', 'lightblue')
+            if self.errores is not None:
+                colores = np.where(self.errores[indices], 'salmon', colores)
+            marcadores = np.where(colapsado)[0]
+            self._puntos.set_offsets(np.column_stack([self._x, self._y]))
+            self._puntos.set_sizes([tam])
+            self._puntos.set_facecolor(colores)
+            self._triangulos.set_offsets(np.column_stack([self._x[marcadores], self._y[marcadores]]))
+            self._triangulos.set_sizes([tam])
+            self._triangulos.set_facecolor(colores[marcadores])
+
+            if limites is None:
+                margen_x = max(0.5, 0.05 * (self._x.max() - self._x.min()))
+                ax.set_xlim(self._x.min() - margen_x, self._x.max() + margen_x)
+                ax.set_ylim(self._y.min() - 0.5, self._y.max() + 0.5)
+            else:
+                ax.set_xlim(*limites[0])
+                ax.set_ylim(*limites[1])
+            self._rotular(dibujar_ya=perfil.activo)
+
+    def _rotular(self, dibujar_ya: bool = False):
+        """Etiqueta solo los nodos a la vista, si son pocos"""
+        for texto in self._textos:
+            texto.remove()
+        self._textos = []
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        a_la_vista = np.nonzero((self._x >= x0) & (self._x <= x1) &
+                                (self._y >= min(y0, y1)) & (self._y <= max(y0, y1)))[0]
+        if len(a_la_vista) <= MAX_ETIQUETAS:
+            for i in a_la_vista.tolist():
+                v = int(self._indices[i])
+                texto = self.etiqueta(self.nodos[v])
+                if self.hijos[v] and v not in self.expandidos:
+                    texto += f"\n+{self.tamanos[v] - 1}"
+                self._textos.append(self.ax.text(self._x[i], self._y[i], texto, ha='center', va='center',
+                                                 fontsize=self.tam_fuente, zorder=4))
+        if dibujar_ya:
+            self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
+
+    def _al_elegir(self, evento):
+        if evento.artist is not self._puntos or not len(evento.ind):
+            return
+        v = int(self._indices[evento.ind[0]])
+        if v in self.expandidos:
+            self.colapsar(v)
+        elif self.hijos[v]:
+            self.expandir(v, PASO_EXPANSION)
+        else:
+            return
+        self._redibujar()
+
+    def _al_girar(self, evento):
+        if evento.inaxes is not self.ax or self._puntos is None:
+            return
+        factor = 1 / FACTOR_ZOOM if evento.button == 'up' else FACTOR_ZOOM
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        cx, cy = evento.xdata, evento.ydata
+        self.ax.set_xlim(cx - (cx - x0) * factor, cx + (x1 - cx) * factor)
+        self.ax.set_ylim(cy - (cy - y0) * factor, cy + (y1 - cy) * factor)
+        self._rotular()
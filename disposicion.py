@@ -0,0 +1,195 @@
+"""Disposición jerárquica de árboles de análisis para dibujarlos.
+
+Reemplaza a nx.spring_layout: en lugar de simular fuerzas (O(n²) por iteración y
+un resultado distinto en cada corrida), se usa el algoritmo de Walker en la
+versión lineal de Buchheim, Jünger y Leipert. Los nodos de un mismo nivel
+quedan a la misma altura, cada padre queda centrado sobre sus hijos y los
+subárboles se acercan tanto como lo permiten sus contornos. El resultado es
+determinista y el cálculo es O(n), sin recursión y sin construir un nx.Graph.
+
+Funciona con Nodo y con VistaNodo (cualquier objeto con `hijos` e `id`), o con
+cualquier otra representación si se pasa `hijos_de`.
+"""
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Separación horizontal mínima entre nodos vecinos de un mismo nivel
+SEPARACION = 1.0
+
+
+class Disposicion(NamedTuple):
+    nodos: list                 # nodos en preorden
+    padres: np.ndarray          # índice del padre de cada nodo (-1 para la raíz)
+    profundidad: np.ndarray     # nivel de cada nodo (0 para la raíz)
+    x: np.ndarray
+    y: np.ndarray
+
+    def posiciones(self) -> Dict[int, Tuple[float, float]]:
+        """Coordenadas por id de nodo, en el formato que espera nx.draw"""
+        return {nodo.id: (x, y) for nodo, x, y in zip(self.nodos, self.x.tolist(), self.y.tolist())}
+
+    def aristas(self) -> np.ndarray:
+        """Segmentos padre-hijo como arreglo (n-1, 2, 2), listo para una LineCollection"""
+        hijos = np.nonzero(self.padres >= 0)[0]
+        padres = self.padres[hijos]
+        return np.stack([np.column_stack([self.x[padres], self.y[padres]]),
+                         np.column_stack([self.x[hijos], self.y[hijos]])], axis=1)
+
+
+def _hijos(nodo) -> Iterable:
+    return nodo.hijos
+
+
+def aplanar(raiz, hijos_de: Optional[Callable[[object], Iterable]] = None) -> Tuple[list, List[int], List[List[int]]]:
+    """Recorre el árbol en preorden: nodos, índice del padre y lista de hijos de cada uno"""
+    hijos_de = hijos_de or _hijos
+    nodos = [raiz]
+    padres = [-1]
+    hijos: List[List[int]] = [[]]
+    pila = [0]
+    while pila:
+        indice = pila.pop()
+        propios = hijos[indice]
+        for hijo in hijos_de(nodos[indice]):
+            propios.append(len(nodos))
+            nodos.append(hijo)
+            padres.append(indice)
+            hijos.append([])
+        # Se apilan al revés para visitar los hijos de izquierda a derecha
+        pila.extend(reversed(propios))
+    return nodos, padres, hijos
+
+
+def disponer_arbol(raiz, separacion: float = SEPARACION, altura_nivel: float = 1.0,
+                   hijos_de: Optional[Callable[[object], Iterable]] = None) -> Disposicion:
+    """Calcula las coordenadas de todos los nodos del árbol en tiempo lineal.
+
+    Primer recorrido (postorden): posición preliminar de cada nodo relativa a
+    su padre, separando cada subárbol de sus hermanos izquierdos por sus
+    contornos (apportion). Segundo recorrido (preorden): se suman los
+    modificadores de los ancestros para obtener la x final.
+    `hijos_de(nodo)` permite disponer solo una parte del árbol (por ejemplo, con
+    subárboles colapsados) sin copiarlo.
+    """
+    nodos, padres, hijos = aplanar(raiz, hijos_de)
+    n = len(nodos)
+
+    # Posición de cada nodo entre sus hermanos
+    numero = [0] * n
+    for propios in hijos:
+        for i, hijo in enumerate(propios):
+            numero[hijo] = i
+
+    prelim = [0.0] * n
+    mod = [0.0] * n
+    desplazamiento = [0.0] * n
+    cambio = [0.0] * n
+    hilo = [-1] * n
+    ancestro = list(range(n))
+    ancestro_defecto = [-1] * n
+
+    def hermano_izquierdo(v: int) -> int:
+        return hijos[padres[v]][numero[v] - 1] if padres[v] >= 0 and numero[v] > 0 else -1
+
+    def siguiente_izquierda(v: int) -> int:
+        return hijos[v][0] if hijos[v] else hilo[v]
+
+    def siguiente_derecha(v: int) -> int:
+        return hijos[v][-1] if hijos[v] else hilo[v]
+
+    def mover_subarbol(izq: int, der: int, cantidad: float):
+        subarboles = numero[der] - numero[izq]
+        cambio[der] -= cantidad / subarboles
+        desplazamiento[der] += cantidad
+        cambio[izq] += cantidad / subarboles
+        prelim[der] += cantidad
+        mod[der] += cantidad
+
+    def repartir(v: int, defecto: int) -> int:
+        """apportion: separa el subárbol de v de los de sus hermanos izquierdos"""
+        w = hermano_izquierdo(v)
+        if w < 0:
+            return defecto
+        vip = vop = v
+        vim = w
+        vom = hijos[padres[v]][0]
+        sip = mod[vip]
+        sop = mod[vop]
+        sim = mod[vim]
+        som = mod[vom]
+        while siguiente_derecha(vim) >= 0 and siguiente_izquierda(vip) >= 0:
+            vim = siguiente_derecha(vim)
+            vip = siguiente_izquierda(vip)
+            vom = siguiente_izquierda(vom)
+            vop = siguiente_derecha(vop)
+            ancestro[vop] = v
+            cantidad = (prelim[vim] + sim) - (prelim[vip] + sip) + separacion
+            if cantidad > 0:
+                a = ancestro[vim]
+                izq = a if padres[a] == padres[v] else defecto
+                mover_subarbol(izq, v, cantidad)
+                sip += cantidad
+                sop += cantidad
+            sim += mod[vim]
+            sip += mod[vip]
+            som += mod[vom]
+            sop += mod[vop]
+        if siguiente_derecha(vim) >= 0 and siguiente_derecha(vop) < 0:
+            hilo[vop] = siguiente_derecha(vim)
+            mod[vop] += sim - sop
+        if siguiente_izquierda(vip) >= 0 and siguiente_izquierda(vom) < 0:
+            hilo[vom] = siguiente_izquierda(vip)
+            mod[vom] += sip - som
+            defecto = v
+        return defecto
+
+    # Postorden con los hijos de izquierda a derecha: el preorden invertido de
+    # derecha a izquierda, que se obtiene recorriendo `hijos` sin invertir.
+    postorden = []
+    pila = [0]
+    while pila:
+        v = pila.pop()
+        postorden.append(v)
+        pila.extend(hijos[v])
+    postorden.reverse()
+
+    for v in postorden:
+        propios = hijos[v]
+        w = hermano_izquierdo(v)
+        if not propios:
+            prelim[v] = prelim[w] + separacion if w >= 0 else 0.0
+        else:
+            # executeShifts: aplica los corrimientos acumulados por mover_subarbol
+            acumulado = 0.0
+            variacion = 0.0
+            for hijo in reversed(propios):
+                prelim[hijo] += acumulado
+                mod[hijo] += acumulado
+                variacion += cambio[hijo]
+                acumulado += desplazamiento[hijo] + variacion
+            medio = (prelim[propios[0]] + prelim[propios[-1]]) / 2
+            if w >= 0:
+                prelim[v] = prelim[w] + separacion
+                mod[v] = prelim[v] - medio
+            else:
+                prelim[v] = medio
+        p = padres[v]
+        if p >= 0:
+            if numero[v] == 0:
+                ancestro_defecto[p] = v
+            ancestro_defecto[p] = repartir(v, ancestro_defecto[p])
+
+    # Segundo recorrido: el preorden ya tiene cada padre antes que sus hijos
+    suma_mod = [0.0] * n
+    nivel = [0] * n
+    for v in range(1, n):
+        p = padres[v]
+        suma_mod[v] = suma_mod[p] + mod[p]
+        nivel[v] = nivel[p] + 1
+
+    profundidad = np.array(nivel, dtype=np.int64)
+    x = np.array(prelim) + np.array(suma_mod)
+    x -= x.min()
+    y = 0.0 - profundidad * altura_nivel
+    return Disposicion(nodos, np.array(padres, dtype=np.int64), profundidad, x, y)
@@ -0,0 +1,323 @@
+"""Gramáticas declarativas y sus tablas compiladas.
+
+Una gramática se escribe como el texto que muestran las GUIs:
+
+    S → S + T | T
+    T → T * F | F
+    F → (S) | a
+
+Cada línea (o cada tramo separado por ';') define las alternativas de un no
+terminal; '->' equivale a '→' y 'ε' (o 'E', si E no es un no terminal) es la
+cadena vacía. Los no terminales son los nombres que aparecen a la izquierda
+(una mayúscula seguida opcionalmente de apóstrofos, como S'); todo otro
+carácter que no sea un espacio es un terminal.
+
+`compilar` calcula una sola vez los conjuntos anulables, FIRST y FOLLOW, la
+tabla LL(1) cuando la gramática lo es, y las tablas de estados que usa el
+reconocedor de Earley (ParserGramatica, en analizadores.py). `cargar_gramatica`
+guarda el resultado con pickle en DIRECTORIO_GRAMATICAS, así que la siguiente
+ejecución no vuelve a compilar.
+"""
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Marca de fin de entrada en la tabla LL(1)
+FIN = '$'
+
+# Símbolos de la cadena vacía en el texto de una gramática ('E' solo si no es un no terminal)
+VACIOS = ('ε', 'E')
+
+# Envoltura de los nodos de una producción unitaria (ver Etiqueta)
+SIEMPRE = "siempre"
+SI_UN_HIJO = "si_un_hijo"
+
+# Cambia cuando cambia el formato de GramaticaCompilada (invalida las tablas guardadas)
+VERSION_TABLAS = 1
+
+DIRECTORIO_GRAMATICAS = os.environ.get("ANALIZADORES_GRAMATICAS") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "analizadores", "gramaticas")
+
+Gramatica = Dict[str, List[Tuple[str, ...]]]
+
+# (tipo, valor, envoltura) del nodo que arma cada producción
+Etiqueta = Tuple[str, str, str]
+
+_NOMBRE = re.compile(r"[A-Z]'*")
+
+
+def calcular_primeros(gramatica: Gramatica) -> Tuple[Dict[str, set], set]:
+    """Conjuntos FIRST de cada no terminal y el conjunto de no terminales anulables"""
+    anulables = set()
+    primeros: Dict[str, set] = {nt: set() for nt in gramatica}
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt, producciones in gramatica.items():
+            for produccion in producciones:
+                primeros_prod, anulable = primeros_de(produccion, gramatica, primeros, anulables)
+                if not primeros_prod <= primeros[nt]:
+                    primeros[nt] |= primeros_prod
+                    cambio = True
+                if anulable and nt not in anulables:
+                    anulables.add(nt)
+                    cambio = True
+    return primeros, anulables
+
+
+def primeros_de(simbolos: Iterable[str], gramatica: Gramatica,
+                primeros: Dict[str, set], anulables: set) -> Tuple[set, bool]:
+    """FIRST de una secuencia de símbolos y si la secuencia puede derivar ε"""
+    resultado = set()
+    for simbolo in simbolos:
+        if simbolo.startswith('#'):
+            continue
+        if simbolo not in gramatica:
+            resultado.add(simbolo)
+            return resultado, False
+        resultado |= primeros[simbolo]
+        if simbolo not in anulables:
+            return resultado, False
+    return resultado, True
+
+
+def calcular_siguientes(gramatica: Gramatica, inicial: str, primeros: Dict[str, set],
+                        anulables: set) -> Dict[str, set]:
+    """Conjuntos FOLLOW de cada no terminal (FIN sigue al símbolo inicial)"""
+    siguientes: Dict[str, set] = {nt: set() for nt in gramatica}
+    siguientes[inicial].add(FIN)
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt, producciones in gramatica.items():
+            for produccion in producciones:
+                for i, simbolo in enumerate(produccion):
+                    if simbolo not in gramatica:
+                        continue
+                    resto, anulable = primeros_de(produccion[i + 1:], gramatica, primeros, anulables)
+                    if anulable:
+                        resto = resto | siguientes[nt]
+                    if not resto <= siguientes[simbolo]:
+                        siguientes[simbolo] |= resto
+                        cambio = True
+    return siguientes
+
+
+def construir_tabla_ll1(gramatica: Gramatica, inicial: str) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+    """Tabla predictiva tabla[no_terminal][token] -> producción; falla si la gramática no es LL(1)"""
+    primeros, anulables = calcular_primeros(gramatica)
+    siguientes = calcular_siguientes(gramatica, inicial, primeros, anulables)
+
+    tabla: Dict[str, Dict[str, Tuple[str, ...]]] = {nt: {} for nt in gramatica}
+    for nt, producciones in gramatica.items():
+        for produccion in producciones:
+            predice, anulable = primeros_de(produccion, gramatica, primeros, anulables)
+            if anulable:
+                predice = predice | siguientes[nt]
+            for token in predice:
+                if token in tabla[nt]:
+                    raise ValueError(f"La gramática no es LL(1): conflicto en {nt} con '{token}'")
+                tabla[nt][token] = produccion
+    return tabla
+
+
+def leer_gramatica(texto: str) -> Tuple[str, Gramatica, Dict[Tuple[str, int], str]]:
+    """Lee el texto de una gramática: (inicial, gramática, texto de cada alternativa).
+
+    La gramática tiene el mismo formato que GRAMATICA_STF: no terminal -> lista de
+    producciones (tuplas de símbolos). El texto de cada alternativa, sin espacios,
+    identifica a la producción en las etiquetas (por ejemplo "S→(S)").
+    """
+    reglas: List[Tuple[str, str]] = []
+    for linea in re.split(r"[\n;]", texto):
+        if not linea.strip():
+            continue
+        partes = re.split(r"→|->", linea, maxsplit=1)
+        if len(partes) != 2 or not _NOMBRE.fullmatch(partes[0].strip()):
+            raise ValueError(f"Regla mal formada: {linea.strip()!r}")
+        reglas.append((partes[0].strip(), partes[1]))
+    if not reglas:
+        raise ValueError("La gramática está vacía")
+
+    # Nombres más largos primero para que S' no se lea como S seguido de un terminal
+    nombres = sorted({nt for nt, _ in reglas}, key=len, reverse=True)
+    gramatica: Gramatica = {}
+    textos: Dict[Tuple[str, int], str] = {}
+    for nt, derecha in reglas:
+        producciones = gramatica.setdefault(nt, [])
+        for alternativa in derecha.split('|'):
+            simbolos: List[str] = []
+            pos = 0
+            while pos < len(alternativa):
+                caracter = alternativa[pos]
+                if caracter.isspace():
+                    pos += 1
+                    continue
+                nombre = next((n for n in nombres if alternativa.startswith(n, pos)), None)
+                if nombre is not None:
+                    simbolos.append(nombre)
+                    pos += len(nombre)
+                    continue
+                if caracter in VACIOS:
+                    pos += 1
+                    continue
+                if caracter.isupper():
+                    raise ValueError(f"El no terminal {caracter} no tiene producciones")
+                simbolos.append(caracter)
+                pos += 1
+            textos[(nt, len(producciones))] = f"{nt}→{''.join(alternativa.split()) or 'ε'}"
+            producciones.append(tuple(simbolos))
+    return reglas[0][0], gramatica, textos
+
+
+def _normalizar_clave(clave: str) -> str:
+    return "".join(clave.replace("->", "→").split())
+
+
+class GramaticaCompilada:
+    """Tablas de una gramática listas para el reconocedor de Earley.
+
+    Cada posición del punto dentro de una producción es un estado entero; los
+    estados de una producción son consecutivos, así que avanzar el punto es
+    sumar 1. Por estado se guarda el no terminal que sigue al punto (o -1), el
+    terminal que sigue (o '') y, si el punto está al final, el no terminal que
+    se completa (o -1). `predice[A][c]` son los estados iniciales de las
+    producciones de A que pueden empezar con c (más las anulables) y
+    `predice_vacio[A]` solo las anulables, para caracteres fuera de FIRST.
+    """
+
+    def __init__(self, texto: str, etiquetas: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.texto = texto
+        inicial, gramatica, textos = leer_gramatica(texto)
+        self.gramatica = gramatica
+        self.nombres: List[str] = list(gramatica)
+        indice = {nt: i for i, nt in enumerate(self.nombres)}
+        self.inicial = indice[inicial]
+
+        self.primeros, anulables = calcular_primeros(gramatica)
+        self.siguientes = calcular_siguientes(gramatica, inicial, self.primeros, anulables)
+        self.anulables = [nt in anulables for nt in self.nombres]
+        self.terminales = frozenset(s for producciones in gramatica.values()
+                                    for produccion in producciones for s in produccion if s not in gramatica)
+        try:
+            self.tabla_ll1: Optional[Dict[str, Dict[str, Tuple[str, ...]]]] = construir_tabla_ll1(gramatica, inicial)
+        except ValueError:
+            self.tabla_ll1 = None
+
+        etiquetas = {_normalizar_clave(clave): valor for clave, valor in (etiquetas or {}).items()}
+        self.lhs: List[int] = []                        # no terminal de cada producción
+        self.simbolos: List[Tuple[str, ...]] = []       # producción tal como está en la gramática
+        self.derechas: List[Tuple[object, ...]] = []    # símbolos: int (no terminal) o str (terminal)
+        self.inicio: List[int] = []                     # estado con el punto al principio
+        self.etiquetas: List[Etiqueta] = []
+        self.por_lhs: List[List[int]] = [[] for _ in self.nombres]
+        self.nt_siguiente: List[int] = []
+        self.t_siguiente: List[str] = []
+        self.completa: List[int] = []
+        for nt, producciones in gramatica.items():
+            for k, produccion in enumerate(producciones):
+                p = len(self.lhs)
+                derecha = tuple(indice[s] if s in gramatica else s for s in produccion)
+                self.lhs.append(indice[nt])
+                self.simbolos.append(produccion)
+                self.derechas.append(derecha)
+                self.inicio.append(len(self.nt_siguiente))
+                self.por_lhs[indice[nt]].append(p)
+                texto_prod = textos[(nt, k)]
+                tipo, valor, *envoltura = etiquetas.get(_normalizar_clave(texto_prod),
+                                                        (nt, texto_prod.split('→', 1)[1]))
+                self.etiquetas.append((tipo, valor, envoltura[0] if envoltura else SIEMPRE))
+                for simbolo in derecha:
+                    self.nt_siguiente.append(simbolo if isinstance(simbolo, int) else -1)
+                    self.t_siguiente.append('' if isinstance(simbolo, int) else simbolo)
+                    self.completa.append(-1)
+                self.nt_siguiente.append(-1)
+                self.t_siguiente.append('')
+                self.completa.append(indice[nt])
+        # Producción de cada estado y posición del punto en ella
+        self.produccion: List[int] = []
+        self.punto: List[int] = []
+        for p, derecha in enumerate(self.derechas):
+            self.produccion.extend([p] * (len(derecha) + 1))
+            self.punto.extend(range(len(derecha) + 1))
+
+        self.predice: List[Dict[str, Tuple[int, ...]]] = []
+        self.predice_vacio: List[Tuple[int, ...]] = []
+        for a, nt in enumerate(self.nombres):
+            por_caracter: Dict[str, List[int]] = {c: [] for c in self.terminales}
+            vacias: List[int] = []
+            for p in self.por_lhs[a]:
+                predice, anulable = primeros_de(self.simbolos[p], gramatica, self.primeros, anulables)
+                for c in self.terminales:
+                    if anulable or c in predice:
+                        por_caracter[c].append(self.inicio[p])
+                if anulable:
+                    vacias.append(self.inicio[p])
+            self.predice.append({c: tuple(estados) for c, estados in por_caracter.items()})
+            self.predice_vacio.append(tuple(vacias))
+
+    def __repr__(self) -> str:
+        return f"GramaticaCompilada({self.texto!r})"
+
+    def es_ll1(self) -> bool:
+        return self.tabla_ll1 is not None
+
+    def texto_produccion(self, p: int) -> str:
+        simbolos = [self.nombres[s] if isinstance(s, int) else s for s in self.derechas[p]]
+        return f"{self.nombres[self.lhs[p]]} → {' '.join(simbolos) or 'ε'}"
+
+
+def compilar(texto: str, etiquetas: Optional[Dict[str, Tuple[str, ...]]] = None) -> GramaticaCompilada:
+    """Compila la gramática sin usar el caché en disco"""
+    return GramaticaCompilada(texto, etiquetas)
+
+
+# Gramáticas ya compiladas en este proceso, por clave de caché
+_compiladas: Dict[str, GramaticaCompilada] = {}
+
+
+def clave_gramatica(texto: str, etiquetas: Optional[Dict[str, Tuple[str, ...]]] = None) -> str:
+    contenido = repr((VERSION_TABLAS, texto, sorted((etiquetas or {}).items())))
+    return hashlib.blake2b(contenido.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cargar_gramatica(texto: str, etiquetas: Optional[Dict[str, Tuple[str, ...]]] = None,
+                     directorio: Optional[str] = None) -> GramaticaCompilada:
+    """Tablas de la gramática: de memoria, del caché en disco o compiladas y guardadas.
+
+    Un archivo ilegible o de otra versión se recompila; si el directorio no se
+    puede escribir, las tablas quedan solo en memoria.
+    """
+    clave = clave_gramatica(texto, etiquetas)
+    compilada = _compiladas.get(clave)
+    if compilada is not None:
+        return compilada
+    directorio = directorio or DIRECTORIO_GRAMATICAS
+    ruta = os.path.join(directorio, clave + ".pkl")
+    try:
+        with open(ruta, "rb") as archivo:
+            version, compilada = pickle.load(archivo)
+        if version != VERSION_TABLAS or compilada.texto != texto:
+            compilada = None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        compilada = None
+    if compilada is None:
+        compilada = compilar(texto, etiquetas)
+        try:
+            os.makedirs(directorio, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as archivo:
+                    pickle.dump((VERSION_TABLAS, compilada), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporal, ruta)
+            except BaseException:
+                os.unlink(temporal)
+                raise
+        except OSError:
+            pass
+    _compiladas[clave] = compilada
+    return compilada
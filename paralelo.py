@@ -0,0 +1,207 @@
+"""Análisis por lotes repartido en varios procesos.
+
+La búsqueda de los analizadores es trabajo de CPU en Python puro, así que un
+solo proceso solo aprovecha un núcleo. Aquí la entrada se divide en lotes que
+se reparten en un ProcessPoolExecutor; los resultados se devuelven en el mismo
+orden de la entrada y se cuentan aceptadas, rechazadas y errores por proceso.
+Cada proceso puede tener su propio caché de resultados para las entradas repetidas
+y, si se pide, devuelve el perfil (contadores y tiempos) de cada entrada analizada.
+Con un Presupuesto, cada entrada se analiza con sus propios límites de pasos,
+tiempo, nodos y memoria: una entrada que se pasa queda como "agotada", con las
+estadísticas parciales, y el lote sigue con la siguiente.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from almacen import contar_nodos
+from analizadores import ANALIZADORES, Analizador, arbol_a_json
+from cache import CacheResultados
+from control import AnalisisInterrumpido, Presupuesto
+from perfil import Perfil, PerfilAnalisis
+from traza import Traza
+
+# Entradas por unidad de trabajo enviada a un proceso
+TAM_LOTE = 1000
+
+
+class ResultadoLote(NamedTuple):
+    entrada: str
+    valida: bool
+    arbol_json: Optional[str] = None
+    error: Optional[str] = None
+    # Solo con `detalle`: nodos del árbol (0 si no hay) y posición del primer error de una rechazada
+    nodos: int = 0
+    posicion_error: Optional[int] = None
+    # Solo con perfil: contadores y fases del análisis de esta entrada (ver PerfilAnalisis.como_dict)
+    perfil: Optional[dict] = None
+    # Si se agotó el presupuesto: motivo y estadísticas parciales (en `nodos`, los creados hasta ahí)
+    agotado: Optional[str] = None
+
+
+Contadores = Dict[str, int]
+
+
+def crear_analizador(gramatica: str, modo: Optional[str] = None, traza: Optional[Traza] = None,
+                     perfil: Optional[Perfil] = None, presupuesto: Optional[Presupuesto] = None,
+                     extendido: bool = False) -> Analizador:
+    """`extendido` pide el léxico extendido de stf (identificadores y números como operandos)"""
+    clase = ANALIZADORES[gramatica]
+    control = presupuesto.crear_control() if presupuesto is not None and presupuesto.limitado() else None
+    opciones = {"extendido": True} if extendido else {}
+    if modo:
+        return clase(traza=traza, modo=modo, perfil=perfil, control=control, **opciones)
+    return clase(traza=traza, perfil=perfil, control=control, **opciones)
+
+
+def nuevos_contadores() -> Contadores:
+    return {"aceptadas": 0, "rechazadas": 0, "errores": 0, "agotadas": 0, "cache": 0, "criba": 0}
+
+
+def analizar_lote(parser: Analizador, lote: List[str], con_arbol: bool = False,
+                  cache: Optional[CacheResultados] = None,
+                  detalle: bool = False) -> Tuple[List[ResultadoLote], Contadores]:
+    """Analiza un lote de entradas; una excepción en una entrada no detiene el resto.
+
+    Con `cache`, las entradas ya vistas se responden sin analizar. Solo se guarda
+    el veredicto y, si se pidieron, el JSON del árbol y el detalle (cantidad de
+    nodos y posición del error), que es lo que se escribe. Si el analizador
+    tiene un perfil activo, se reinicia en cada entrada y cada resultado
+    analizado lleva el suyo. Si tiene un control con presupuesto, una entrada
+    que lo agota se informa como agotada (no se guarda en el caché).
+    """
+    resultados = []
+    contadores = nuevos_contadores()
+    perfil = parser.perfil
+    medir = perfil.activo
+    control = parser.control
+    firma = parser.firma()
+    for entrada in lote:
+        if cache is not None:
+            guardado = cache.obtener(firma, entrada)
+            extras = guardado.extras if guardado is not None else None
+            if guardado is not None and (not con_arbol or 'json' in extras) and (not detalle or 'nodos' in extras):
+                contadores["cache"] += 1
+                contadores["aceptadas" if guardado.valida else "rechazadas"] += 1
+                resultados.append(ResultadoLote(entrada, guardado.valida, extras.get('json'),
+                                                nodos=extras.get('nodos', 0), posicion_error=extras.get('error')))
+                continue
+        try:
+            if control is not None:
+                # Un solo presupuesto para el veredicto y la posición del error
+                control.iniciar()
+            if medir:
+                perfil.reiniciar()
+            with perfil.fase("analizar"):
+                valida, arbol = parser.es_valida(entrada)
+            nodos = contar_nodos(arbol) if detalle and arbol is not None else 0
+            posicion_error = parser.posicion_error(entrada) if detalle and not valida else None
+        except AnalisisInterrumpido as e:
+            contadores["agotadas"] += 1
+            resultados.append(ResultadoLote(entrada, False, nodos=e.nodos, agotado=str(e),
+                                            perfil=perfil.como_dict() if medir else None))
+            continue
+        except Exception as e:
+            contadores["errores"] += 1
+            resultados.append(ResultadoLote(entrada, False, error=f"{type(e).__name__}: {e}"))
+            continue
+        contadores["aceptadas" if valida else "rechazadas"] += 1
+        arbol_json = arbol_a_json(arbol) if con_arbol else None
+        if cache is not None:
+            extras = {}
+            # Un modo que solo reconoce no arma árbol: su "null" no sirve para una aceptada
+            if con_arbol and (arbol is not None or not valida):
+                extras['json'] = arbol_json
+            if detalle:
+                extras['nodos'] = nodos
+                extras['error'] = posicion_error
+            cache.guardar(firma, entrada, valida, None, **extras)
+        resultados.append(ResultadoLote(entrada, valida, arbol_json, nodos=nodos, posicion_error=posicion_error,
+                                        perfil=perfil.como_dict() if medir else None))
+    return resultados, contadores
+
+
+def dividir_en_lotes(entradas: Iterable[str], tam_lote: int) -> Iterator[List[str]]:
+    iterador = iter(entradas)
+    while True:
+        lote = list(islice(iterador, tam_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def _acumular(estadisticas: Optional[Dict[int, Contadores]], pid: int, contadores: Contadores):
+    if estadisticas is None:
+        return
+    total = estadisticas.setdefault(pid, nuevos_contadores())
+    for clave, valor in contadores.items():
+        total[clave] += valor
+
+
+def analizar_en_serie(gramatica: str, entradas: Iterable[str], modo: Optional[str] = None,
+                      con_arbol: bool = False, tam_lote: int = TAM_LOTE,
+                      estadisticas: Optional[Dict[int, Contadores]] = None,
+                      traza: Optional[Traza] = None,
+                      cache: Optional[CacheResultados] = None,
+                      detalle: bool = False, perfil: Optional[Perfil] = None,
+                      presupuesto: Optional[Presupuesto] = None, extendido: bool = False
+                      ) -> Iterator[ResultadoLote]:
+    """Mismo contrato que analizar_en_paralelo, pero en el proceso actual (admite traza y cProfile en `perfil`)"""
+    parser = crear_analizador(gramatica, modo, traza, perfil, presupuesto, extendido)
+    for lote in dividir_en_lotes(entradas, tam_lote):
+        resultados, contadores = analizar_lote(parser, lote, con_arbol, cache, detalle)
+        _acumular(estadisticas, os.getpid(), contadores)
+        yield from resultados
+
+
+# Analizador y caché propios de cada proceso trabajador (se crean una sola vez en el inicializador)
+_parser_trabajador: Optional[Analizador] = None
+_cache_trabajador: Optional[CacheResultados] = None
+
+
+def _iniciar_trabajador(gramatica: str, modo: Optional[str], max_cache: int = 0, ruta_cache: Optional[str] = None,
+                        perfilar: bool = False, presupuesto: Optional[Presupuesto] = None, extendido: bool = False):
+    global _parser_trabajador, _cache_trabajador
+    _parser_trabajador = crear_analizador(gramatica, modo, perfil=PerfilAnalisis() if perfilar else None,
+                                          presupuesto=presupuesto, extendido=extendido)
+    # Cada proceso parte del caché guardado (si hay) y no lo escribe
+    _cache_trabajador = CacheResultados(max_entradas=max_cache, ruta=ruta_cache) if max_cache > 0 else None
+
+
+def _trabajar(lote: List[str], con_arbol: bool, detalle: bool) -> Tuple[int, List[ResultadoLote], Contadores]:
+    resultados, contadores = analizar_lote(_parser_trabajador, lote, con_arbol, _cache_trabajador, detalle)
+    return os.getpid(), resultados, contadores
+
+
+def analizar_en_paralelo(gramatica: str, entradas: Iterable[str], procesos: Optional[int] = None,
+                         modo: Optional[str] = None, con_arbol: bool = False, tam_lote: int = TAM_LOTE,
+                         estadisticas: Optional[Dict[int, Contadores]] = None,
+                         max_cache: int = 0, ruta_cache: Optional[str] = None,
+                         detalle: bool = False, perfilar: bool = False,
+                         presupuesto: Optional[Presupuesto] = None, extendido: bool = False
+                         ) -> Iterator[ResultadoLote]:
+    """Reparte la entrada en lotes entre procesos y produce los resultados en el orden original.
+
+    Solo se mantienen en vuelo unos pocos lotes por proceso, así que la entrada
+    puede ser un flujo de millones de líneas sin cargarse entera en memoria.
+    Si se pasa `estadisticas`, se llena con los contadores de cada proceso (por pid).
+    Con `perfilar`, cada resultado analizado lleva su perfil (sin cProfile), y
+    con `presupuesto`, cada entrada se analiza con esos límites.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    en_vuelo = deque()
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                             initargs=(gramatica, modo, max_cache, ruta_cache, perfilar, presupuesto,
+                                       extendido)) as ejecutor:
+        for lote in dividir_en_lotes(entradas, tam_lote):
+            en_vuelo.append(ejecutor.submit(_trabajar, lote, con_arbol, detalle))
+            if len(en_vuelo) >= 2 * procesos:
+                pid, resultados, contadores = en_vuelo.popleft().result()
+                _acumular(estadisticas, pid, contadores)
+                yield from resultados
+        while en_vuelo:
+            pid, resultados, contadores = en_vuelo.popleft().result()
+            _acumular(estadisticas, pid, contadores)
+            yield from resultados
@@ -0,0 +1,108 @@
+"""Perfil de un análisis: contadores del ciclo de búsqueda y tiempo por fase.
+
+Los analizadores suman sus eventos en `perfil.contadores` solo si `perfil.activo`
+es verdadero, así que con el perfil desactivado (PERFIL_NULO) el costo en los
+ciclos es una comparación de un booleano local, como con la traza. Los contadores:
+
+- llamadas: segmentos apilados para analizar (expansiones en el LL(1), ítems
+  procesados en Earley)
+- divisiones: puntos de corte SS probados
+- retrocesos: alternativas que fallaron y obligaron a probar la siguiente
+- memo_aciertos / memo_fallos: consultas a la tabla de memoización o de chart
+- nodos: nodos creados en el almacén, incluidos los de ramas descartadas
+- profundidad_max: máximo de marcos en la pila de búsqueda (o de símbolos en el LL(1))
+
+Las fases se miden con `with perfil.fase(nombre)` y el tiempo de cada una no
+incluye el de las fases anidadas (tokenizar dentro de analizar, por ejemplo).
+Con `cprofile`, lo que corre dentro de las fases queda además registrado por
+cProfile, y `guardar_cprofile` lo escribe en el formato de pstats (lo leen
+`python -m pstats`, snakeviz y similares).
+"""
+import cProfile
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+CONTADORES = ("llamadas", "divisiones", "retrocesos", "memo_aciertos", "memo_fallos", "nodos", "profundidad_max")
+FASES = ("tokenizar", "analizar", "grafo", "disposicion", "dibujo")
+
+# Contexto vacío que devuelve el perfil nulo para cualquier fase
+_SIN_FASE = nullcontext()
+
+
+class Perfil:
+    """Perfil nulo: no mide nada"""
+    activo = False
+
+    def fase(self, nombre: str):
+        return _SIN_FASE
+
+    def reiniciar(self):
+        pass
+
+
+# Perfil compartido para cuando no se pide medir
+PERFIL_NULO = Perfil()
+
+
+class PerfilAnalisis(Perfil):
+    """Contadores y tiempos (en segundos) de un análisis; `reiniciar()` lo deja listo para el siguiente"""
+    activo = True
+
+    def __init__(self, cprofile: bool = False):
+        self.contadores: Dict[str, int] = dict.fromkeys(CONTADORES, 0)
+        self.fases: Dict[str, float] = {}
+        # Tiempo de las fases hijas de cada fase abierta, para descontarlo de la madre
+        self._abiertas: List[float] = []
+        # El registro de cProfile sigue acumulando entre reinicios
+        self.cprofile: Optional[cProfile.Profile] = cProfile.Profile() if cprofile else None
+
+    def reiniciar(self):
+        self.contadores = dict.fromkeys(CONTADORES, 0)
+        self.fases = {}
+
+    @contextmanager
+    def fase(self, nombre: str):
+        perfilador = self.cprofile if not self._abiertas else None
+        self._abiertas.append(0.0)
+        if perfilador is not None:
+            perfilador.enable()
+        inicio = time.perf_counter()
+        try:
+            yield self
+        finally:
+            total = time.perf_counter() - inicio
+            if perfilador is not None:
+                perfilador.disable()
+            hijas = self._abiertas.pop()
+            self.fases[nombre] = self.fases.get(nombre, 0.0) + total - hijas
+            if self._abiertas:
+                self._abiertas[-1] += total
+
+    def como_dict(self) -> dict:
+        return {"contadores": dict(self.contadores),
+                "fases": {nombre: self.fases[nombre] for nombre in FASES if nombre in self.fases}}
+
+    def resumen(self) -> str:
+        """Texto de dos líneas para mostrar: contadores distintos de cero y milisegundos por fase"""
+        contadores = "  ".join(f"{nombre}={valor:,}" for nombre, valor in self.contadores.items() if valor)
+        fases = "  ".join(f"{nombre}={self.fases[nombre] * 1000:.1f} ms" for nombre in FASES if nombre in self.fases)
+        return f"{contadores or 'sin contadores'}\n{fases or 'sin fases medidas'}"
+
+    def guardar_json(self, ruta: str):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.como_dict(), archivo, ensure_ascii=False, indent=2)
+
+    def guardar_cprofile(self, ruta: str):
+        """Escribe lo registrado por cProfile en el formato de pstats"""
+        if self.cprofile is None:
+            raise ValueError("el perfil no se tomó con cProfile")
+        self.cprofile.dump_stats(ruta)
+
+    def guardar(self, ruta: str):
+        """JSON o, si la ruta termina en .prof o .pstats, el registro de cProfile"""
+        if ruta.endswith((".prof", ".pstats")):
+            self.guardar_cprofile(ruta)
+        else:
+            self.guardar_json(ruta)
@@ -0,0 +1,575 @@
+"""Exportación e importación de árboles de análisis sin pasar por networkx.
+
+Los árboles se escriben con codificadores en flujo que recorren el árbol en
+preorden con una pila explícita (sin recursión ni grafo intermedio) y vuelcan
+el texto por trozos, así que sirven para árboles profundos y para millones de
+árboles en un mismo archivo. Formatos:
+
+- "binario": por árbol, la tabla de etiquetas (tipo, valor) y dos arreglos en
+  preorden, el índice de etiqueta y la cantidad de hijos de cada nodo, con el
+  ancho mínimo (1, 2 o 4 bytes). La forma de arreglos está también disponible
+  en memoria con `arbol_a_arreglos` (por ejemplo, para np.frombuffer).
+- "jsonl": un árbol por línea, en el mismo JSON que `arbol_a_json`. Al leer se
+  aceptan también las líneas "desplazamiento<TAB>json" del auxiliar de
+  validar.py --arboles.
+- "sexp": una expresión S por línea: (tipo "valor" hijo...).
+- "dot": un digraph de Graphviz por árbol (solo exportación).
+
+Los lectores reconstruyen cada árbol en un AlmacenArbol y devuelven su VistaNodo.
+
+    python3 serializacion.py arboles.jsonl arboles.bin
+    python3 serializacion.py arboles.bin arboles.sexp
+    python3 serializacion.py --comprobar
+"""
+import argparse
+import io
+import json
+import re
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from almacen import AlmacenArbol, VistaNodo
+
+# Caracteres de texto acumulados antes de cada escritura al archivo
+TAM_TROZO = 1 << 16
+
+# Formato binario: cabecera del archivo y de cada árbol
+MAGIA = b"ARBP"
+VERSION_BINARIO = 1
+CABECERA = struct.Struct("<4sH")
+# Nodos, etiquetas y ancho en bytes de los arreglos de etiqueta y de cantidad de hijos
+CABECERA_ARBOL = struct.Struct("<IIBB")
+LARGO_TEXTO = struct.Struct("<I")
+# Ancho en bytes -> código de tipo de array
+_TIPOS = {1: 'B', 2: 'H', 4: 'I'}
+
+FORMATOS = ("binario", "jsonl", "sexp", "dot")
+# Extensión de archivo -> formato
+EXTENSIONES = {".bin": "binario", ".jsonl": "jsonl", ".json": "jsonl", ".sexp": "sexp", ".dot": "dot"}
+
+Etiqueta = Tuple[str, str]
+
+
+class ArbolPreorden(NamedTuple):
+    """Árbol como arreglos paralelos en preorden"""
+    etiquetas: List[Etiqueta]   # (tipo, valor) distintos
+    etiqueta: array              # índice en etiquetas de cada nodo
+    hijos: array                 # cantidad de hijos de cada nodo
+
+    def __len__(self) -> int:
+        return len(self.etiqueta)
+
+
+def preorden(raiz) -> Iterator[Tuple[Etiqueta, int]]:
+    """(etiqueta, cantidad de hijos) de cada nodo en preorden; en un almacén, sin crear vistas"""
+    if isinstance(raiz, VistaNodo):
+        almacen = raiz.almacen
+        etiquetas, etiqueta, num, hijos_de = almacen.etiquetas, almacen.etiqueta, almacen.num, almacen.hijos_de
+        pila = [raiz.id]
+        while pila:
+            v = pila.pop()
+            k = num[v]
+            yield etiquetas[etiqueta[v]], k
+            if k:
+                hijos = hijos_de(v)
+                hijos.reverse()
+                pila.extend(hijos)
+        return
+    pila = [raiz]
+    while pila:
+        nodo = pila.pop()
+        hijos = nodo.hijos
+        yield (nodo.tipo, nodo.valor), len(hijos)
+        pila.extend(reversed(hijos))
+
+
+def _con_cierres(nodos: Iterable[Tuple[Etiqueta, int]]) -> Iterator[Tuple[Etiqueta, bool, int]]:
+    """Agrega a cada nodo del preorden si es el primer hijo y cuántos subárboles cierra tras él"""
+    restantes: List[int] = []
+    totales: List[int] = []
+    for etiqueta, k in nodos:
+        primero = True
+        if restantes:
+            primero = restantes[-1] == totales[-1]
+            restantes[-1] -= 1
+        if k:
+            restantes.append(k)
+            totales.append(k)
+            yield etiqueta, primero, 0
+            continue
+        cierres = 1
+        while restantes and not restantes[-1]:
+            restantes.pop()
+            totales.pop()
+            cierres += 1
+        yield etiqueta, primero, cierres
+
+
+class _Volcador:
+    """Acumula trozos de texto y los escribe al archivo cada TAM_TROZO caracteres"""
+
+    def __init__(self, archivo: TextIO):
+        self.archivo = archivo
+        self.partes: List[str] = []
+        self.largo = 0
+
+    def agregar(self, texto: str):
+        self.partes.append(texto)
+        self.largo += len(texto)
+        if self.largo >= TAM_TROZO:
+            self.volcar()
+
+    def volcar(self):
+        self.archivo.write("".join(self.partes))
+        self.partes.clear()
+        self.largo = 0
+
+
+# ---------- Formato binario ----------
+
+def _ancho(maximo: int) -> int:
+    return 1 if maximo < 1 << 8 else 2 if maximo < 1 << 16 else 4
+
+
+def arbol_a_arreglos(raiz) -> ArbolPreorden:
+    """Codifica el árbol como etiquetas más arreglos de etiqueta y de cantidad de hijos en preorden.
+
+    None (sin árbol) se codifica como arreglos vacíos.
+    """
+    etiquetas: List[Etiqueta] = []
+    indices: Dict[Etiqueta, int] = {}
+    etiqueta = array('I')
+    hijos = array('I')
+    for clave, k in preorden(raiz) if raiz is not None else ():
+        indice = indices.get(clave)
+        if indice is None:
+            indice = indices[clave] = len(etiquetas)
+            etiquetas.append(clave)
+        etiqueta.append(indice)
+        hijos.append(k)
+    # Se reduce cada arreglo al ancho mínimo que admite sus valores
+    etiqueta = array(_TIPOS[_ancho(len(etiquetas))], etiqueta)
+    hijos = array(_TIPOS[_ancho(max(hijos, default=0))], hijos)
+    return ArbolPreorden(etiquetas, etiqueta, hijos)
+
+
+def arreglos_a_arbol(arreglos: ArbolPreorden) -> VistaNodo:
+    """Reconstruye el árbol en un AlmacenArbol.
+
+    El preorden invertido visita los hijos (del último al primero) antes que el
+    padre, así que basta una pila: cada nodo toma de ella sus k hijos ya armados.
+    """
+    etiquetas, etiqueta, num = arreglos
+    if not len(etiqueta):
+        raise ValueError("árbol sin nodos")
+    almacen = AlmacenArbol()
+    agregar = almacen.agregar
+    pila: List[int] = []
+    for v in range(len(etiqueta) - 1, -1, -1):
+        tipo, valor = etiquetas[etiqueta[v]]
+        k = num[v]
+        if k > len(pila):
+            raise ValueError(f"nodo {v} con {k} hijos, pero solo quedan {len(pila)} subárboles")
+        if k:
+            hijos = pila[-k:]
+            del pila[-k:]
+            hijos.reverse()
+            pila.append(agregar(tipo, valor, hijos))
+        else:
+            pila.append(agregar(tipo, valor))
+    if len(pila) != 1:
+        raise ValueError(f"los arreglos describen {len(pila)} árboles, no uno")
+    return almacen.vista(pila[0])
+
+
+def _a_bytes(arreglo: array) -> bytes:
+    if sys.byteorder == "big" and arreglo.itemsize > 1:
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _escribir_texto(archivo: BinaryIO, texto: str):
+    datos = texto.encode("utf-8")
+    archivo.write(LARGO_TEXTO.pack(len(datos)))
+    archivo.write(datos)
+
+
+def escribir_binario(arboles: Iterable, archivo: BinaryIO) -> int:
+    """Escribe la cabecera y un registro por árbol; devuelve la cantidad de árboles"""
+    archivo.write(CABECERA.pack(MAGIA, VERSION_BINARIO))
+    cantidad = 0
+    for raiz in arboles:
+        etiquetas, etiqueta, hijos = arbol_a_arreglos(raiz)
+        archivo.write(CABECERA_ARBOL.pack(len(etiqueta), len(etiquetas), etiqueta.itemsize, hijos.itemsize))
+        for tipo, valor in etiquetas:
+            _escribir_texto(archivo, tipo)
+            _escribir_texto(archivo, valor)
+        archivo.write(_a_bytes(etiqueta))
+        archivo.write(_a_bytes(hijos))
+        cantidad += 1
+    return cantidad
+
+
+def _leer_exacto(archivo: BinaryIO, n: int) -> bytes:
+    datos = archivo.read(n)
+    if len(datos) != n:
+        raise ValueError("archivo de árboles truncado")
+    return datos
+
+
+def _leer_texto(archivo: BinaryIO) -> str:
+    largo, = LARGO_TEXTO.unpack(_leer_exacto(archivo, LARGO_TEXTO.size))
+    return _leer_exacto(archivo, largo).decode("utf-8")
+
+
+def _leer_arreglo(archivo: BinaryIO, ancho: int, n: int) -> array:
+    if ancho not in _TIPOS:
+        raise ValueError(f"ancho de arreglo inválido: {ancho}")
+    arreglo = array(_TIPOS[ancho])
+    arreglo.frombytes(_leer_exacto(archivo, ancho * n))
+    if sys.byteorder == "big" and ancho > 1:
+        arreglo.byteswap()
+    return arreglo
+
+
+def leer_binario_arreglos(archivo: BinaryIO) -> Iterator[ArbolPreorden]:
+    """Cada árbol del archivo binario en forma de arreglos, sin reconstruirlo"""
+    magia, version = CABECERA.unpack(_leer_exacto(archivo, CABECERA.size))
+    if magia != MAGIA or version != VERSION_BINARIO:
+        raise ValueError("no es un archivo de árboles binario compatible")
+    while True:
+        cabecera = archivo.read(CABECERA_ARBOL.size)
+        if not cabecera:
+            return
+        if len(cabecera) != CABECERA_ARBOL.size:
+            raise ValueError("archivo de árboles truncado")
+        nodos, cantidad, ancho_etiqueta, ancho_hijos = CABECERA_ARBOL.unpack(cabecera)
+        etiquetas = [(_leer_texto(archivo), _leer_texto(archivo)) for _ in range(cantidad)]
+        yield ArbolPreorden(etiquetas, _leer_arreglo(archivo, ancho_etiqueta, nodos),
+                            _leer_arreglo(archivo, ancho_hijos, nodos))
+
+
+def leer_binario(archivo: BinaryIO) -> Iterator[Optional[VistaNodo]]:
+    for arreglos in leer_binario_arreglos(archivo):
+        yield arreglos_a_arbol(arreglos) if len(arreglos) else None
+
+
+# ---------- JSON por líneas ----------
+
+def escribir_jsonl(arboles: Iterable, archivo: TextIO) -> int:
+    """Un árbol por línea, en el JSON compacto de arbol_a_json (None se escribe como null)"""
+    salida = _Volcador(archivo)
+    # Comienzo de objeto ya codificado para cada etiqueta distinta
+    prefijos: Dict[Etiqueta, str] = {}
+    cantidad = 0
+    for raiz in arboles:
+        cantidad += 1
+        if raiz is None:
+            salida.agregar("null\n")
+            continue
+        for etiqueta, primero, cierres in _con_cierres(preorden(raiz)):
+            prefijo = prefijos.get(etiqueta)
+            if prefijo is None:
+                prefijo = prefijos[etiqueta] = '{"tipo":%s,"valor":%s,"hijos":[' % (
+                    json.dumps(etiqueta[0], ensure_ascii=False), json.dumps(etiqueta[1], ensure_ascii=False))
+            salida.agregar(prefijo if primero else "," + prefijo)
+            if cierres:
+                salida.agregar("]}" * cierres)
+        salida.agregar("\n")
+    salida.volcar()
+    return cantidad
+
+
+_CADENA_JSON = r'"(?:[^"\\]|\\.)*"'
+_TOKEN_JSON = re.compile(r'\{"tipo":(%s),"valor":(%s),"hijos":\[|(\]\})|(,)' % (_CADENA_JSON, _CADENA_JSON))
+
+
+def _decodificar(literal: str, cache: Dict[str, str]) -> str:
+    texto = cache.get(literal)
+    if texto is None:
+        texto = cache[literal] = json.loads(literal)
+    return texto
+
+
+def _armar(almacen: AlmacenArbol, pila: List[Tuple[str, str, List[int]]]) -> Optional[int]:
+    """Cierra el nodo del tope de la pila; devuelve el nodo si era la raíz"""
+    tipo, valor, hijos = pila.pop()
+    nodo = almacen.agregar(tipo, valor, hijos)
+    if pila:
+        pila[-1][2].append(nodo)
+        return None
+    return nodo
+
+
+def json_a_arbol(texto: str) -> Optional[VistaNodo]:
+    """Lee el JSON compacto de arbol_a_json con una pila explícita (json.loads no admite anidamientos profundos)"""
+    if texto == "null":
+        return None
+    almacen = AlmacenArbol()
+    pila: List[Tuple[str, str, List[int]]] = []
+    cadenas: Dict[str, str] = {}
+    raiz = None
+    pos = 0
+    coincidir = _TOKEN_JSON.match
+    while pos < len(texto):
+        token = coincidir(texto, pos)
+        if token is None or raiz is not None:
+            raise ValueError(f"JSON de árbol inválido en la posición {pos}")
+        pos = token.end()
+        if token.group(1) is not None:
+            pila.append((_decodificar(token.group(1), cadenas), _decodificar(token.group(2), cadenas), []))
+        elif token.group(3) is not None:
+            if not pila:
+                raise ValueError(f"JSON de árbol inválido en la posición {token.start()}")
+            raiz = _armar(almacen, pila)
+    if raiz is None:
+        raise ValueError("JSON de árbol incompleto")
+    return almacen.vista(raiz)
+
+
+def leer_jsonl(archivo: TextIO) -> Iterator[Optional[VistaNodo]]:
+    for linea in archivo:
+        linea = linea.rstrip("\r\n")
+        if not linea:
+            continue
+        if linea[0] != "{" and "\t" in linea:
+            # Línea "desplazamiento<TAB>json" del auxiliar de validar.py
+            linea = linea.split("\t", 1)[1]
+        yield json_a_arbol(linea)
+
+
+# ---------- Expresiones S ----------
+
+_ATOMO_SIMPLE = re.compile(r"[^\s()\"\\;]+")
+
+
+def _atomo(texto: str) -> str:
+    """El texto tal cual si no tiene caracteres especiales; si no, entre comillas con escapes de JSON"""
+    return texto if _ATOMO_SIMPLE.fullmatch(texto) else json.dumps(texto, ensure_ascii=False)
+
+
+def escribir_sexp(arboles: Iterable, archivo: TextIO) -> int:
+    """Una expresión S por línea: (tipo valor hijo...), con los átomos entre comillas si hace falta"""
+    salida = _Volcador(archivo)
+    prefijos: Dict[Etiqueta, str] = {}
+    cantidad = 0
+    for raiz in arboles:
+        cantidad += 1
+        if raiz is None:
+            salida.agregar("()\n")
+            continue
+        separador = ""
+        for etiqueta, _, cierres in _con_cierres(preorden(raiz)):
+            prefijo = prefijos.get(etiqueta)
+            if prefijo is None:
+                prefijo = prefijos[etiqueta] = f"({_atomo(etiqueta[0])} {_atomo(etiqueta[1])}"
+            salida.agregar(separador + prefijo)
+            separador = " "
+            if cierres:
+                salida.agregar(")" * cierres)
+        salida.agregar("\n")
+    salida.volcar()
+    return cantidad
+
+
+_TOKEN_SEXP = re.compile(r'\s*(?:(\()|(\))|(%s)|([^\s()"\\;]+))' % _CADENA_JSON)
+
+
+def sexp_a_arbol(texto: str) -> Optional[VistaNodo]:
+    """Lee una expresión S escrita por escribir_sexp (iterativo); "()" es el árbol vacío"""
+    if texto.strip() == "()":
+        return None
+    almacen = AlmacenArbol()
+    pila: List[Tuple[str, str, List[int]]] = []
+    cadenas: Dict[str, str] = {}
+    # Átomos leídos del nodo recién abierto; el nodo se apila al tener el tipo y el valor
+    atomos: List[str] = []
+    abierto = False
+    raiz = None
+    pos = 0
+    fin = len(texto.rstrip())
+    coincidir = _TOKEN_SEXP.match
+    while pos < fin:
+        token = coincidir(texto, pos)
+        if token is None or raiz is not None:
+            raise ValueError(f"expresión S inválida en la posición {pos}")
+        inicio, pos = token.start(), token.end()
+        if token.group(1) is not None:
+            if abierto:
+                raise ValueError(f"expresión S inválida en la posición {inicio}: falta el tipo o el valor")
+            abierto = True
+        elif token.group(2) is not None:
+            if abierto or not pila:
+                raise ValueError(f"expresión S inválida en la posición {inicio}")
+            raiz = _armar(almacen, pila)
+        else:
+            if not abierto:
+                raise ValueError(f"expresión S inválida en la posición {inicio}: átomo fuera de lugar")
+            cadena = token.group(3)
+            atomos.append(_decodificar(cadena, cadenas) if cadena is not None else token.group(4))
+            if len(atomos) == 2:
+                pila.append((atomos[0], atomos[1], []))
+                atomos.clear()
+                abierto = False
+    if raiz is None:
+        raise ValueError("expresión S incompleta")
+    return almacen.vista(raiz)
+
+
+def leer_sexp(archivo: TextIO) -> Iterator[Optional[VistaNodo]]:
+    for linea in archivo:
+        if linea.strip():
+            yield sexp_a_arbol(linea)
+
+
+# ---------- Graphviz ----------
+
+def escribir_dot(arboles: Iterable, archivo: TextIO) -> int:
+    """Un digraph por árbol; los nodos se numeran en preorden"""
+    salida = _Volcador(archivo)
+    rotulos: Dict[Etiqueta, str] = {}
+    cantidad = 0
+    for raiz in arboles:
+        salida.agregar(f"digraph arbol{cantidad} {{\n  node [shape=circle];\n")
+        cantidad += 1
+        if raiz is None:
+            salida.agregar("}\n")
+            continue
+        # Padres con hijos por escribir: [número del padre, hijos restantes]
+        abiertos: List[List[int]] = []
+        for v, (etiqueta, k) in enumerate(preorden(raiz)):
+            rotulo = rotulos.get(etiqueta)
+            if rotulo is None:
+                rotulo = rotulos[etiqueta] = json.dumps(f"{etiqueta[0]}\n{etiqueta[1]}", ensure_ascii=False)
+            salida.agregar(f"  n{v} [label={rotulo}];\n")
+            if abiertos:
+                padre = abiertos[-1]
+                salida.agregar(f"  n{padre[0]} -> n{v};\n")
+                padre[1] -= 1
+                if not padre[1]:
+                    abiertos.pop()
+            if k:
+                abiertos.append([v, k])
+        salida.agregar("}\n")
+    salida.volcar()
+    return cantidad
+
+
+# ---------- Archivos ----------
+
+_ESCRITORES = {"binario": escribir_binario, "jsonl": escribir_jsonl, "sexp": escribir_sexp, "dot": escribir_dot}
+_LECTORES = {"binario": leer_binario, "jsonl": leer_jsonl, "sexp": leer_sexp}
+
+
+def formato_de(ruta: str) -> str:
+    """Formato según la extensión del archivo"""
+    for extension, formato in EXTENSIONES.items():
+        if ruta.lower().endswith(extension):
+            return formato
+    raise ValueError(f"extensión desconocida: {ruta} (opciones: {', '.join(EXTENSIONES)})")
+
+
+def guardar_arboles(arboles: Iterable, ruta: str, formato: Optional[str] = None) -> int:
+    """Escribe los árboles en `ruta` ("-" = salida estándar); devuelve la cantidad"""
+    formato = formato or formato_de(ruta)
+    escribir = _ESCRITORES[formato]
+    if ruta == "-":
+        return escribir(arboles, sys.stdout.buffer if formato == "binario" else sys.stdout)
+    if formato == "binario":
+        with open(ruta, "wb") as archivo:
+            return escribir(arboles, archivo)
+    with open(ruta, "w", encoding="utf-8", newline="\n") as archivo:
+        return escribir(arboles, archivo)
+
+
+def cargar_arboles(ruta: str, formato: Optional[str] = None) -> Iterator[Optional[VistaNodo]]:
+    """Lee los árboles de `ruta` ("-" = entrada estándar) uno por uno"""
+    formato = formato or formato_de(ruta)
+    if formato not in _LECTORES:
+        raise ValueError(f"el formato {formato} es solo de exportación")
+    leer = _LECTORES[formato]
+    if ruta == "-":
+        yield from leer(sys.stdin.buffer if formato == "binario" else sys.stdin)
+        return
+    archivo = open(ruta, "rb") if formato == "binario" else open(ruta, "r", encoding="utf-8")
+    with archivo:
+        yield from leer(archivo)
+
+
+# ---------- Comprobación ----------
+
+def arboles_de_prueba() -> List[Optional[VistaNodo]]:
+    """Árboles que necesitan los anchos de 2 y 4 bytes: muchos hijos y muchas etiquetas distintas"""
+    arboles: List[Optional[VistaNodo]] = [None]
+    almacen = AlmacenArbol()
+    # Un nodo con 300 hijos: cantidad de hijos de 2 bytes
+    hojas = [almacen.agregar("F", "a") for _ in range(300)]
+    arboles.append(almacen.vista(almacen.agregar("E", "+", hojas)))
+    # 70000 etiquetas distintas bajo una raíz: etiqueta y cantidad de hijos de 4 bytes
+    almacen = AlmacenArbol()
+    hojas = [almacen.agregar("F", f"x{i}") for i in range(70_000)]
+    arboles.append(almacen.vista(almacen.agregar("E", "+", hojas)))
+    # Una cadena profunda con etiquetas que hay que escapar
+    almacen = AlmacenArbol()
+    nodo = almacen.agregar("EMPTY", "")
+    for i in range(5_000):
+        nodo = almacen.agregar("PROD", 'a"(S)\\b' if i % 2 else "x y", [nodo])
+    arboles.append(almacen.vista(nodo))
+    return arboles
+
+
+def comprobar_formatos(arboles: Optional[List] = None) -> int:
+    """Escribe y relee los árboles en cada formato legible; lanza ValueError si alguno no vuelve igual.
+
+    Devuelve la cantidad de árboles comprobados por formato.
+    """
+    if arboles is None:
+        arboles = arboles_de_prueba()
+    esperados = [list(preorden(raiz)) if raiz is not None else None for raiz in arboles]
+    for formato, leer in _LECTORES.items():
+        archivo = io.BytesIO() if formato == "binario" else io.StringIO()
+        _ESCRITORES[formato](arboles, archivo)
+        archivo.seek(0)
+        leidos = [list(preorden(raiz)) if raiz is not None else None for raiz in leer(archivo)]
+        if len(leidos) != len(esperados):
+            raise ValueError(f"{formato}: se escribieron {len(esperados)} árboles y se leyeron {len(leidos)}")
+        for i, (esperado, leido) in enumerate(zip(esperados, leidos)):
+            if esperado != leido:
+                raise ValueError(f"{formato}: el árbol {i} no vuelve igual")
+    return len(arboles)
+
+
+def main(argv=None) -> int:
+    argumentos = argparse.ArgumentParser(description="Convierte árboles de análisis entre formatos")
+    argumentos.add_argument("entrada", nargs="?", help="Archivo de árboles (jsonl, sexp o binario; - = entrada estándar)")
+    argumentos.add_argument("salida", nargs="?", help="Archivo de salida (- = salida estándar)")
+    argumentos.add_argument("--de", choices=sorted(_LECTORES), help="Formato de entrada (por defecto, según la extensión)")
+    argumentos.add_argument("--a", choices=FORMATOS, help="Formato de salida (por defecto, según la extensión)")
+    argumentos.add_argument("--comprobar", action="store_true",
+                            help="Comprobar que cada formato relee igual los árboles que escribe y salir")
+    args = argumentos.parse_args(argv)
+    if args.comprobar:
+        try:
+            cantidad = comprobar_formatos()
+        except ValueError as error:
+            print(f"❌ {error}", file=sys.stderr)
+            return 1
+        print(f"✓ {cantidad} árboles por formato ({', '.join(_LECTORES)}) vuelven iguales", file=sys.stderr)
+        return 0
+    if args.entrada is None or args.salida is None:
+        argumentos.error("faltan la entrada y la salida")
+    try:
+        de = args.de or formato_de(args.entrada)
+        a = args.a or formato_de(args.salida)
+    except ValueError as error:
+        argumentos.error(str(error))
+    cantidad = guardar_arboles(cargar_arboles(args.entrada, de), args.salida, a)
+    print(f"árboles={cantidad}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Análisis en un hilo de fondo para que la ventana de Tk siga respondiendo.
+
+La GUI arma el analizador con un ControlAnalisis y lanza `TareaAnalisis`. El
+análisis corre en un hilo aparte y deja su resultado (o la excepción) en una
+cola; el hilo de Tk la consulta con `root.after` cada INTERVALO_SONDEO_MS,
+actualiza el progreso mientras tanto y llama a `al_terminar` o `al_fallar` al
+final. Ningún widget se toca desde el hilo de fondo.
+"""
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from control import ControlAnalisis
+
+INTERVALO_SONDEO_MS = 50
+
+# Límites de tiempo ofrecidos en las GUIs (segundos; None = sin límite)
+OPCIONES_LIMITE = {"Sin límite": None, "5 s": 5, "30 s": 30, "2 min": 120}
+
+
+class TareaAnalisis:
+    def __init__(self, root, funcion: Callable[[], Any], control: ControlAnalisis,
+                 al_terminar: Callable[[Any], None], al_fallar: Callable[[BaseException], None],
+                 al_progresar: Optional[Callable[[ControlAnalisis], None]] = None):
+        self.root = root
+        self.funcion = funcion
+        self.control = control
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.al_progresar = al_progresar
+        self.cola: "queue.Queue" = queue.Queue(maxsize=1)
+        self.hilo = threading.Thread(target=self._ejecutar, daemon=True)
+
+    def iniciar(self) -> 'TareaAnalisis':
+        self.hilo.start()
+        self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+        return self
+
+    def cancelar(self):
+        self.control.cancelar()
+
+    def _ejecutar(self):
+        try:
+            # El presupuesto cubre todas las fases de la tarea (análisis, recuperación de errores...)
+            self.control.iniciar()
+            self.cola.put((True, self.funcion()))
+        except BaseException as e:
+            self.cola.put((False, e))
+
+    def _sondear(self):
+        try:
+            terminado, valor = self.cola.get_nowait()
+        except queue.Empty:
+            if self.al_progresar is not None:
+                self.al_progresar(self.control)
+            self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+            return
+        if terminado:
+            self.al_terminar(valor)
+        else:
+            self.al_fallar(valor)
@@ -0,0 +1,96 @@
+"""Destinos de traza para los analizadores.
+
+Los analizadores registran cada paso con `traza.registrar(nivel, plantilla, *args)`
+solo si `traza.activa` es verdadero, así que con la traza desactivada el costo
+es una comparación de un booleano local. El texto se formatea (`plantilla % args`)
+únicamente cuando el destino lo necesita.
+"""
+from collections import deque
+from typing import List, Optional, TextIO
+
+
+def formatear(nivel: int, plantilla: str, args: tuple) -> str:
+    return "  " * nivel + (plantilla % args if args else plantilla)
+
+
+class Traza:
+    """Destino nulo: no registra nada"""
+    activa = False
+
+    def registrar(self, nivel: int, plantilla: str, *args):
+        pass
+
+    def volcar(self):
+        """Entrega los mensajes pendientes a su destino"""
+        pass
+
+    def cerrar(self):
+        pass
+
+
+# Destino compartido para cuando no se pide traza
+TRAZA_NULA = Traza()
+
+
+class TrazaAnillo(Traza):
+    """Guarda solo los últimos `capacidad` mensajes, sin formatear hasta que se leen"""
+    activa = True
+
+    def __init__(self, capacidad: int = 1000):
+        self.entradas = deque(maxlen=capacidad)
+        self.total = 0
+
+    def registrar(self, nivel: int, plantilla: str, *args):
+        self.entradas.append((nivel, plantilla, args))
+        self.total += 1
+
+    def mensajes(self) -> List[str]:
+        return [formatear(nivel, plantilla, args) for nivel, plantilla, args in self.entradas]
+
+    def limpiar(self):
+        self.entradas.clear()
+        self.total = 0
+
+
+class TrazaArchivo(Traza):
+    """Escribe cada mensaje en un archivo de texto"""
+    activa = True
+
+    def __init__(self, ruta: Optional[str] = None, archivo: Optional[TextIO] = None):
+        self.propio = archivo is None
+        self.archivo = archivo if archivo is not None else open(ruta, "w", encoding="utf-8")
+
+    def registrar(self, nivel: int, plantilla: str, *args):
+        self.archivo.write(formatear(nivel, plantilla, args) + "\n")
+
+    def volcar(self):
+        self.archivo.flush()
+
+    def cerrar(self):
+        if self.propio:
+            self.archivo.close()
+        else:
+            self.archivo.flush()
+
+
+class TrazaWidget(TrazaAnillo):
+    """Acumula mensajes y los vuelca a un widget de texto de Tk en una sola inserción.
+
+    Durante el análisis no se toca el widget; `volcar()` se llama al terminar.
+    Solo se conservan las últimas `capacidad` líneas para que el log no crezca sin límite.
+    """
+
+    def __init__(self, widget, capacidad: int = 5000):
+        super().__init__(capacidad)
+        self.widget = widget
+
+    def volcar(self):
+        if not self.total:
+            return
+        omitidos = self.total - len(self.entradas)
+        texto = "\n".join(self.mensajes()) + "\n"
+        if omitidos:
+            texto = f"... {omitidos} mensajes anteriores omitidos ...\n" + texto
+        self.widget.insert("end", texto)
+        self.widget.see("end")
+        self.limpiar()
@@ -0,0 +1,300 @@
+"""Validación por lotes sin interfaz gráfica.
+
+Lee una cadena por línea desde un archivo o desde la entrada estándar y
+escribe, por cada una, el veredicto y opcionalmente el árbol en JSON:
+
+    python3 validar.py arbol entradas.txt
+    cat entradas.txt | python3 validar.py stf --arbol
+    python3 validar.py abc entradas.txt --procesos 32
+    python3 validar.py stf expresion_enorme.txt --flujo
+    python3 validar.py arbol corpus_enorme.txt --criba
+    python3 validar.py abc corpus.txt --binario resultados.bin --arboles arboles.jsonl --reanudar
+    python3 validar.py arbol corpus.txt --perfil perfil.jsonl --cprofile corrida.prof
+    python3 validar.py abc corpus.txt -j 8 --max-pasos 1000000 --tiempo-max 2 --max-memoria 512
+    python3 validar.py stf formulas.txt --extendido --arbol
+
+Los archivos se leen mapeados en memoria (ver corpus.py); la entrada estándar,
+línea por línea. Con --binario los resultados se escriben como registros de
+ancho fijo, con puntos de control cada --lote entradas para poder reanudar.
+Con --perfil se escribe una línea JSON por entrada analizada con sus
+contadores y tiempos (ver perfil.py), para ubicar las que disparan la latencia.
+Con --max-pasos, --tiempo-max, --max-nodos o --max-memoria, cada entrada se
+analiza con ese presupuesto (ver control.py); las que lo agotan salen como
+AGOTADO con lo que se llegó a hacer, y el resto del corpus sigue su curso.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from analizadores import ANALIZADORES, ParserSTF, arbol_a_json
+from cache import MAX_ENTRADAS, CacheResultados
+from control import AnalisisInterrumpido, Presupuesto
+from corpus import EscritorResultados, abrir_corpus, lineas, siguiente_registro, textos
+from paralelo import (TAM_LOTE, Contadores, ResultadoLote, analizar_en_paralelo, analizar_en_serie,
+                      nuevos_contadores)
+from perfil import PerfilAnalisis
+from traza import Traza, TrazaArchivo
+
+
+def leer_lineas(archivo: TextIO) -> Iterator[str]:
+    """Produce las líneas del archivo sin el salto de línea final"""
+    for linea in archivo:
+        yield linea.rstrip("\r\n")
+
+
+def formatear(resultado: ResultadoLote, con_arbol: bool) -> str:
+    if resultado.error is not None:
+        return f"ERROR\t{resultado.entrada}\t{resultado.error}"
+    if resultado.agotado is not None:
+        return f"AGOTADO\t{resultado.entrada}\t{resultado.agotado}"
+    veredicto = "ACEPTA" if resultado.valida else "RECHAZA"
+    if con_arbol:
+        return f"{veredicto}\t{resultado.entrada}\t{resultado.arbol_json}"
+    return f"{veredicto}\t{resultado.entrada}"
+
+
+def escribir_perfil(salida: TextIO, resultado: ResultadoLote, desplazamiento: Optional[int] = None):
+    """Una línea JSON con la entrada y su perfil; las respondidas sin analizar (caché, criba) no tienen"""
+    if resultado.perfil is None:
+        return
+    linea = {"entrada": resultado.entrada, "valida": resultado.valida, **resultado.perfil}
+    if resultado.agotado is not None:
+        linea["agotado"] = resultado.agotado
+    if desplazamiento is not None:
+        linea["desplazamiento"] = desplazamiento
+    salida.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+
+def crear_argumentos() -> argparse.ArgumentParser:
+    argumentos = argparse.ArgumentParser(description="Valida cadenas contra las gramáticas de arbol.py, abc.py y stf.py")
+    argumentos.add_argument("gramatica", choices=sorted(ANALIZADORES), help="Gramática a usar")
+    argumentos.add_argument("archivo", nargs="?", default="-", help="Archivo de entrada (por defecto, la entrada estándar)")
+    argumentos.add_argument("--arbol", action="store_true", help="Incluir el árbol de análisis en JSON")
+    argumentos.add_argument("--modo", help="Modo del analizador (arbol: memo|backtracking|rapido|earley, abc: chart|backtracking|earley, stf: ll1|earley)")
+    argumentos.add_argument("-j", "--procesos", type=int, default=1, help="Procesos trabajadores (0 = uno por núcleo)")
+    argumentos.add_argument("--lote", type=int, default=TAM_LOTE, help="Entradas por unidad de trabajo")
+    argumentos.add_argument("--traza", metavar="ARCHIVO", help="Escribir la traza del análisis (solo con un proceso)")
+    argumentos.add_argument("--cache", metavar="ARCHIVO",
+                            help="Caché de resultados persistente (con -j, cada proceso solo lo lee)")
+    argumentos.add_argument("--cache-entradas", type=int, default=MAX_ENTRADAS,
+                            help="Entradas del caché de resultados por proceso (0 = sin caché)")
+    argumentos.add_argument("--flujo", action="store_true",
+                            help="stf: tratar toda la entrada como una sola expresión y leerla por bloques")
+    argumentos.add_argument("--criba", action="store_true",
+                            help="arbol: decidir los veredictos con la criba de NumPy; con --arbol o --arboles, "
+                                 "solo las aceptadas pasan al analizador (sin árbol, --binario anota 0 nodos)")
+    argumentos.add_argument("--binario", metavar="ARCHIVO",
+                            help="Escribir los resultados como registros binarios de ancho fijo (ver corpus.py)")
+    argumentos.add_argument("--arboles", metavar="ARCHIVO",
+                            help="Con --binario: archivo auxiliar con el árbol JSON de cada entrada aceptada")
+    argumentos.add_argument("--reanudar", action="store_true",
+                            help="Con --binario: seguir desde el último punto de control del archivo de resultados")
+    argumentos.add_argument("--desde", type=int, default=0, metavar="BYTE",
+                            help="Empezar en este desplazamiento del archivo (el inicio de una línea)")
+    argumentos.add_argument("--perfil", metavar="ARCHIVO",
+                            help="Escribir una línea JSON por entrada analizada con sus contadores y tiempos por fase")
+    argumentos.add_argument("--cprofile", metavar="ARCHIVO",
+                            help="Escribir el perfil de cProfile de los análisis en formato pstats (solo con un proceso)")
+    argumentos.add_argument("--extendido", action="store_true",
+                            help="stf: aceptar identificadores y números como operandos (solo modo ll1)")
+    argumentos.add_argument("--max-pasos", type=int, metavar="N", help="Pasos máximos del análisis de cada entrada")
+    argumentos.add_argument("--tiempo-max", type=float, metavar="SEGUNDOS",
+                            help="Tiempo máximo del análisis de cada entrada")
+    argumentos.add_argument("--max-nodos", type=int, metavar="N", help="Nodos máximos creados por entrada")
+    argumentos.add_argument("--max-memoria", type=float, metavar="MB",
+                            help="Crecimiento máximo de la memoria del proceso durante cada análisis")
+    return argumentos
+
+
+def crear_presupuesto(args) -> Optional[Presupuesto]:
+    presupuesto = Presupuesto(args.max_pasos, args.tiempo_max, args.max_nodos,
+                              int(args.max_memoria * 2**20) if args.max_memoria is not None else None)
+    return presupuesto if presupuesto.limitado() else None
+
+
+def validar_flujo(args) -> int:
+    """Valida el archivo entero como una expresión, sin cargarlo en memoria"""
+    traza = TrazaArchivo(args.traza) if args.traza else None
+    control = args.presupuesto.crear_control() if args.presupuesto is not None else None
+    entrada = sys.stdin.buffer if args.archivo == "-" else open(args.archivo, "rb")
+    try:
+        resultado = ParserSTF(traza=traza, control=control).validar_flujo(entrada)
+    except AnalisisInterrumpido as e:
+        print(f"AGOTADO\t{args.archivo}\t{e}")
+        return 0
+    finally:
+        if entrada is not sys.stdin.buffer:
+            entrada.close()
+        if traza is not None:
+            traza.cerrar()
+    if resultado.valida:
+        print(f"ACEPTA\t{args.archivo}\t{resultado.leidos} caracteres")
+    else:
+        print(f"RECHAZA\t{args.archivo}\tposición {resultado.posicion_error}: {resultado.mensaje}")
+    return 0
+
+
+def analizar(args, entradas: Iterable[str], con_arbol: bool, detalle: bool,
+             estadisticas: Dict[int, Contadores], traza: Optional[Traza],
+             cache: Optional[CacheResultados], perfil: Optional[PerfilAnalisis] = None) -> Iterator[ResultadoLote]:
+    if args.procesos == 1:
+        return analizar_en_serie(args.gramatica, entradas, args.modo, con_arbol, args.lote,
+                                 estadisticas, traza, cache, detalle, perfil, args.presupuesto, args.extendido)
+    return analizar_en_paralelo(args.gramatica, entradas, args.procesos or None, args.modo, con_arbol,
+                                args.lote, estadisticas, args.cache_entradas, args.cache, detalle,
+                                perfilar=perfil is not None, presupuesto=args.presupuesto, extendido=args.extendido)
+
+
+def validar_corpus(datos, desde: int, args, estadisticas: Dict[int, Contadores], traza: Optional[Traza],
+                   cache: Optional[CacheResultados], perfil: Optional[PerfilAnalisis] = None
+                   ) -> Iterator[Tuple[int, int, ResultadoLote]]:
+    """Produce (desplazamiento, longitud, resultado) de cada línea del buffer a partir de `desde`"""
+    con_arbol = args.arbol or args.arboles is not None
+    detalle = args.binario is not None
+    if args.criba:
+        yield from validar_con_criba(datos, desde, args, con_arbol, detalle, estadisticas, traza, cache, perfil)
+        return
+    # Posiciones de las líneas ya entregadas al analizador y todavía sin resultado
+    pendientes: Deque[Tuple[int, int]] = deque()
+
+    def entradas() -> Iterator[str]:
+        for desplazamientos, longitudes, bloque in lineas(datos, desde):
+            pendientes.extend(zip(desplazamientos, longitudes))
+            yield from bloque
+
+    for resultado in analizar(args, entradas(), con_arbol, detalle, estadisticas, traza, cache, perfil):
+        desplazamiento, longitud = pendientes.popleft()
+        yield desplazamiento, longitud, resultado
+
+
+def validar_con_criba(datos, desde: int, args, con_arbol: bool, detalle: bool,
+                      estadisticas: Dict[int, Contadores], traza: Optional[Traza],
+                      cache: Optional[CacheResultados], perfil: Optional[PerfilAnalisis] = None
+                      ) -> Iterator[Tuple[int, int, ResultadoLote]]:
+    """Criba el corpus entero; los rechazos (y sin árbol, todo) se responden sin analizar"""
+    # La criba necesita NumPy; el resto de la validación no
+    from criba import cribar_bytes
+
+    criba = cribar_bytes(memoryview(datos)[desde:])
+    inicios, longitudes = (criba.inicio + desde).tolist(), criba.longitud.tolist()
+    errores = criba.error.tolist()
+
+    def texto(i: int) -> str:
+        # La salida binaria no lleva el texto de la entrada: no hace falta decodificarlo
+        return "" if detalle else datos[inicios[i]:inicios[i] + longitudes[i]].decode("utf-8", "replace")
+
+    analizadas = None
+    if con_arbol:
+        aceptadas = textos(datos, ((inicios[i], longitudes[i]) for i in criba.aceptados().tolist()))
+        analizadas = analizar(args, aceptadas, True, detalle, estadisticas, traza, cache, perfil)
+    contadores = estadisticas.setdefault(os.getpid(), nuevos_contadores())
+    for i, valida in enumerate(criba.valida.tolist()):
+        if valida and analizadas is not None:
+            resultado = next(analizadas)
+        else:
+            contadores["criba"] += 1
+            contadores["aceptadas" if valida else "rechazadas"] += 1
+            resultado = ResultadoLote(texto(i), valida, arbol_a_json(None) if con_arbol else None,
+                                      posicion_error=None if valida else errores[i])
+        yield inicios[i], longitudes[i], resultado
+    if analizadas is not None:
+        # Termina el generador (y cierra los procesos) sin esperar a que lo recolecten
+        analizadas.close()
+
+
+def main(argv=None) -> int:
+    argumentos = crear_argumentos()
+    args = argumentos.parse_args(argv)
+    if args.traza and args.procesos != 1:
+        argumentos.error("--traza solo puede usarse con un proceso")
+    if args.cprofile and args.procesos != 1:
+        argumentos.error("--cprofile solo puede usarse con un proceso")
+    modos = ANALIZADORES[args.gramatica].MODOS
+    if args.modo is not None and args.modo not in modos:
+        if modos:
+            argumentos.error(f"modo inválido para {args.gramatica}: {args.modo} (opciones: {', '.join(modos)})")
+        argumentos.error(f"la gramática {args.gramatica} no tiene modos")
+    if args.extendido and (args.gramatica != "stf" or (args.modo or "ll1") not in ParserSTF.MODOS_EXTENDIDO):
+        argumentos.error(f"--extendido solo está disponible para stf en modo {', '.join(ParserSTF.MODOS_EXTENDIDO)}")
+    args.presupuesto = crear_presupuesto(args)
+    if args.flujo:
+        if args.perfil or args.cprofile:
+            argumentos.error("--perfil y --cprofile no están disponibles con --flujo")
+        if args.extendido:
+            argumentos.error("--extendido no está disponible con --flujo")
+        if args.gramatica != "stf":
+            argumentos.error("--flujo solo está disponible para stf")
+        return validar_flujo(args)
+    if args.criba and args.gramatica != "arbol":
+        argumentos.error("--criba solo está disponible para arbol")
+    if args.criba:
+        try:
+            import numpy  # noqa: F401 (solo la criba lo usa)
+        except ImportError:
+            argumentos.error("--criba necesita NumPy")
+    if (args.arboles or args.reanudar) and not args.binario:
+        argumentos.error("--arboles y --reanudar requieren --binario")
+    if (args.binario or args.desde) and args.archivo == "-":
+        argumentos.error("--binario y --desde necesitan un archivo de entrada")
+
+    estadisticas: Dict[int, Contadores] = {}
+    traza = TrazaArchivo(args.traza) if args.traza else None
+    perfil = PerfilAnalisis(cprofile=args.cprofile is not None) if args.perfil or args.cprofile else None
+    salida_perfil = open(args.perfil, "w", encoding="utf-8") if args.perfil else None
+    cache = None
+    escritor = None
+    try:
+        if args.procesos == 1 and args.cache_entradas > 0:
+            cache = CacheResultados(max_entradas=args.cache_entradas, ruta=args.cache)
+        if args.archivo == "-" and not args.criba:
+            lineas = leer_lineas(sys.stdin)
+            for resultado in analizar(args, lineas, args.arbol, False, estadisticas, traza, cache, perfil):
+                sys.stdout.write(formatear(resultado, args.arbol) + "\n")
+                if salida_perfil is not None:
+                    escribir_perfil(salida_perfil, resultado)
+        else:
+            if args.binario:
+                escritor = EscritorResultados(args.binario, args.gramatica, args.arboles, args.reanudar)
+            with abrir_corpus(args.archivo) as datos:
+                desde = args.desde
+                if escritor is not None and escritor.ultimo is not None:
+                    desde = max(desde, siguiente_registro(datos, *escritor.ultimo))
+                    print(f"reanudando desde el byte {desde} ({escritor.escritos} resultados ya escritos)",
+                          file=sys.stderr)
+                for i, (desplazamiento, longitud, resultado) in enumerate(
+                        validar_corpus(datos, desde, args, estadisticas, traza, cache, perfil), 1):
+                    if salida_perfil is not None:
+                        escribir_perfil(salida_perfil, resultado, desplazamiento)
+                    if escritor is None:
+                        sys.stdout.write(formatear(resultado, args.arbol) + "\n")
+                        continue
+                    escritor.escribir(desplazamiento, longitud, resultado.valida, resultado.nodos,
+                                      resultado.posicion_error, resultado.error is not None, resultado.arbol_json,
+                                      resultado.agotado is not None)
+                    if i % args.lote == 0:
+                        escritor.punto_de_control()
+    finally:
+        if escritor is not None:
+            escritor.cerrar()
+        if traza is not None:
+            traza.cerrar()
+        if salida_perfil is not None:
+            salida_perfil.close()
+    if args.cprofile:
+        perfil.guardar_cprofile(args.cprofile)
+    if cache is not None and args.cache:
+        cache.guardar_en_disco()
+
+    for pid, contadores in sorted(estadisticas.items()):
+        print(f"proceso={pid} aceptadas={contadores['aceptadas']} rechazadas={contadores['rechazadas']} "
+              f"errores={contadores['errores']} agotadas={contadores['agotadas']} cache={contadores['cache']} "
+              f"criba={contadores['criba']}",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,505 @@
+"""Ventana común de las herramientas arbol.py, abc.py y stf.py.
+
+Las tres GUIs eran copias casi idénticas; ahora cada una es una subclase de
+`VentanaAnalizador` que solo define atributos de configuración: el analizador
+(con su gramática declarativa, que se muestra en la ventana), los modos que
+ofrece, los textos y el estilo del dibujo. El análisis corre en un hilo de fondo
+(TareaAnalisis), los resultados se guardan en el caché compartido y el árbol se
+dibuja con DibujoArbol. Con "En vivo", la entrada se reanaliza al dejar de
+escribir con es_valida_incremental y el dibujo se actualiza en el lugar.
+"Exportar árbol" guarda el árbol mostrado con serializacion.py. Si el
+analizador admite recuperación de errores, una palabra rechazada se vuelve a
+analizar para listar todos sus errores y dibujar el árbol parcial. El panel
+"Perfil" muestra los contadores y el tiempo por fase del último análisis
+(ver perfil.py) y los exporta en JSON o en el formato de cProfile. Si la
+subclase define OPCION_EXTENDIDO, una casilla activa el léxico extendido del
+analizador (en stf.py, identificadores y números como operandos).
+"""
+import time
+import tkinter as tk
+from tkinter import filedialog, ttk, scrolledtext
+from typing import Dict, List, Optional, Tuple
+
+from analizadores import Analizador, ErrorSintactico, EstadoIncremental, Nodo, ResultadoRecuperacion
+from almacen import compactar
+from cache import cache_compartido
+from control import AnalisisInterrumpido, ControlAnalisis
+from perfil import PERFIL_NULO, Perfil, PerfilAnalisis
+from serializacion import EXTENSIONES, guardar_arboles
+from tarea import OPCIONES_LIMITE, TareaAnalisis
+from traza import TRAZA_NULA, Traza, TrazaWidget
+
+# Opciones de traza del log: (texto, capacidad del buffer; None = desactivada)
+OPCIONES_TRAZA = {"Traza completa": 100_000, "Últimas 500": 500, "Sin traza": None}
+
+# Opciones del perfil: (texto, si se registra también con cProfile; None = desactivado)
+OPCIONES_PERFIL = {"Sin perfil": None, "Contadores y fases": False, "Con cProfile": True}
+
+# Análisis en vivo: espera desde la última tecla y tiempo que puede tomar en el hilo de Tk
+RETARDO_VIVO_MS = 150
+PRESUPUESTO_VIVO_S = 0.015
+
+
+class VentanaAnalizador:
+    TITULO = "Analizador Sintáctico"
+    ANALIZADOR: type = Analizador
+    ETIQUETA_ENTRADA = "Ingrese expresión:"
+    ENTRADA_INICIAL = ""
+    # Texto del combo -> modo del analizador; el primero es el predeterminado
+    MODOS: Dict[str, str] = {}
+    # Modo que solo reconoce (sin árbol ni hilo de fondo), si lo hay
+    MODO_RECONOCER: Optional[str] = None
+    # Texto de la casilla del léxico extendido (None si el analizador no lo tiene; ver ParserSTF)
+    OPCION_EXTENDIDO: Optional[str] = None
+    MENSAJE_ALFABETO = "Error: La palabra contiene caracteres fuera del alfabeto"
+    MENSAJE_ACEPTA = "✓ RESULTADO FINAL: La palabra pertenece a la gramática"
+    MENSAJE_RECHAZA = "❌ RESULTADO FINAL: La palabra NO pertenece a la gramática"
+    # Argumentos de crear_dibujo (etiqueta, tam_nodo, tam_fuente)
+    OPCIONES_DIBUJO: Dict[str, object] = {}
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title(self.TITULO)
+        self.root.geometry("1200x800")
+
+        # Configurar el estilo
+        style = ttk.Style()
+        style.theme_use('clam')
+
+        # Frame principal
+        main_frame = ttk.Frame(root, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Frame superior para entrada y controles
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(top_frame, text=self.ETIQUETA_ENTRADA).pack(side=tk.LEFT, padx=5)
+        self.entrada = ttk.Entry(top_frame, width=40)
+        self.entrada.pack(side=tk.LEFT, padx=5)
+        self.entrada.insert(0, self.ENTRADA_INICIAL)
+
+        # Modo del analizador
+        self.modo = ttk.Combobox(top_frame, width=18, state="readonly", values=tuple(self.MODOS))
+        self.modo.current(0)
+        self.modo.pack(side=tk.LEFT, padx=5)
+
+        # Léxico extendido, si el analizador lo ofrece
+        self.extendido = tk.BooleanVar(value=False)
+        if self.OPCION_EXTENDIDO is not None:
+            ttk.Checkbutton(top_frame, text=self.OPCION_EXTENDIDO, variable=self.extendido,
+                            command=self.al_editar).pack(side=tk.LEFT, padx=5)
+
+        # Nivel de traza
+        self.nivel_traza = ttk.Combobox(top_frame, width=14, state="readonly", values=tuple(OPCIONES_TRAZA))
+        self.nivel_traza.current(0)
+        self.nivel_traza.pack(side=tk.LEFT, padx=5)
+
+        self.btn_analizar = ttk.Button(top_frame, text="Analizar", command=self.analizar)
+        self.btn_analizar.pack(side=tk.LEFT, padx=5)
+
+        # Análisis en vivo: se reanaliza al dejar de escribir, reutilizando el análisis anterior
+        self.en_vivo = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="En vivo", variable=self.en_vivo, command=self.al_editar).pack(side=tk.LEFT, padx=5)
+        self.entrada.bind("<KeyRelease>", self.al_editar)
+        self.modo.bind("<<ComboboxSelected>>", self.al_editar)
+        self._programado: Optional[str] = None
+        self._ultimo_vivo: Optional[Tuple[str, str, bool]] = None
+        self.estado_vivo: Optional[EstadoIncremental] = None
+
+        # Límite de tiempo, cancelación y progreso del análisis en curso
+        self.limite = ttk.Combobox(top_frame, width=10, state="readonly", values=tuple(OPCIONES_LIMITE))
+        self.limite.current(0)
+        self.limite.pack(side=tk.LEFT, padx=5)
+        self.btn_cancelar = ttk.Button(top_frame, text="Cancelar", command=self.cancelar, state=tk.DISABLED)
+        self.btn_cancelar.pack(side=tk.LEFT, padx=5)
+        self.barra_progreso = ttk.Progressbar(top_frame, mode="indeterminate", length=100)
+        self.barra_progreso.pack(side=tk.LEFT, padx=5)
+        self.lbl_progreso = ttk.Label(top_frame, text="")
+        self.lbl_progreso.pack(side=tk.LEFT, padx=5)
+        self.tarea: Optional[TareaAnalisis] = None
+
+        # El árbol mostrado (o el parcial de una palabra rechazada) se puede guardar a un archivo
+        self.btn_exportar = ttk.Button(top_frame, text="Exportar árbol", command=self.exportar, state=tk.DISABLED)
+        self.btn_exportar.pack(side=tk.LEFT, padx=5)
+        self.arbol_actual: Optional[Nodo] = None
+
+        # Frame de gramática: el mismo texto que compila el modo Earley
+        grammar_frame = ttk.LabelFrame(main_frame, text="Gramática", padding="5")
+        grammar_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(grammar_frame, text=self.ANALIZADOR.GRAMATICA, font=('Courier', 12)).pack(pady=5)
+
+        # Frame del perfil: contadores y tiempos del último análisis
+        perfil_frame = ttk.LabelFrame(main_frame, text="Perfil", padding="5")
+        perfil_frame.pack(fill=tk.X, pady=5)
+        self.nivel_perfil = ttk.Combobox(perfil_frame, width=18, state="readonly", values=tuple(OPCIONES_PERFIL))
+        self.nivel_perfil.current(0)
+        self.nivel_perfil.pack(side=tk.LEFT, padx=5)
+        self.btn_exportar_perfil = ttk.Button(perfil_frame, text="Exportar perfil", command=self.exportar_perfil,
+                                              state=tk.DISABLED)
+        self.btn_exportar_perfil.pack(side=tk.LEFT, padx=5)
+        self.lbl_perfil = ttk.Label(perfil_frame, text="", font=('Courier', 10), justify=tk.LEFT)
+        self.lbl_perfil.pack(side=tk.LEFT, padx=5)
+        self.perfil_actual: Perfil = PERFIL_NULO
+
+        # Frame inferior dividido
+        bottom_frame = ttk.Frame(main_frame)
+        bottom_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        # Frame del log
+        log_frame = ttk.LabelFrame(bottom_frame, text="Log de análisis", padding="5")
+        log_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=20)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
+
+        # Frame del árbol; la figura se crea al dibujar el primer árbol
+        self.graph_frame = ttk.LabelFrame(bottom_frame, text="Árbol de análisis", padding="5")
+        self.graph_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.dibujo = None
+
+    def log(self, mensaje: str, nivel: int = 0):
+        """Agrega un mensaje al log"""
+        self.log_text.insert(tk.END, "  " * nivel + mensaje + "\n")
+        self.log_text.see(tk.END)
+
+    def crear_traza(self) -> Traza:
+        """Crea el destino de traza según el nivel elegido; el log se actualiza al terminar"""
+        capacidad = OPCIONES_TRAZA[self.nivel_traza.get()]
+        return TRAZA_NULA if capacidad is None else TrazaWidget(self.log_text, capacidad)
+
+    def crear_perfil(self) -> Perfil:
+        """Perfil del próximo análisis según la opción elegida; queda como el perfil mostrado"""
+        cprofile = OPCIONES_PERFIL[self.nivel_perfil.get()]
+        self.perfil_actual = PERFIL_NULO if cprofile is None else PerfilAnalisis(cprofile)
+        return self.perfil_actual
+
+    def crear_analizador(self, modo: str, **argumentos) -> Analizador:
+        """Analizador para el modo elegido, con el léxico extendido si la casilla está marcada"""
+        if self.extendido.get():
+            argumentos["extendido"] = True
+        return self.ANALIZADOR(modo=modo, **argumentos)
+
+    def revisar_entrada(self, palabra: str, modo: str) -> bool:
+        """Verifica el alfabeto (el léxico extendido informa sus propios errores) y que el modo admita las opciones"""
+        if self.extendido.get():
+            if modo not in self.ANALIZADOR.MODOS_EXTENDIDO:
+                self.log(f"Error: la opción «{self.OPCION_EXTENDIDO}» solo está disponible en modo "
+                         + ", ".join(texto for texto, m in self.MODOS.items() if m in self.ANALIZADOR.MODOS_EXTENDIDO))
+                return False
+            return True
+        if not self.ANALIZADOR.ALFABETO.match(palabra):
+            self.log(self.MENSAJE_ALFABETO)
+            return False
+        return True
+
+    def reconocer(self, palabra: str, modo: str) -> bool:
+        """Solo el veredicto, en el hilo de Tk (modo sin árbol)"""
+        perfil = self.crear_perfil()
+        with perfil.fase("analizar"):
+            valida = self.crear_analizador(modo, perfil=perfil).es_valida(palabra)[0]
+        self.mostrar_perfil()
+        return valida
+
+    def analizar(self):
+        """Maneja el evento de análisis"""
+        if self.tarea is not None:
+            return
+
+        self.log_text.delete(1.0, tk.END)
+        palabra = self.entrada.get().strip()
+        self.log("Iniciando análisis de: " + palabra)
+
+        modo = self.MODOS[self.modo.get()]
+        if not self.revisar_entrada(palabra, modo):
+            return
+
+        if modo == self.MODO_RECONOCER:
+            valida = self.reconocer(palabra, modo)
+            self.log("\n" + (self.MENSAJE_ACEPTA if valida else self.MENSAJE_RECHAZA))
+            self.limpiar_dibujo()
+            return
+
+        self.es_valida(palabra, modo)
+
+    def es_valida(self, palabra: str, modo: str):
+        """Analiza la palabra en un hilo de fondo; el resultado se muestra al terminar"""
+        # Cada modo (y opción de léxico) tiene sus propias entradas en el caché
+        firma = self.crear_analizador(modo).firma()
+        guardado = cache_compartido().obtener(firma, palabra)
+        if guardado is not None:
+            # Resultado ya conocido: sin analizar ni volver a disponer el árbol
+            self.log("↺ Resultado tomado del caché")
+            self.crear_perfil()
+            self.mostrar_resultado(guardado.valida, guardado.arbol, palabra, firma, guardado.extras.get('disposicion'),
+                                   guardado.extras.get('errores'), guardado.extras.get('parcial'))
+            self.mostrar_perfil()
+            return
+
+        traza = self.crear_traza()
+        control = ControlAnalisis(tiempo_max=OPCIONES_LIMITE[self.limite.get()])
+        perfil = self.crear_perfil()
+        parser = self.crear_analizador(modo, traza=traza, control=control, perfil=perfil)
+
+        def al_terminar(resultado: Tuple[bool, Optional[Nodo], Optional[List[ErrorSintactico]], Optional[Nodo]]):
+            self.terminar_tarea(traza)
+            valida, arbol, errores, parcial = resultado
+            if errores is None:
+                cache_compartido().guardar(firma, palabra, valida, arbol)
+            else:
+                cache_compartido().guardar(firma, palabra, valida, arbol, errores=errores, parcial=parcial)
+            self.mostrar_resultado(valida, arbol, palabra, firma, None, errores, parcial)
+            self.mostrar_perfil()
+
+        def al_fallar(error: BaseException):
+            self.terminar_tarea(traza)
+            self.mostrar_perfil()
+            if isinstance(error, AnalisisInterrumpido):
+                self.log(f"\n❌ {error}")
+            else:
+                self.log(f"\n❌ Error durante el análisis: {type(error).__name__}: {error}")
+            self.limpiar_dibujo()
+
+        def analizar() -> Tuple[bool, Optional[Nodo], Optional[List[ErrorSintactico]], Optional[Nodo]]:
+            # Los árboles se compactan aquí, fuera del hilo de Tk, para guardarlos en el caché
+            with perfil.fase("analizar"):
+                valida, arbol = parser.es_valida(palabra)
+            if valida:
+                with perfil.fase("grafo"):
+                    return valida, compactar(arbol) if arbol is not None else None, None, None
+            with perfil.fase("analizar"):
+                recuperacion = parser.analizar_con_recuperacion(palabra)
+            if recuperacion is None:
+                return valida, None, None, None
+            parcial = recuperacion.arbol
+            with perfil.fase("grafo"):
+                return valida, None, recuperacion.errores, compactar(parcial) if parcial is not None else None
+
+        self.btn_analizar.config(state=tk.DISABLED)
+        self.btn_cancelar.config(state=tk.NORMAL)
+        self.barra_progreso.start(10)
+        self.tarea = TareaAnalisis(self.root, analizar, control,
+                                   al_terminar, al_fallar, self.mostrar_progreso).iniciar()
+
+    def mostrar_progreso(self, control: ControlAnalisis):
+        self.lbl_progreso.config(text=f"{control.pasos:,} pasos, {control.nodos:,} nodos")
+
+    def terminar_tarea(self, traza: Traza):
+        if self.tarea is not None:
+            self.mostrar_progreso(self.tarea.control)
+        self.tarea = None
+        traza.volcar()
+        self.barra_progreso.stop()
+        self.btn_analizar.config(state=tk.NORMAL)
+        self.btn_cancelar.config(state=tk.DISABLED)
+
+    def cancelar(self):
+        """Pide al análisis en curso que se detenga en su próxima revisión"""
+        if self.tarea is not None:
+            self.tarea.cancelar()
+
+    def mostrar_resultado(self, valida: bool, arbol: Optional[Nodo], palabra: str, firma: str, preparado=None,
+                          errores: Optional[List[ErrorSintactico]] = None, parcial: Optional[Nodo] = None):
+        """`firma` es la del analizador en el caché, donde se anota la disposición del dibujo"""
+        if valida:
+            self.log("\n" + self.MENSAJE_ACEPTA)
+            self.visualizar_arbol(arbol, preparado)
+            if preparado is None:
+                cache_compartido().anotar(firma, palabra, 'disposicion', self.dibujo.preparado)
+            return
+        if errores:
+            self.log_errores(errores)
+        self.log("\n" + self.MENSAJE_RECHAZA)
+        if parcial is not None:
+            # Árbol parcial: lo que se pudo reconocer, con nodos ERROR en lugar de lo que falta
+            self.visualizar_arbol(parcial, preparado, con_errores=True)
+            if preparado is None:
+                cache_compartido().anotar(firma, palabra, 'disposicion', self.dibujo.preparado)
+        else:
+            self.limpiar_dibujo()
+
+    def log_errores(self, errores: List[ErrorSintactico]):
+        self.log(f"\n{len(errores)} error(es) de sintaxis:")
+        for error in errores:
+            self.log(f"posición {error.posicion}: {error.mensaje} (se esperaba: {' '.join(error.esperados)})", 1)
+
+    def al_editar(self, evento=None):
+        """Con "En vivo", programa un análisis para cuando se deje de escribir"""
+        if not self.en_vivo.get():
+            return
+        if self._programado is not None:
+            self.root.after_cancel(self._programado)
+        self._programado = self.root.after(RETARDO_VIVO_MS, self.analizar_en_vivo)
+
+    def analizar_en_vivo(self):
+        """Reanaliza la entrada reutilizando el análisis de la versión anterior.
+
+        Se intenta primero en el hilo de Tk con un presupuesto menor que un cuadro;
+        si no alcanza (por ejemplo, en el primer análisis de una entrada larga), el
+        mismo análisis sigue en un hilo de fondo. Un intento interrumpido no
+        modifica el estado anterior, así que el de fondo puede reutilizarlo.
+        """
+        self._programado = None
+        if self.tarea is not None:
+            # Hay un análisis en curso: se vuelve a intentar después
+            self._programado = self.root.after(RETARDO_VIVO_MS, self.analizar_en_vivo)
+            return
+        palabra = self.entrada.get().strip()
+        modo = self.MODOS[self.modo.get()]
+        if (palabra, modo, self.extendido.get()) == self._ultimo_vivo:
+            return
+        self._ultimo_vivo = (palabra, modo, self.extendido.get())
+        self.log_text.delete(1.0, tk.END)
+        self.log("Análisis en vivo de: " + palabra)
+        if not self.revisar_entrada(palabra, modo):
+            return
+        if modo == self.MODO_RECONOCER:
+            valida = self.reconocer(palabra, modo)
+            self.log("\n" + (self.MENSAJE_ACEPTA if valida else self.MENSAJE_RECHAZA))
+            return
+
+        anterior = self.estado_vivo
+        inicio = time.perf_counter()
+        try:
+            parser = self.crear_analizador(modo, control=ControlAnalisis(tiempo_max=PRESUPUESTO_VIVO_S),
+                                           perfil=self.crear_perfil())
+            resultado = self.analizar_incremental(palabra, parser, anterior)
+        except AnalisisInterrumpido:
+            self.log("El análisis sigue en segundo plano...")
+            self.analizar_en_vivo_de_fondo(palabra, modo, anterior)
+            return
+        self.mostrar_en_vivo(resultado, time.perf_counter() - inicio)
+
+    @staticmethod
+    def analizar_incremental(palabra: str, parser: Analizador, anterior: Optional[EstadoIncremental]
+                             ) -> Tuple[bool, Optional[Nodo], Optional[EstadoIncremental], Optional[ResultadoRecuperacion]]:
+        """Puede correr en un hilo de fondo: el analizador se arma antes, en el hilo de Tk"""
+        with parser.perfil.fase("analizar"):
+            valida, arbol, estado = parser.es_valida_incremental(palabra, anterior)
+            recuperacion = None if valida else parser.analizar_con_recuperacion(palabra)
+        return valida, arbol, estado, recuperacion
+
+    def analizar_en_vivo_de_fondo(self, palabra: str, modo: str, anterior: Optional[EstadoIncremental]):
+        control = ControlAnalisis(tiempo_max=OPCIONES_LIMITE[self.limite.get()])
+        # Perfil nuevo: el del intento interrumpido quedó a medias
+        parser = self.crear_analizador(modo, control=control, perfil=self.crear_perfil())
+        inicio = time.perf_counter()
+
+        def al_terminar(resultado):
+            self.terminar_tarea(TRAZA_NULA)
+            self.mostrar_en_vivo(resultado, time.perf_counter() - inicio)
+
+        def al_fallar(error: BaseException):
+            self.terminar_tarea(TRAZA_NULA)
+            self.mostrar_perfil()
+            self.estado_vivo = None
+            self._ultimo_vivo = None
+            self.log(f"\n❌ {error}" if isinstance(error, AnalisisInterrumpido)
+                     else f"\n❌ Error durante el análisis: {type(error).__name__}: {error}")
+
+        self.btn_analizar.config(state=tk.DISABLED)
+        self.btn_cancelar.config(state=tk.NORMAL)
+        self.barra_progreso.start(10)
+        self.tarea = TareaAnalisis(self.root, lambda: self.analizar_incremental(palabra, parser, anterior),
+                                   control, al_terminar, al_fallar, self.mostrar_progreso).iniciar()
+
+    def mostrar_en_vivo(self, resultado, segundos: float):
+        """Muestra el resultado de un análisis en vivo actualizando el dibujo en el lugar"""
+        valida, arbol, estado, recuperacion = resultado
+        self.estado_vivo = estado
+        self.log(f"({segundos * 1000:.1f} ms)")
+        if valida:
+            self.log("\n" + self.MENSAJE_ACEPTA)
+            if arbol is not None:
+                self.actualizar_arbol(arbol)
+        else:
+            if recuperacion is not None and recuperacion.errores:
+                self.log_errores(recuperacion.errores)
+            self.log("\n" + self.MENSAJE_RECHAZA)
+            if recuperacion is not None and recuperacion.arbol is not None:
+                self.actualizar_arbol(recuperacion.arbol, con_errores=True)
+            elif self.arbol_actual is not None:
+                self.log("(el dibujo muestra la última versión aceptada)")
+        self.mostrar_perfil()
+
+    def actualizar_arbol(self, arbol: Nodo, con_errores: bool = False):
+        """Cambia el árbol dibujado sin mover la vista ni perder lo expandido que sigue igual"""
+        dibujo = self.obtener_dibujo()
+        dibujo.perfil = self.perfil_actual
+        try:
+            dibujo.actualizar(arbol, con_errores)
+        finally:
+            # Los clics y el zoom posteriores no se suman al perfil del análisis
+            dibujo.perfil = PERFIL_NULO
+        self.arbol_actual = arbol
+        self.btn_exportar.config(state=tk.NORMAL)
+
+    def visualizar_arbol(self, arbol: Nodo, preparado=None, con_errores: bool = False):
+        """Dibuja el árbol con aristas y nodos agrupados; los subárboles grandes quedan colapsados"""
+        dibujo = self.obtener_dibujo()
+        dibujo.perfil = self.perfil_actual
+        try:
+            dibujo.dibujar(arbol, preparado, con_errores)
+        finally:
+            dibujo.perfil = PERFIL_NULO
+        self.arbol_actual = arbol
+        self.btn_exportar.config(state=tk.NORMAL)
+
+    def mostrar_perfil(self):
+        """Muestra los contadores y tiempos del último análisis en el panel del perfil"""
+        perfil = self.perfil_actual
+        if not perfil.activo:
+            self.lbl_perfil.config(text="")
+            self.btn_exportar_perfil.config(state=tk.DISABLED)
+            return
+        self.lbl_perfil.config(text=perfil.resumen())
+        self.btn_exportar_perfil.config(state=tk.NORMAL)
+
+    def exportar_perfil(self):
+        """Guarda el perfil mostrado en JSON o, si se tomó con cProfile, en el formato de pstats"""
+        perfil = self.perfil_actual
+        if not perfil.activo:
+            return
+        tipos = [("JSON (*.json)", "*.json")]
+        if perfil.cprofile is not None:
+            tipos.append(("cProfile (*.prof)", "*.prof"))
+        ruta = filedialog.asksaveasfilename(parent=self.root, title="Exportar perfil", defaultextension=".json",
+                                            filetypes=tipos)
+        if not ruta:
+            return
+        try:
+            perfil.guardar(ruta)
+        except (OSError, ValueError) as error:
+            self.log(f"\n❌ No se pudo exportar el perfil: {error}")
+            return
+        self.log(f"\n✓ Perfil exportado a {ruta}")
+
+    def exportar(self):
+        """Guarda el árbol mostrado; el formato sale de la extensión elegida"""
+        if self.arbol_actual is None:
+            return
+        ruta = filedialog.asksaveasfilename(
+            parent=self.root, title="Exportar árbol", defaultextension=".jsonl",
+            filetypes=[(f"{formato} (*{extension})", f"*{extension}") for extension, formato in EXTENSIONES.items()])
+        if not ruta:
+            return
+        try:
+            guardar_arboles([self.arbol_actual], ruta)
+        except (OSError, ValueError) as error:
+            self.log(f"\n❌ No se pudo exportar el árbol: {error}")
+            return
+        self.log(f"\n✓ Árbol exportado a {ruta}")
+
+    def obtener_dibujo(self):
+        """Crea la figura la primera vez que hace falta; matplotlib se importa recién aquí"""
+        if self.dibujo is None:
+            from dibujo import crear_dibujo
+            self.dibujo = crear_dibujo(self.graph_frame, **self.OPCIONES_DIBUJO)
+            self.dibujo.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return self.dibujo
+
+    def limpiar_dibujo(self):
+        self.arbol_actual = None
+        self.btn_exportar.config(state=tk.DISABLED)
+        if self.dibujo is not None:
+            self.dibujo.limpiar()